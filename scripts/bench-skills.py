@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+技能辅助脚本的跨技能基准测试与性能回归检查
+
+在临时目录生成合成数据 (不触碰真实草稿、发布目录与缓存), 计时各辅助函数:
+
+- 草稿目录: 10k 篇草稿          -> get_next_id (计数器分配 / 重新扫描)
+- 发布映射: 100k 条映射          -> publish_draft, update_published
+- 多年份 summary.md            -> load_summary_repo_set, update_summary_table
+- fetch_trending 输出: 50k 仓库 -> score_repos
+- 放大的 UI/UX 指南 CSV         -> core.search
+
+每项重复执行 --repeat 次, 取最快一次作为结果. 指定基线文件时, 结果超过
+基线 * (1 + 阈值) 即视为回归, 以退出码 1 结束.
+
+用法:
+    python3 scripts/bench-skills.py                                 # 默认规模, 与 .flowai/bench-baseline.json 比较
+    python3 scripts/bench-skills.py --save-baseline                 # 记录当前结果为基线
+    python3 scripts/bench-skills.py --scale 0.1 --threshold 0.5 --only score_repos core_search
+    python3 scripts/bench-skills.py --max get_next_id=0.01          # 绝对耗时上限 (秒)
+
+阈值也可通过环境变量 FLOWAI_BENCH_THRESHOLD 设置.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SKILLS_DIR = os.path.join(ROOT_DIR, "skills")
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, ".flowai", "bench-baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# 规模为 1.0 时的合成数据量
+SIZES = {
+    "drafts": 10_000,
+    "map_entries": 100_000,
+    "summary_years": 8,
+    "repos": 50_000,
+    "csv_rows": 20_000,
+}
+
+HELPER_DIRS = [
+    "fs/fs-next-id/scripts",
+    "fs/fs-update/scripts",
+    "publish/publish-github-go/scripts",
+    "post/post-radar/scripts",
+    "ui/ui-ux-pro/scripts",
+]
+
+SEARCH_QUERIES = [
+    ("glassmorphism dark mode", None),
+    ("accessibility keyboard navigation", None),
+    ("fintech dashboard", "product"),
+]
+
+TOPICS = ["llm", "agent", "react", "cli", "kubernetes", "blockchain", "rag", "devtools", "css", "docker"]
+LANGUAGES = ["Python", "TypeScript", "Go", "Rust", "JavaScript", "Shell", "Solidity"]
+LICENSES = ["MIT", "Apache-2.0", "GPL-3.0", None]
+
+
+def load_helpers():
+    """导入被测的技能脚本 (各脚本文件名在仓库内唯一, 可共用 sys.path)"""
+    for rel in HELPER_DIRS:
+        path = os.path.join(SKILLS_DIR, rel)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    import core
+    import fetch_trending
+    import get_next_id
+    import publish_draft
+    import publish_map
+    import score_repos
+    import update_published
+
+    return SimpleNamespace(
+        core=core,
+        fetch_trending=fetch_trending,
+        get_next_id=get_next_id,
+        publish_draft=publish_draft,
+        publish_map=publish_map,
+        score_repos=score_repos,
+        update_published=update_published,
+    )
+
+
+def scaled_sizes(scale, repeat):
+    sizes = {key: max(1, int(value * scale)) for key, value in SIZES.items()}
+    # publish_draft 每次需要一篇未发布的草稿
+    sizes["drafts"] = max(sizes["drafts"], repeat + 2)
+    return sizes
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+# ========== 合成数据 ==========
+
+def make_drafts(draft_dir, count):
+    """NNNN_post-N.md 草稿, 每篇带一级标题"""
+    os.makedirs(draft_dir, exist_ok=True)
+    paths = []
+    for i in range(1, count + 1):
+        path = os.path.join(draft_dir, f"{i:04d}_post-{i}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# 第 {i} 篇文章 Post {i}\n\n" + "正文内容。\n" * 20)
+        paths.append(path)
+    return paths
+
+
+def make_publish_map(helpers, map_file, count, published):
+    """count 条合成映射 (草稿不存在) + published 中的真实映射 [(draft, published_file)]"""
+    normalize = helpers.publish_map.normalize_path
+    stamp = "2025-01-01T00:00:00+00:00"
+    fake_dir = os.path.join(os.path.dirname(map_file), "archive")
+    mappings = {}
+    for i in range(count):
+        draft = normalize(os.path.join(fake_dir, f"{i:06d}_archived-{i}.md"))
+        mappings[draft] = {
+            "draft": draft,
+            "published": normalize(os.path.join(fake_dir, "published", f"{i:06d}_archived-{i}.md")),
+            "published_at": stamp,
+            "updated_at": stamp,
+            "content_hash": f"{i:064x}",
+            "size": 1024,
+            "mtime_ns": 0,
+        }
+    for draft, published_file in published:
+        shutil.copyfile(draft, published_file)
+        key = normalize(draft)
+        mappings[key] = {
+            "draft": key,
+            "published": normalize(published_file),
+            "published_at": stamp,
+            "updated_at": stamp,
+            **helpers.publish_map.content_fields(draft),
+        }
+    with open(map_file, "w", encoding="utf-8") as f:
+        json.dump({"version": helpers.publish_map.MAP_VERSION, "mappings": mappings}, f, separators=(",", ":"))
+
+
+def make_summary(path, years, rng):
+    """多年份 summary.md: 每年 12 个月章节 (新年份在前), 每天两个模型各一行"""
+    lines = ["> 汇总规则如下：", "> 1. 以月份为二级标题维度", ""]
+    last_year = 2026
+    for year in range(last_year, last_year - years, -1):
+        for month in range(12, 0, -1):
+            lines += [f"## {month}月", "", "| 日期  | 模型 | 1 | 2 | 3 | 4 | 5 |", "| :-- | :-- | :-- | :-- | :-- | :-- | :-- |"]
+            for day in range(28, 0, -1):
+                for model in ("gpt-5", "gemini"):
+                    cells = []
+                    for _ in range(5):
+                        owner, name = f"owner{rng.randrange(5000)}", f"repo{rng.randrange(100000)}"
+                        cells.append(f"[{name}](https://github.com/{owner}/{name})")
+                    lines.append(f"| {day:<2}  | `{model}` | " + " | ".join(cells) + " |")
+            lines.append("")
+    _write(path, "\n".join(lines) + "\n")
+    return last_year
+
+
+def make_repos(helpers, path, count, rng):
+    """fetch_trending.py 输出格式的 {meta, repos}, 仓库经 process_repos 处理"""
+    raw = []
+    for i in range(count):
+        license_id = rng.choice(LICENSES)
+        raw.append({
+            "full_name": f"owner{i % 997}/repo-{i}",
+            "name": f"repo-{i}",
+            "owner": {"login": f"owner{i % 997}"},
+            "html_url": f"https://github.com/owner{i % 997}/repo-{i}",
+            "description": f"An {rng.choice(TOPICS)} toolkit for building things fast, number {i}.",
+            "stargazers_count": rng.randrange(100, 80000),
+            "forks_count": rng.randrange(0, 9000),
+            "open_issues_count": rng.randrange(0, 500),
+            "language": rng.choice(LANGUAGES),
+            "license": {"spdx_id": license_id} if license_id else None,
+            "topics": rng.sample(TOPICS, 3),
+            "created_at": "2025-06-01T00:00:00Z",
+            "updated_at": "2026-01-01T00:00:00Z",
+            "pushed_at": "2026-01-01T00:00:00Z",
+        })
+    repos = helpers.fetch_trending.process_repos(raw, "all")
+    output = helpers.fetch_trending.format_output(repos, "past_week", "all")
+    _write(path, json.dumps(output, ensure_ascii=False))
+
+
+def make_guideline_csvs(source_dir, data_dir, rows):
+    """把 data/ 下每个 CSV 的行循环复制到 rows 行 (每轮追加序号, 避免文档完全相同)"""
+    os.makedirs(data_dir, exist_ok=True)
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.endswith(".csv"):
+            continue
+        with open(os.path.join(source_dir, filename), "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            body = list(reader)
+        with open(os.path.join(data_dir, filename), "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for i in range(rows):
+                row = list(body[i % len(body)])
+                row[-1] = f"{row[-1]} v{i // len(body)}"
+                writer.writerow(row)
+
+
+def build_fixtures(helpers, work_dir, sizes, seed=0):
+    rng = random.Random(seed)
+    fx = SimpleNamespace(work_dir=work_dir)
+    fx.draft_dir = os.path.join(work_dir, "drafts")
+    fx.publish_dir = os.path.join(work_dir, "published")
+    fx.map_file = os.path.join(work_dir, ".publish-map.json")
+    fx.summary_path = os.path.join(work_dir, "summary.md")
+    fx.repos_path = os.path.join(work_dir, "repos.json")
+    fx.data_dir = os.path.join(work_dir, "data")
+
+    drafts = make_drafts(fx.draft_dir, sizes["drafts"])
+    os.makedirs(fx.publish_dir)
+    # 第一篇草稿已发布 (供 update_published), 其余作为待发布草稿
+    fx.updated_draft = drafts[0]
+    fx.pending_drafts = drafts[1:]
+    make_publish_map(helpers, fx.map_file, sizes["map_entries"],
+                     [(fx.updated_draft, os.path.join(fx.publish_dir, "001_post-1.md"))])
+    fx.summary_year = make_summary(fx.summary_path, sizes["summary_years"], rng)
+    make_repos(helpers, fx.repos_path, sizes["repos"], rng)
+    make_guideline_csvs(str(helpers.core.DATA_DIR), fx.data_dir, sizes["csv_rows"])
+    return fx
+
+
+# ========== 基准项 ==========
+# 每个基准返回 (setup, run): setup(i) 不计时, run(i) 计时
+
+def bench_get_next_id(helpers, fx):
+    return None, lambda i: helpers.get_next_id.get_next_id(fx.draft_dir, allocate=True)
+
+
+def bench_get_next_id_rescan(helpers, fx):
+    return None, lambda i: helpers.get_next_id.get_next_id(fx.draft_dir, rescan=True)
+
+
+def bench_publish_draft(helpers, fx):
+    def run(i):
+        with contextlib.redirect_stdout(io.StringIO()):
+            helpers.publish_draft.publish_draft(fx.pending_drafts[i], fx.publish_dir, "", fx.map_file)
+    return None, run
+
+
+def bench_update_published(helpers, fx):
+    def setup(i):
+        with open(fx.updated_draft, "a", encoding="utf-8") as f:
+            f.write(f"修订 {i}\n")
+
+    def run(i):
+        with contextlib.redirect_stdout(io.StringIO()):
+            helpers.update_published.update_published(fx.updated_draft, fx.map_file)
+    return setup, run
+
+
+def bench_load_summary_repo_set(helpers, fx):
+    return None, lambda i: helpers.fetch_trending.load_summary_repo_set(fx.summary_path)
+
+
+def bench_update_summary_table(helpers, fx):
+    repos = [{"name": f"new-{n}", "url": f"https://github.com/bench/new-{n}"} for n in range(5)]
+
+    def run(i):
+        # 写入最新年份的年中月份: 插入点位于文件中部, 需要整体重写
+        helpers.score_repos.update_summary_table(fx.summary_path, "bench", repos, today=f"{fx.summary_year}-06-15")
+    return None, run
+
+
+def bench_score_repos(helpers, fx):
+    with open(fx.repos_path, "r", encoding="utf-8") as f:
+        repos = json.load(f)["repos"]
+    return None, lambda i: helpers.score_repos.score_repos([dict(repo) for repo in repos])
+
+
+def bench_core_search(helpers, fx):
+    def run(i):
+        for query, domain in SEARCH_QUERIES:
+            helpers.core.search(query, domain)
+    return None, run
+
+
+BENCHMARKS = {
+    "get_next_id": bench_get_next_id,
+    "get_next_id_rescan": bench_get_next_id_rescan,
+    "publish_draft": bench_publish_draft,
+    "update_published": bench_update_published,
+    "load_summary_repo_set": bench_load_summary_repo_set,
+    "update_summary_table": bench_update_summary_table,
+    "score_repos": bench_score_repos,
+    "core_search": bench_core_search,
+}
+
+
+def measure(setup, run, repeat):
+    samples = []
+    for i in range(repeat):
+        if setup is not None:
+            setup(i)
+        started = time.perf_counter()
+        run(i)
+        samples.append(time.perf_counter() - started)
+    return {"best": min(samples), "median": statistics.median(samples)}
+
+
+@contextlib.contextmanager
+def isolated_environment(helpers, fx):
+    """缓存目录与 UI/UX 数据目录指向临时目录, 结束后恢复"""
+    saved_cache = os.environ.get("FLOWAI_CACHE_DIR")
+    saved_data = helpers.core.DATA_DIR
+    os.environ["FLOWAI_CACHE_DIR"] = os.path.join(fx.work_dir, "cache")
+    helpers.core.DATA_DIR = type(saved_data)(fx.data_dir)
+    try:
+        yield
+    finally:
+        helpers.core.DATA_DIR = saved_data
+        if saved_cache is None:
+            os.environ.pop("FLOWAI_CACHE_DIR", None)
+        else:
+            os.environ["FLOWAI_CACHE_DIR"] = saved_cache
+
+
+def run_benchmarks(names=None, scale=1.0, repeat=3, work_dir=None):
+    """生成合成数据并运行基准, 返回 {名称: {"best": 秒, "median": 秒}}"""
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"未知基准: {', '.join(unknown)}")
+
+    helpers = load_helpers()
+    sizes = scaled_sizes(scale, repeat)
+    with tempfile.TemporaryDirectory(prefix="flowai-bench-", dir=work_dir) as tmp:
+        fx = build_fixtures(helpers, tmp, sizes)
+        with isolated_environment(helpers, fx):
+            results = {}
+            for name in names:
+                setup, run = BENCHMARKS[name](helpers, fx)
+                results[name] = measure(setup, run, repeat)
+    return results
+
+
+def check_regressions(results, baseline, threshold, limits=None):
+    """返回回归列表 [(名称, 当前秒数, 允许上限)]: 超过 基线*(1+阈值) 或绝对上限"""
+    regressions = []
+    for name, result in results.items():
+        allowed = []
+        if name in baseline:
+            allowed.append(baseline[name] * (1 + threshold))
+        if limits and name in limits:
+            allowed.append(limits[name])
+        if allowed and result["best"] > min(allowed):
+            regressions.append((name, result["best"], min(allowed)))
+    return regressions
+
+
+def load_baseline(path, scale):
+    """读取基线 {名称: 秒}; 文件不存在或规模不同时返回空字典"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("scale") != scale:
+        print(f"警告: 基线规模 {data.get('scale')} 与当前规模 {scale} 不同, 忽略基线", file=sys.stderr)
+        return {}
+    return data.get("results", {})
+
+
+def save_baseline(path, scale, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = {"scale": scale, "results": {name: round(r["best"], 6) for name, r in results.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def parse_limits(values):
+    limits = {}
+    for value in values or []:
+        name, _, seconds = value.partition("=")
+        try:
+            limits[name] = float(seconds)
+        except ValueError:
+            raise ValueError(f"--max 格式应为 名称=秒: {value}") from None
+    return limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the skill helper scripts on synthetic fixtures.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="only run these benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="fixture size multiplier (default: 1.0)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the fastest counts (default: 3)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON (default: .flowai/bench-baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("FLOWAI_BENCH_THRESHOLD", DEFAULT_THRESHOLD)),
+                        help="allowed slowdown over baseline, 0.25 = 25%% (env: FLOWAI_BENCH_THRESHOLD)")
+    parser.add_argument("--max", action="append", metavar="NAME=SECONDS", help="absolute time limit, repeatable")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        limits = parse_limits(args.max)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    results = run_benchmarks(args.only, args.scale, max(1, args.repeat))
+    baseline = load_baseline(args.baseline, args.scale)
+    regressions = check_regressions(results, baseline, args.threshold, limits)
+
+    if args.json:
+        print(json.dumps({"scale": args.scale, "results": results,
+                          "regressions": [name for name, _, _ in regressions]}, indent=2))
+    else:
+        width = max(len(name) for name in results)
+        for name, result in results.items():
+            reference = f"  baseline {baseline[name]:.4f}s" if name in baseline else ""
+            print(f"{name.ljust(width)}  best {result['best']:.4f}s  median {result['median']:.4f}s{reference}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, args.scale, results)
+        print(f"基线已写入 {args.baseline}", file=sys.stderr)
+    elif regressions:
+        for name, seconds, allowed in regressions:
+            print(f"回归: {name} {seconds:.4f}s > {allowed:.4f}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+FlowAI 统一命令行入口
+
+把各技能的辅助脚本作为子命令, 在当前进程内执行 (子命令被调用时才加载对应脚本):
+
+    python3 scripts/flowai.py list
+    python3 scripts/flowai.py next-id docs/post_local
+    python3 scripts/flowai.py publish --draft-file docs/post_local/001_title.md \
+        --publish-dir /srv/blog --map-file /srv/blog/.publish-map.json
+    python3 scripts/flowai.py run steps.json          # 在同一进程内依次执行多个步骤
+
+steps.json 为步骤列表, 参数中的 {<id>} 会替换为此前同 id 步骤的输出 (去除首尾空白):
+
+    [
+      {"id": "dir", "command": "detect"},
+      {"id": "num", "command": "next-id", "args": ["{dir}"]},
+      {"command": "write", "args": ["--dir", "{dir}", "--id", "{num}", "--title", "T",
+                                    "--main-content-file", "main.md"]}
+    ]
+
+run 模式输出每个步骤的 JSON 结果; 某一步失败 (退出码非 0) 时停止, 除非指定 --keep-going.
+多个步骤共享已加载的模块与进程内缓存 (例如 fs_common 的项目根目录缓存), 不再重复启动解释器.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import runpy
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 子命令 -> (说明, 脚本相对仓库根目录的路径)
+COMMANDS = {
+    "fs": ("fs 系列统一入口 (root/detect/next-id/write/new)", "skills/fs/fs-common/scripts/fs_cli.py"),
+    "detect": ("检测或创建草稿目录", "skills/fs/fs-detect/scripts/detect_draft_dir.py"),
+    "next-id": ("获取下一个文章 ID", "skills/fs/fs-next-id/scripts/get_next_id.py"),
+    "write": ("写入草稿及配套文件", "skills/fs/fs-write/scripts/write_draft.py"),
+    "publish": ("发布草稿并维护映射", "skills/publish/publish-github-go/scripts/publish_draft.py"),
+    "update": ("根据草稿更新已发布文章", "skills/fs/fs-update/scripts/update_published.py"),
+    "watch": ("监听草稿目录并自动更新", "skills/fs/fs-update/scripts/watch_drafts.py"),
+    "fetch-trending": ("获取 GitHub 趋势仓库", "skills/post/post-radar/scripts/fetch_trending.py"),
+    "score-repos": ("为趋势仓库评分", "skills/post/post-radar/scripts/score_repos.py"),
+    "radar": ("趋势雷达一体化流水线", "skills/post/post-radar/scripts/radar_pipeline.py"),
+    "summary": ("summary 分区存储", "skills/post/post-radar/scripts/summary_store.py"),
+    "ui-search": ("UI/UX 设计知识检索", "skills/ui/ui-ux-pro/scripts/search.py"),
+}
+
+STEP_REF_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_-]*)\}")
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """与解释器一致地把 SystemExit 转为退出码"""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def run_command(command: str, argv: List[str]) -> int:
+    """在当前进程内以 __main__ 身份执行子命令对应的脚本, 返回退出码"""
+    if command not in COMMANDS:
+        print(f"未知命令: {command} (可用: {', '.join(sorted(COMMANDS))})", file=sys.stderr)
+        return 2
+
+    script = os.path.join(ROOT_DIR, COMMANDS[command][1])
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    # 与直接运行脚本时一致: 脚本所在目录位于 sys.path 首位, 同目录模块可直接导入
+    sys.argv = [script] + list(argv)
+    sys.path.insert(0, os.path.dirname(script))
+    try:
+        runpy.run_path(script, run_name="__main__")
+        return 0
+    except SystemExit as e:
+        return _exit_code(e)
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+
+
+def _substitute(value: str, outputs: Dict[str, str]) -> str:
+    return STEP_REF_PATTERN.sub(lambda m: outputs.get(m.group(1), m.group(0)), value)
+
+
+def run_steps(steps: List[Dict[str, Any]], keep_going: bool = False) -> List[Dict[str, Any]]:
+    """
+    依次执行步骤, 返回 [{"id", "command", "exit_code", "stdout", "seconds"}]
+
+    每步的标准输出被捕获 (标准错误照常输出), 供后续步骤以 {id} 引用.
+    """
+    outputs: Dict[str, str] = {}
+    results = []
+    for index, step in enumerate(steps):
+        step_id = str(step.get("id", index))
+        command = step.get("command", "")
+        args = [_substitute(str(arg), outputs) for arg in step.get("args", [])]
+
+        buffer = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(buffer):
+            exit_code = run_command(command, args)
+        stdout = buffer.getvalue()
+
+        outputs[step_id] = stdout.strip()
+        results.append({
+            "id": step_id,
+            "command": command,
+            "exit_code": exit_code,
+            "stdout": stdout,
+            "seconds": round(time.perf_counter() - started, 4),
+        })
+        if exit_code != 0 and not keep_going:
+            break
+    return results
+
+
+def _load_steps(path: str) -> List[Dict[str, Any]]:
+    if path == "-":
+        data = json.load(sys.stdin)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("steps", [])
+    if not isinstance(data, list) or not all(isinstance(step, dict) for step in data):
+        raise ValueError("步骤文件应为对象列表, 或包含 steps 列表的对象")
+    return data
+
+
+def cmd_run(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="flowai run", description="在同一进程内依次执行 JSON 步骤列表。")
+    parser.add_argument("steps", help="步骤 JSON 文件路径, - 表示从标准输入读取")
+    parser.add_argument("--keep-going", action="store_true", help="某一步失败后继续执行后续步骤")
+    args = parser.parse_args(argv)
+
+    try:
+        steps = _load_steps(args.steps)
+    except (OSError, ValueError) as e:
+        print(f"错误: 无法读取步骤文件: {e}", file=sys.stderr)
+        return 1
+
+    results = run_steps(steps, args.keep_going)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    failed = [r for r in results if r["exit_code"] != 0]
+    return failed[-1]["exit_code"] if failed else 0
+
+
+def cmd_list() -> int:
+    width = max(len(name) for name in COMMANDS)
+    for name, (desc, script) in COMMANDS.items():
+        print(f"  {name.ljust(width)}  {desc}  ({script})")
+    print(f"  {'run'.ljust(width)}  在同一进程内执行 JSON 步骤列表")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help", "list"):
+        if not argv or argv[0] != "list":
+            print(__doc__.strip())
+            print("\n命令:")
+        return cmd_list()
+
+    command, rest = argv[0], argv[1:]
+    if command == "run":
+        return cmd_run(rest)
+    return run_command(command, rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,290 @@
 #!/usr/bin/env python3
+"""
+生成 skills/manifest.json 与 skills/skills-index.json
+
+manifest.json: 每个技能记录扁平化名称、源路径、每个文件的 SHA-256 与大小, 以及由文件列表
+计算的 tree_hash (任一文件内容或路径变化都会改变), 安装脚本据此只更新变化的技能.
+
+skills-index.json: 以技能名为键的 SKILL.md frontmatter 索引 (描述、触发词、文件列表),
+查找技能时只需读取这一个文件 (见 query-skills.py).
+
+文件哈希由线程池并发计算; 上次的结果缓存在 .flowai/ 下, size 与 mtime 均未变化的文件
+直接复用缓存中的哈希与 frontmatter.
+"""
+import argparse
+import hashlib
 import json
 import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
+# frontmatter 优先用 PyYAML 解析; 未安装时退化为只支持 "key: value" 与列表的简单解析
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# 原子写入统一使用 fs-common 的实现
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "skills", "fs", "fs-common", "scripts"))
+from fs_common import write_json_atomic  # noqa: E402
+
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SKILLS_DIR = os.path.join(ROOT_DIR, "skills")
+CACHE_PATH = os.path.join(ROOT_DIR, ".flowai", "manifest-cache.json")
+INDEX_CACHE_PATH = os.path.join(ROOT_DIR, ".flowai", "skills-index-cache.json")
+INDEX_FILE = "skills-index.json"
+INDEX_VERSION = 1
+FRONTMATTER_PATTERN = re.compile(r"\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.S)
+
+# 不进入 manifest (也不随发布包安装) 的文件
+EXCLUDED_DIRS = {"__pycache__", ".git", ".pytest_cache"}
+EXCLUDED_NAMES = {".DS_Store"}
+EXCLUDED_SUFFIXES = (".pyc", ".pyo")
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ConflictError(Exception):
+    """同名技能出现在多个命名空间 (索引与扁平化安装都以技能名为键)"""
+
+    def __init__(self, conflicts):
+        super().__init__("skill name conflicts detected:\n" + "".join(f"{line}\n" for line in conflicts))
+        self.conflicts = conflicts
+
+
+def iter_skill_dirs(skills_dir):
+    """按名称顺序返回 [(namespace, name, 技能目录)]"""
+    skills = []
+    for namespace in sorted(os.listdir(skills_dir)):
+        ns_dir = os.path.join(skills_dir, namespace)
+        if not os.path.isdir(ns_dir):
+            continue
+        for name in sorted(os.listdir(ns_dir)):
+            skill_dir = os.path.join(ns_dir, name)
+            if os.path.isdir(skill_dir):
+                skills.append((namespace, name, skill_dir))
+    return skills
+
+
+def list_skill_files(skill_dir):
+    """技能目录下需要发布的文件 (相对路径, posix 分隔符, 已排序)"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skill_dir):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        for filename in filenames:
+            if filename in EXCLUDED_NAMES or filename.endswith(EXCLUDED_SUFFIXES):
+                continue
+            path = os.path.join(dirpath, filename)
+            if os.path.isfile(path):
+                files.append(os.path.relpath(path, skill_dir).replace(os.sep, "/"))
+    return sorted(files)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
-entries = []
-for namespace in sorted(os.listdir(SKILLS_DIR)):
-    ns_dir = os.path.join(SKILLS_DIR, namespace)
-    if not os.path.isdir(ns_dir):
-        continue
-    for name in sorted(os.listdir(ns_dir)):
-        skill_dir = os.path.join(ns_dir, name)
-        if not os.path.isdir(skill_dir):
+def tree_hash(files):
+    """技能的树哈希: 对 sha256sum 格式的文件清单 ("<sha256>  <path>\\n", 按路径排序) 求 SHA-256"""
+    lines = "".join(f"{entry['sha256']}  {entry['path']}\n" for entry in files)
+    return hashlib.sha256(lines.encode("utf-8")).hexdigest()
+
+
+def collect_skills(skills_dir):
+    """[(namespace, name, 技能目录, 文件列表)], manifest 与索引共用一次目录遍历"""
+    return [(namespace, name, skill_dir, list_skill_files(skill_dir))
+            for namespace, name, skill_dir in iter_skill_dirs(skills_dir)]
+
+
+def _simple_yaml(text):
+    """PyYAML 不可用时的简单解析: 顶层 "key: value" (可带引号) 与 "- item" 列表"""
+    data, key = {}, None
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
             continue
+        stripped = line.strip()
+        if stripped.startswith("- ") and key is not None:
+            if not isinstance(data.get(key), list):
+                data[key] = []
+            data[key].append(stripped[2:].strip().strip("\"'"))
+        elif ":" in line and not line[0].isspace():
+            key, value = line.split(":", 1)
+            key, value = key.strip(), value.strip()
+            data[key] = value.strip("\"'") if value else None
+    return data
+
+
+def parse_frontmatter(text):
+    """解析 SKILL.md 开头 --- 包围的 YAML frontmatter, 没有或无法解析时返回 {}"""
+    match = FRONTMATTER_PATTERN.match(text)
+    if not match:
+        return {}
+    if yaml is None:
+        return _simple_yaml(match.group(1))
+    try:
+        data = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _triggers(value):
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    if isinstance(value, str) and value.strip():
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return []
+
+
+def build_index(skills, cache_path=None):
+    """
+    构建技能索引 {"version": 1, "skills": {name: {...}}}
+
+    SKILL.md 的 frontmatter 按 size + mtime 缓存, 未修改的技能不重新读取.
+    同名技能出现在多个命名空间时抛出 ConflictError.
+    """
+    seen = {}
+    conflicts = []
+    for _, name, skill_dir, _ in skills:
+        if name in seen:
+            conflicts.append(f"{name}: {seen[name]} and {skill_dir}")
+        else:
+            seen[name] = skill_dir
+    if conflicts:
+        raise ConflictError(conflicts)
+
+    cache = load_hash_cache(cache_path) if cache_path else {}
+    new_cache = {}
+    entries = {}
+    for namespace, name, skill_dir, files in skills:
+        skill_md = os.path.join(skill_dir, "SKILL.md")
+        frontmatter = {}
+        if "SKILL.md" in files:
+            stat = os.stat(skill_md)
+            cached = cache.get(skill_md)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                frontmatter = cached[2]
+            else:
+                with open(skill_md, "r", encoding="utf-8") as f:
+                    frontmatter = parse_frontmatter(f.read())
+                # 只缓存可 JSON 序列化的字段
+                frontmatter = json.loads(json.dumps(frontmatter, ensure_ascii=False, default=str))
+            new_cache[skill_md] = [stat.st_size, stat.st_mtime_ns, frontmatter]
+        entries[name] = {
+            "name": str(frontmatter.get("name") or name),
+            "namespace": namespace,
+            "source_path": f"skills/{namespace}/{name}",
+            "description": str(frontmatter.get("description") or ""),
+            "triggers": _triggers(frontmatter.get("triggers")),
+            "files": files,
+        }
+    if cache_path and new_cache != cache:
+        save_hash_cache(cache_path, new_cache)
+    return {"version": INDEX_VERSION, "skills": entries}
+
+
+def load_hash_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_hash_cache(path, entries):
+    write_json_atomic(path, entries)
+
+
+def hash_files(paths, cache, workers=None):
+    """
+    并发计算文件哈希, 返回 ({路径: (size, sha256)}, 新缓存)
+
+    cache 为 {路径: [size, mtime_ns, sha256]}; size 与 mtime 均一致的文件不重新读取.
+    """
+    def work(path):
+        stat = os.stat(path)
+        cached = cache.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            digest = cached[2]
+        else:
+            digest = file_sha256(path)
+        return path, [stat.st_size, stat.st_mtime_ns, digest]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        new_cache = dict(pool.map(work, paths))
+    return {path: (size, digest) for path, (size, _, digest) in new_cache.items()}, new_cache
+
+
+def build_manifest(skills_dir, version, cache_path=None, workers=None, skills=None):
+    if skills is None:
+        skills = collect_skills(skills_dir)
+
+    paths = [os.path.join(skill_dir, rel) for _, _, skill_dir, files in skills for rel in files]
+    cache = load_hash_cache(cache_path) if cache_path else {}
+    digests, new_cache = hash_files(paths, cache, workers)
+    if cache_path and new_cache != cache:
+        save_hash_cache(cache_path, new_cache)
+
+    entries = []
+    for namespace, name, skill_dir, rel_paths in skills:
+        files = []
+        for rel in rel_paths:
+            size, digest = digests[os.path.join(skill_dir, rel)]
+            files.append({"path": rel, "size": size, "sha256": digest})
         entries.append({
             "flattened_name": name,
             "source_path": f"skills/{namespace}/{name}",
+            "tree_hash": tree_hash(files),
+            "size": sum(entry["size"] for entry in files),
+            "files": files,
         })
 
-version = os.environ.get("RELEASE_VERSION") or date.today().strftime("%Y.%m.%d")
+    return {
+        "name": "flow-ai-skills",
+        "version": version,
+        "updated_at": date.today().isoformat(),
+        "source": "repo",
+        "skills": entries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate skills/manifest.json and the skills frontmatter index.")
+    parser.add_argument("--workers", type=int, default=None, help="hashing threads (default: CPU based)")
+    parser.add_argument("--no-cache", action="store_true", help="rehash and reparse every file, ignoring the caches")
+    args = parser.parse_args()
+
+    version = os.environ.get("RELEASE_VERSION") or date.today().strftime("%Y.%m.%d")
+    skills = collect_skills(SKILLS_DIR)
+    try:
+        index = build_index(skills, None if args.no_cache else INDEX_CACHE_PATH)
+    except ConflictError as e:
+        print(e, file=sys.stderr, end="")
+        sys.exit(1)
+    manifest = build_manifest(SKILLS_DIR, version, None if args.no_cache else CACHE_PATH, args.workers, skills)
+
+    out_path = os.path.join(SKILLS_DIR, "manifest.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+    index_path = os.path.join(SKILLS_DIR, INDEX_FILE)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
 
-manifest = {
-    "name": "flow-ai-skills",
-    "version": version,
-    "updated_at": date.today().isoformat(),
-    "source": "repo",
-    "skills": entries,
-}
+    print(out_path)
+    print(index_path)
+    print(f"skills: {len(manifest['skills'])}")
+    print(f"files: {sum(len(skill['files']) for skill in manifest['skills'])}")
 
-out_path = os.path.join(SKILLS_DIR, "manifest.json")
-with open(out_path, "w", encoding="utf-8") as f:
-    json.dump(manifest, f, ensure_ascii=False, indent=2)
-    f.write("\n")
 
-print(out_path)
-print(f"skills: {len(entries)}")
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ MODE="install"
 VERSION=""
 MIRROR=""
 ASSET_PATTERN="flow-ai-skills-.*\\.tar\\.gz"
+INSTALLED_MANIFEST=".flowai-manifest.json"
 API_BASE="${GITHUB_API_BASE:-https://api.github.com}"
 
 usage() {
@@ -15,13 +16,14 @@ Usage: scripts/install-skills.sh [options]
 
 Options:
   --install              Install skills (default)
-  --update               Update skills (same as install)
+  --update               Update only skills that changed (delta via release manifest;
+                         falls back to a full install if the release has no manifest)
   --uninstall            Remove installed skills (backup first)
   --rollback             Restore from latest backup
   --version <tag>        Install specific release tag (e.g. v0.1.0)
   --repo <owner/name>    GitHub repo (default: sggmico/flow-ai)
   --target <dir>         Install directory (default: ~/.codex/skills)
-  --mirror <url>         Mirror base URL or direct .tar.gz URL
+  --mirror <url>         Mirror base URL, local directory, or direct .tar.gz URL
   --asset-pattern <re>   Regex for release asset name
   -h, --help             Show help
 
@@ -40,7 +42,12 @@ require_cmd() {
 
 download() {
   local url="$1" out="$2"
-  curl -fsSL "$url" -o "$out"
+  if [[ "$url" == *://* ]]; then
+    curl -fsSL "$url" -o "$out"
+  else
+    # 本地目录作为镜像
+    cp "$url" "$out"
+  fi
 }
 
 checksum_verify() {
@@ -66,7 +73,7 @@ parse_args() {
   while [[ $# -gt 0 ]]; do
     case "$1" in
       --install) MODE="install"; shift ;;
-      --update) MODE="install"; shift ;;
+      --update) MODE="update"; shift ;;
       --uninstall) MODE="uninstall"; shift ;;
       --rollback) MODE="rollback"; shift ;;
       --version) VERSION="$2"; shift 2 ;;
@@ -253,16 +260,156 @@ PY
     cp -a "$flat_dir/." "$TARGET_DIR/"
   fi
 
+  # 保留发布清单, 供下次 --update 做增量比较
+  if [[ -n "$manifest_path" ]]; then
+    cp "$manifest_path" "$TARGET_DIR/$INSTALLED_MANIFEST"
+  fi
+
+  write_install_meta "$asset_url"
+  log "installed to: $TARGET_DIR"
+}
+
+write_install_meta() {
   cat <<META > "$TARGET_DIR/.flowai-install.json"
 {
   "repo": "$REPO",
   "version": "${VERSION:-latest}",
   "installed_at": "$(date -u +%Y-%m-%dT%H:%M:%SZ)",
-  "source": "$asset_url"
+  "source": "$1"
 }
 META
+}
 
-  log "installed to: $TARGET_DIR"
+release_base() {
+  if [[ -n "$MIRROR" ]]; then
+    if [[ "$MIRROR" == *.tar.gz ]]; then
+      dirname "$MIRROR"
+    else
+      printf '%s\n' "${MIRROR%/}"
+    fi
+  elif [[ -n "$VERSION" ]]; then
+    printf '%s\n' "https://github.com/$REPO/releases/download/$VERSION"
+  else
+    printf '%s\n' "https://github.com/$REPO/releases/latest/download"
+  fi
+}
+
+# 增量更新: 比较已安装清单与发布清单的 tree_hash, 只下载并替换变化的技能
+# 发布目录需包含 manifest.json 与每个技能的 skill-<name>-<tree_hash 前 16 位>.tar.gz
+update_from_manifest() {
+  require_cmd tar
+  require_cmd python3
+
+  local base tmp_dir release_manifest plan
+  base="$(release_base)"
+  [[ "$base" != *://* ]] || require_cmd curl
+  tmp_dir="$(mktemp -d)"
+  release_manifest="$tmp_dir/manifest.json"
+
+  if ! download "$base/manifest.json" "$release_manifest" 2>/dev/null; then
+    log "release manifest not found; falling back to full install"
+    rm -rf "$tmp_dir"
+    install_from_release
+    return
+  fi
+
+  plan="$tmp_dir/plan.tsv"
+  if ! python3 - "$release_manifest" "$TARGET_DIR/$INSTALLED_MANIFEST" "$TARGET_DIR" > "$plan" <<'PY'
+import json, os, re, sys
+release_path, installed_path, target_dir = sys.argv[1:4]
+with open(release_path, 'r', encoding='utf-8') as f:
+    release = {s['flattened_name']: s for s in json.load(f).get('skills', [])}
+if not release or not all(s.get('tree_hash') for s in release.values()):
+    sys.exit(2)
+try:
+    with open(installed_path, 'r', encoding='utf-8') as f:
+        installed = {s['flattened_name']: s for s in json.load(f).get('skills', [])}
+except (OSError, ValueError):
+    installed = {}
+valid = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+for name, skill in sorted(release.items()):
+    if not valid.match(name):
+        sys.exit(3)
+    old = installed.get(name)
+    if not old or old.get('tree_hash') != skill['tree_hash'] or not os.path.isdir(os.path.join(target_dir, name)):
+        print(f"update\t{name}\t{skill['tree_hash'][:16]}")
+for name in sorted(set(installed) - set(release)):
+    if valid.match(name):
+        print(f"remove\t{name}\t")
+PY
+  then
+    log "release manifest has no per-skill hashes; falling back to full install"
+    rm -rf "$tmp_dir"
+    install_from_release
+    return
+  fi
+
+  if [[ ! -s "$plan" ]]; then
+    cp "$release_manifest" "$TARGET_DIR/$INSTALLED_MANIFEST"
+    rm -rf "$tmp_dir"
+    log "already up to date: $TARGET_DIR"
+    return
+  fi
+
+  # 先下载、解压并逐个校验全部变化的技能, 全部通过后才改动安装目录
+  local stage_dir action name short updated removed
+  stage_dir="$tmp_dir/stage"
+  mkdir -p "$stage_dir"
+  updated=0
+  removed=0
+  while IFS=$'\t' read -r action name short; do
+    [[ "$action" == "update" ]] || continue
+    local archive="skill-$name-$short.tar.gz"
+    log "downloading: $archive"
+    download "$base/$archive" "$tmp_dir/$archive" || fail "download failed: $base/$archive"
+    tar -xzf "$tmp_dir/$archive" -C "$stage_dir"
+    python3 - "$release_manifest" "$name" "$stage_dir/$name" <<'PY' || fail "checksum mismatch: $name"
+import hashlib, json, os, sys
+manifest_path, name, skill_dir = sys.argv[1:4]
+with open(manifest_path, 'r', encoding='utf-8') as f:
+    skill = next(s for s in json.load(f)['skills'] if s['flattened_name'] == name)
+expected = {entry['path']: entry['sha256'] for entry in skill['files']}
+actual = {}
+for dirpath, _, filenames in os.walk(skill_dir):
+    for filename in filenames:
+        path = os.path.join(dirpath, filename)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        actual[os.path.relpath(path, skill_dir).replace(os.sep, '/')] = digest
+if actual != expected:
+    for rel in sorted(set(actual) ^ set(expected)):
+        print(f"  unexpected or missing: {rel}", file=sys.stderr)
+    for rel in sorted(k for k in set(actual) & set(expected) if actual[k] != expected[k]):
+        print(f"  digest mismatch: {rel}", file=sys.stderr)
+    sys.exit(1)
+PY
+  done < "$plan"
+
+  local backup_root
+  backup_root="${TARGET_DIR}.backups"
+  backup_existing "$backup_root"
+  mkdir -p "$TARGET_DIR"
+
+  while IFS=$'\t' read -r action name short; do
+    case "$action" in
+      update)
+        rm -rf "$TARGET_DIR/$name"
+        mv "$stage_dir/$name" "$TARGET_DIR/$name"
+        updated=$((updated + 1))
+        log "updated: $name"
+        ;;
+      remove)
+        rm -rf "$TARGET_DIR/$name"
+        removed=$((removed + 1))
+        log "removed: $name"
+        ;;
+    esac
+  done < "$plan"
+
+  cp "$release_manifest" "$TARGET_DIR/$INSTALLED_MANIFEST"
+  write_install_meta "$base/manifest.json"
+  rm -rf "$tmp_dir"
+  log "updated $updated, removed $removed skill(s) in: $TARGET_DIR"
 }
 
 uninstall_skills() {
@@ -292,6 +439,7 @@ main() {
   parse_args "$@"
   case "$MODE" in
     install) install_from_release ;;
+    update) update_from_manifest ;;
     uninstall) uninstall_skills ;;
     rollback) rollback_skills ;;
     *) fail "invalid mode" ;;
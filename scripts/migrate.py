@@ -9,6 +9,7 @@ FlowAI 一键迁移工具
     python3 scripts/migrate.py init          # 初始化配置文件
     python3 scripts/migrate.py check         # 检查配置完整性
     python3 scripts/migrate.py apply         # 应用配置到 Skills
+    python3 scripts/migrate.py apply --out DIR --profile NAME  # 按 profile 渲染到独立输出目录
     python3 scripts/migrate.py show          # 显示当前配置
     python3 scripts/migrate.py reset         # 重置为占位符 (需 git)
     python3 scripts/migrate.py diff          # 显示将要修改的内容
@@ -17,10 +18,17 @@ FlowAI 一键迁移工具
 """
 
 import argparse
+import fnmatch
+import hashlib
+import json
 import os
 import re
 import shutil
+import subprocess
 import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -33,6 +41,10 @@ except ImportError:
     print("请运行: pip install pyyaml")
     sys.exit(1)
 
+# 文件锁与原子写入统一使用 fs-common 的实现
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "skills", "fs", "fs-common", "scripts"))
+from fs_common import write_atomic  # noqa: E402
+
 
 class Colors:
     """终端颜色"""
@@ -63,6 +75,36 @@ class FlowAIMigrator:
     ENV_EXAMPLE = ".flowai.env.example"
     SKILLS_DIR = "skills"
 
+    # apply/diff 处理的文件 (相对 skills 目录的 glob), 可在配置 migrate.include / migrate.exclude 中覆盖
+    DEFAULT_INCLUDE = ["**/*.md", "**/scripts/*.py", "**/scripts/*.sh"]
+    DEFAULT_EXCLUDE = ["**/tests/**"]
+
+    # 不输出到 --out 目录的文件, 与 gen-skills-manifest.py 的发布排除规则一致 (另外跳过隐藏文件)
+    OUT_EXCLUDED_DIRS = {"__pycache__", ".git", ".pytest_cache"}
+    OUT_EXCLUDED_NAMES = {".DS_Store"}
+    OUT_EXCLUDED_SUFFIXES = (".pyc", ".pyo")
+
+    # 增量 apply 的状态: 每个文件的模板哈希、输入 (模板 + 所用配置值) 哈希与输出哈希
+    STATE_DIR = ".flowai"
+    STATE_FILE = "migrate-state.json"
+    STATE_VERSION = 1
+
+    # 解析结果缓存: 以配置文件与 .flowai.env 的 size/mtime 为键, 命中时跳过 YAML 解析
+    CONFIG_CACHE_FILE = "config-cache.json"
+    CONFIG_CACHE_VERSION = 1
+
+    # 占位符语法: ${NAME}, 一次扫描匹配全部占位符, 按名称查表替换
+    PLACEHOLDER_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+    # 用户自定义占位符所在的配置节: placeholders: {NAME: value}
+    CUSTOM_PLACEHOLDERS_KEY = "placeholders"
+
+    # 自定义占位符只替换这些类型的文件; 脚本中的 ${NAME} 多为 shell 变量, 只替换内置占位符
+    CUSTOM_PLACEHOLDER_SUFFIXES = (".md",)
+
+    # 多项目配置所在的配置节: profiles: {NAME: {github: {...}, ...}}, 深度合并到基础配置之上
+    PROFILES_KEY = "profiles"
+
     # 占位符到配置键的映射
     PLACEHOLDER_MAP = {
         "${PUBLISH_DIR}": "paths.publish_dir",
@@ -93,10 +135,13 @@ class FlowAIMigrator:
         "FLOWAI_UI_STACK": "defaults.ui_stack",
     }
 
-    def __init__(self, project_root: Path, verbose: bool = False):
+    def __init__(self, project_root: Path, verbose: bool = False, jobs: int = 8):
         self.root = project_root
         self.verbose = verbose
+        self.jobs = max(1, jobs)
         self.config: Dict[str, Any] = {}
+        # 合并后的配置展开为 "a.b.c" -> 值 的扁平字典 (中间节点同样保留), 查找不再逐级拆分键
+        self.resolved: Dict[str, Any] = {}
 
     def log(self, msg: str, level: str = "info") -> None:
         """日志输出"""
@@ -153,10 +198,7 @@ class FlowAIMigrator:
         print("-" * 50)
 
         all_valid = True
-        for key, desc in self.REQUIRED_CONFIGS:
-            value = self._get_nested(self.config, key)
-            is_valid = self._is_valid_value(value)
-
+        for key, desc, value, is_valid in self._validate_required():
             status = f"{Colors.GREEN}✓{Colors.RESET}" if is_valid else f"{Colors.RED}✗{Colors.RESET}"
             display_value = str(value) if value else "(未设置)"
 
@@ -181,39 +223,55 @@ class FlowAIMigrator:
             print(f"\n提示: 编辑 {self.root / self.CONFIG_FILE}")
             return 1
 
-    def apply(self) -> int:
-        """应用配置到 Skills"""
+    def apply(self, out: Optional[str] = None, profiles: Optional[List[str]] = None) -> int:
+        """
+        应用配置到 Skills
+
+        指定 out 时不修改仓库内文件, 而是把 skills 目录渲染到输出目录;
+        同时指定 profiles 时每个 profile 输出到 out/<profile>/.
+        """
         # 先检查配置
         self._load_config()
 
-        missing = []
-        for key, desc in self.REQUIRED_CONFIGS:
-            value = self._get_nested(self.config, key)
-            if not self._is_valid_value(value):
-                missing.append(desc)
+        if profiles and not out:
+            self.log("--profile 需要与 --out 一起使用", "error")
+            return 1
 
-        if missing:
+        skills_dir = self.root / self.SKILLS_DIR
+        if out:
+            if not skills_dir.exists():
+                self.log(f"Skills 目录不存在: {skills_dir}", "error")
+                return 1
+            return self._apply_out(skills_dir, Path(out), profiles or [])
+
+        if not all(is_valid for *_, is_valid in self._validate_required()):
             self.log("配置不完整, 请先运行 check 命令", "error")
             return 1
 
-        skills_dir = self.root / self.SKILLS_DIR
         if not skills_dir.exists():
             self.log(f"Skills 目录不存在: {skills_dir}", "error")
             return 1
 
         print(f"\n{Colors.BOLD}应用配置到 Skills:{Colors.RESET}")
 
+        state = self._load_state()
+        results = self._process_files(skills_dir, self._placeholder_table(), state, write=True)
+
         modified_count = 0
-        for skill_file in skills_dir.rglob("SKILL.md"):
-            if self._apply_to_file(skill_file):
+        for rel_path, action, _, error in results:
+            if error:
+                self.log(f"更新失败: {rel_path} ({error})", "error")
+            elif action == "updated":
                 modified_count += 1
+                self.log(f"已更新: {rel_path}", "success")
+        self._save_state(state)
 
         if modified_count > 0:
-            self.log(f"已更新 {modified_count} 个文件", "success")
+            self.log(f"已更新 {modified_count} 个文件 (共检查 {len(results)} 个)", "success")
         else:
             self.log("没有需要更新的文件", "info")
 
-        return 0
+        return 1 if any(error for *_, error in results) else 0
 
     def show(self) -> int:
         """显示当前配置"""
@@ -236,9 +294,10 @@ class FlowAIMigrator:
             ("defaults.ui_stack", "UI 技术栈"),
         ]
 
+        required_keys = {key for key, _ in self.REQUIRED_CONFIGS}
         for key, desc in all_keys:
-            value = self._get_nested(self.config, key)
-            is_required = any(k == key for k, _ in self.REQUIRED_CONFIGS)
+            value = self._get(key)
+            is_required = key in required_keys
             is_valid = self._is_valid_value(value)
 
             if is_required:
@@ -255,8 +314,13 @@ class FlowAIMigrator:
 
         return 0
 
-    def reset(self) -> int:
-        """重置为占位符"""
+    def reset(self, assume_yes: bool = False) -> int:
+        """
+        重置为占位符
+
+        只调用一次 git 列出 skills 下被修改的文件, 再用一次 git checkout 批量恢复.
+        有 apply 状态时只恢复 apply 渲染过的文件, 不会覆盖其他未提交的修改.
+        """
         skills_dir = self.root / self.SKILLS_DIR
 
         if not skills_dir.exists():
@@ -267,31 +331,61 @@ class FlowAIMigrator:
         print("提示: 使用 git 恢复原始文件")
         print()
 
-        for skill_file in skills_dir.rglob("SKILL.md"):
-            rel_path = skill_file.relative_to(self.root)
-            print(f"  git checkout {rel_path}")
+        started = time.monotonic()
+        result = self._git("diff", "--relative", "--name-only", "-z", "--", self.SKILLS_DIR)
+        if result.returncode != 0:
+            self.log("无法获取 git 修改列表", "error")
+            self.debug(result.stderr)
+            return 1
+        modified = [path for path in result.stdout.split("\0") if path]
+
+        state = self._load_state()
+        if state["files"]:
+            files = [path for path in modified if path in state["files"]]
+        else:
+            # 没有 apply 状态 (旧版本 apply): 恢复所有匹配处理范围的已修改文件
+            targets = {path.relative_to(self.root).as_posix() for path in self._target_files(skills_dir)}
+            files = [path for path in modified if path in targets]
 
+        if not files:
+            self.log("没有需要重置的文件", "info")
+            return 0
+
+        for path in files:
+            print(f"  {path}")
         print()
-        response = input("是否执行上述命令? [y/N]: ").strip().lower()
-
-        if response == 'y':
-            import subprocess
-            for skill_file in skills_dir.rglob("SKILL.md"):
-                rel_path = skill_file.relative_to(self.root)
-                result = subprocess.run(
-                    ["git", "checkout", str(rel_path)],
-                    cwd=self.root,
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    self.log(f"已重置: {rel_path}", "success")
-                else:
-                    self.log(f"重置失败: {rel_path}", "error")
-                    self.debug(result.stderr)
+        print(f"  git checkout -- <以上 {len(files)} 个文件>")
+
+        print()
+        if not assume_yes:
+            response = input("是否执行上述命令? [y/N]: ").strip().lower()
+            if response != 'y':
+                return 0
+
+        result = self._git("checkout", "--pathspec-from-file=-", "--pathspec-file-nul", "--",
+                           input="\0".join(files))
+        if result.returncode != 0:
+            self.log("重置失败", "error")
+            self.debug(result.stderr)
+            return 1
 
+        for path in files:
+            state["files"].pop(path, None)
+        self._save_state(state)
+
+        self.log(f"已重置 {len(files)} 个文件, 耗时 {time.monotonic() - started:.2f}s", "success")
         return 0
 
+    def _git(self, *args: str, input: Optional[str] = None) -> "subprocess.CompletedProcess[str]":
+        """在项目根目录执行 git 命令"""
+        return subprocess.run(
+            ["git", *args],
+            cwd=self.root,
+            input=input,
+            capture_output=True,
+            text=True
+        )
+
     def diff(self) -> int:
         """显示将要修改的内容"""
         self._load_config()
@@ -303,12 +397,13 @@ class FlowAIMigrator:
 
         print(f"\n{Colors.BOLD}将要修改的内容:{Colors.RESET}")
 
+        state = self._load_state()
+        results = self._process_files(skills_dir, self._placeholder_table(), state, write=False)
+
         has_changes = False
-        for skill_file in skills_dir.rglob("SKILL.md"):
-            changes = self._get_file_changes(skill_file)
-            if changes:
+        for rel_path, action, changes, _ in results:
+            if action == "updated" and changes:
                 has_changes = True
-                rel_path = skill_file.relative_to(self.root)
                 print(f"\n{Colors.BLUE}{rel_path}:{Colors.RESET}")
                 for old, new in changes:
                     print(f"  {Colors.RED}- {old}{Colors.RESET}")
@@ -322,27 +417,42 @@ class FlowAIMigrator:
     # ========== 辅助方法 ==========
 
     def _load_config(self) -> None:
-        """加载配置"""
+        """
+        加载配置: flowai.config.yaml + .flowai.env + 系统环境变量
+
+        两个文件的解析结果缓存在 .flowai/config-cache.json, 文件未变化时直接复用;
+        环境变量覆盖每次都重新应用, 最后展开为 self.resolved.
+        """
         config_path = self.root / self.CONFIG_FILE
+        env_file = self.root / self.ENV_FILE
+        cache_key = [self._file_signature(config_path), self._file_signature(env_file)]
 
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f) or {}
-            self.debug(f"已加载配置: {config_path}")
+        cached = self._read_config_cache(cache_key)
+        if cached is not None:
+            self.config, env_values = cached
+            self.debug("已复用配置解析缓存")
         else:
-            self.config = {}
-            self.debug("配置文件不存在, 使用默认值")
+            if config_path.exists():
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    self.config = yaml.safe_load(f) or {}
+                self.debug(f"已加载配置: {config_path}")
+            else:
+                self.config = {}
+                self.debug("配置文件不存在, 使用默认值")
+
+            env_values = self._parse_env_file(env_file) if env_file.exists() else {}
+            self._write_config_cache(cache_key, self.config, env_values)
 
         # 加载环境变量覆盖
-        self._load_env_overrides()
+        self._load_env_overrides(env_values)
+        self.resolved = self._flatten(self.config)
 
-    def _load_env_overrides(self) -> None:
+    def _load_env_overrides(self, env_values: Dict[str, str]) -> None:
         """加载环境变量覆盖"""
         # 先加载 .flowai.env 文件
-        env_file = self.root / self.ENV_FILE
-        if env_file.exists():
-            self._parse_env_file(env_file)
-            self.debug(f"已加载环境变量: {env_file}")
+        if env_values:
+            os.environ.update(env_values)
+            self.debug(f"已加载环境变量: {self.root / self.ENV_FILE}")
 
         # 然后应用系统环境变量
         for env_key, config_key in self.ENV_MAP.items():
@@ -351,8 +461,9 @@ class FlowAIMigrator:
                 self._set_nested(self.config, config_key, value)
                 self.debug(f"环境变量覆盖: {env_key} -> {config_key}")
 
-    def _parse_env_file(self, path: Path) -> None:
+    def _parse_env_file(self, path: Path) -> Dict[str, str]:
         """解析 .env 文件"""
+        values = {}
         with open(path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
@@ -360,17 +471,70 @@ class FlowAIMigrator:
                     key, value = line.split('=', 1)
                     key = key.strip()
                     value = value.strip().strip('"\'')
-                    os.environ[key] = value
-
-    def _get_nested(self, d: dict, key: str) -> Any:
-        """获取嵌套键值"""
-        keys = key.split('.')
-        for k in keys:
-            if isinstance(d, dict) and k in d:
-                d = d[k]
-            else:
-                return None
-        return d
+                    values[key] = value
+        return values
+
+    def _file_signature(self, path: Path) -> Optional[List[int]]:
+        """文件的 [size, mtime_ns], 不存在时为 None"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _config_cache_path(self) -> Path:
+        return self.root / self.STATE_DIR / self.CONFIG_CACHE_FILE
+
+    def _read_config_cache(self, cache_key: List[Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        try:
+            with open(self._config_cache_path(), 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != self.CONFIG_CACHE_VERSION
+            or cache.get("key") != cache_key
+        ):
+            return None
+        return cache["config"], cache["env"]
+
+    def _write_config_cache(self, cache_key: List[Any], config: Dict[str, Any], env_values: Dict[str, str]) -> None:
+        """写入解析缓存; 配置中含 JSON 无法表示的值 (如日期) 或目录不可写时不缓存"""
+        cache = {"version": self.CONFIG_CACHE_VERSION, "key": cache_key, "config": config, "env": env_values}
+        try:
+            data = json.dumps(cache, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        if json.loads(data)["config"] != config:
+            return  # 例如整数键会被 JSON 转为字符串
+        try:
+            write_atomic(self._config_cache_path(), data.encode('utf-8'))
+        except OSError:
+            pass
+
+    def _flatten(self, d: Any, prefix: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """把嵌套配置展开为 "a.b.c" -> 值; 中间节点也保留, 以便按节取整个字典"""
+        if out is None:
+            out = {}
+        if isinstance(d, dict):
+            for k, v in d.items():
+                key = f"{prefix}{k}"
+                out[key] = v
+                self._flatten(v, key + ".", out)
+        return out
+
+    def _get(self, key: str, resolved: Optional[Dict[str, Any]] = None) -> Any:
+        """按点分键读取已解析的配置 (默认为 self.resolved)"""
+        return (self.resolved if resolved is None else resolved).get(key)
+
+    def _validate_required(self, resolved: Optional[Dict[str, Any]] = None) -> List[Tuple[str, str, Any, bool]]:
+        """一次性校验全部必填项, 返回 [(键, 说明, 值, 是否有效)]"""
+        results = []
+        for key, desc in self.REQUIRED_CONFIGS:
+            value = self._get(key, resolved)
+            results.append((key, desc, value, self._is_valid_value(value)))
+        return results
 
     def _set_nested(self, d: dict, key: str, value: Any) -> None:
         """设置嵌套键值"""
@@ -421,39 +585,360 @@ class FlowAIMigrator:
             },
         }
 
-    def _apply_to_file(self, path: Path) -> bool:
-        """应用配置到单个文件"""
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _deep_merge(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+        """返回 base 与 override 深度合并后的新字典 (override 优先)"""
+        merged = dict(base)
+        for k, v in override.items():
+            if isinstance(v, dict) and isinstance(merged.get(k), dict):
+                merged[k] = self._deep_merge(merged[k], v)
+            else:
+                merged[k] = v
+        return merged
+
+    def _profile_resolved(self, name: str) -> Optional[Dict[str, Any]]:
+        """profile 的扁平配置: profiles.<name> 深度合并到 (含环境变量覆盖的) 基础配置之上"""
+        profile = self._get(f"{self.PROFILES_KEY}.{name}")
+        if not isinstance(profile, dict):
+            return None
+        return self._flatten(self._deep_merge(self.config, profile))
+
+    def _placeholder_table(self, resolved: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        构建 占位符名称 -> 替换值 的查找表 (每个命令只构建一次)
 
-        original = content
+        内置占位符来自 PLACEHOLDER_MAP, 用户可在配置的 placeholders 节中
+        定义任意 ${NAME} 占位符, 同名时覆盖内置值 (自定义名称只用于 Markdown, 见 _table_for).
+        未设置的占位符保持原样.
+        """
+        table = {}
         for placeholder, config_key in self.PLACEHOLDER_MAP.items():
-            value = self._get_nested(self.config, config_key)
-            if value and placeholder in content:
-                content = content.replace(placeholder, str(value))
+            value = self._get(config_key, resolved)
+            if value:
+                table[placeholder[2:-1]] = str(value)
 
-        if content != original:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            rel_path = path.relative_to(self.root)
-            self.log(f"已更新: {rel_path}", "success")
-            return True
+        custom = self._get(self.CUSTOM_PLACEHOLDERS_KEY, resolved)
+        if isinstance(custom, dict):
+            for name, value in custom.items():
+                if value is not None and value != "":
+                    table[str(name)] = str(value)
 
-        return False
+        return table
 
-    def _get_file_changes(self, path: Path) -> List[Tuple[str, str]]:
-        """获取文件将要进行的更改"""
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _table_for(self, path: Path, table: Dict[str, str]) -> Dict[str, str]:
+        """文件实际使用的查找表: 非 Markdown 文件只保留内置占位符"""
+        if path.suffix in self.CUSTOM_PLACEHOLDER_SUFFIXES:
+            return table
+        builtin = {placeholder[2:-1] for placeholder in self.PLACEHOLDER_MAP}
+        return {name: value for name, value in table.items() if name in builtin}
 
-        changes = []
-        for placeholder, config_key in self.PLACEHOLDER_MAP.items():
-            if placeholder in content:
-                value = self._get_nested(self.config, config_key)
-                if value and self._is_valid_value(value):
-                    changes.append((placeholder, str(value)))
+    def _render(self, content: str, table: Dict[str, str]) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        单次扫描替换全部占位符
+
+        返回 (替换后的内容, [(占位符, 替换值)]), 替换值中的占位符不会被再次展开.
+        """
+        changes: Dict[str, str] = {}
+
+        def replace(match: "re.Match[str]") -> str:
+            value = table.get(match.group(1))
+            if value is None:
+                return match.group(0)
+            changes.setdefault(match.group(0), value)
+            return value
+
+        return self.PLACEHOLDER_PATTERN.sub(replace, content), list(changes.items())
+
+    def _target_files(self, skills_dir: Path) -> List[Path]:
+        """按配置的 include/exclude glob 列出要处理的文件"""
+        include = self._get("migrate.include") or self.DEFAULT_INCLUDE
+        exclude = self._get("migrate.exclude") or self.DEFAULT_EXCLUDE
+
+        files = set()
+        for pattern in include:
+            for path in skills_dir.glob(pattern):
+                if path.is_file():
+                    files.add(path)
+
+        def excluded(path: Path) -> bool:
+            rel = path.relative_to(skills_dir).as_posix()
+            return any(fnmatch.fnmatch(rel, pattern) for pattern in exclude)
+
+        return sorted(path for path in files if not excluded(path))
+
+    def _output_files(self, skills_dir: Path) -> List[Path]:
+        """--out 输出的源文件: 跳过构建产物与隐藏文件, 指向普通文件的符号链接按目标文件输出"""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(skills_dir):
+            dirnames[:] = [d for d in dirnames if d not in self.OUT_EXCLUDED_DIRS and not d.startswith('.')]
+            for filename in filenames:
+                if (filename.startswith('.') or filename in self.OUT_EXCLUDED_NAMES
+                        or filename.endswith(self.OUT_EXCLUDED_SUFFIXES)):
+                    continue
+                path = Path(dirpath) / filename
+                if path.is_file():
+                    files.append(path)
+        return sorted(files)
+
+    def _prune_output(self, dest_root: Path, expected: set) -> Tuple[int, List[str]]:
+        """删除 dest_root 下不在 expected (相对路径) 中的文件及随之变空的目录, 返回 (删除数, 错误)"""
+        deleted, errors = 0, []
+        if not dest_root.is_dir():
+            return deleted, errors
+        for dirpath, dirnames, filenames in os.walk(dest_root, topdown=False):
+            directory = Path(dirpath)
+            for filename in filenames + [d for d in dirnames if (directory / d).is_symlink()]:
+                path = directory / filename
+                if path.relative_to(dest_root).as_posix() in expected:
+                    continue
+                try:
+                    path.unlink()
+                    deleted += 1
+                except OSError as e:
+                    errors.append(f"{path}: {e}")
+            if directory != dest_root and not any(directory.iterdir()):
+                try:
+                    directory.rmdir()
+                except OSError as e:
+                    errors.append(f"{directory}: {e}")
+        return deleted, errors
+
+    def _state_path(self) -> Path:
+        return self.root / self.STATE_DIR / self.STATE_FILE
+
+    def _template_path(self, digest: str) -> Path:
+        return self.root / self.STATE_DIR / "templates" / digest
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path(), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if not isinstance(state, dict) or state.get("version") != self.STATE_VERSION:
+            state = {"version": self.STATE_VERSION, "files": {}}
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        write_atomic(self._state_path(), json.dumps(state, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def _inputs_hash(self, template_digest: str, names: List[str], table: Dict[str, str]) -> str:
+        """文件的输入哈希: 模板内容 + 模板用到的占位符的当前值"""
+        used = [[name, table.get(name)] for name in names]
+        payload = json.dumps([template_digest, used], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _plan_file(
+        self, path: Path, table: Dict[str, str], entry: Optional[Dict[str, Any]], write: bool
+    ) -> Tuple[str, Optional[Dict[str, Any]], List[Tuple[str, str]]]:
+        """
+        计算单个文件的增量结果, 返回 (动作, 新状态条目, 替换列表)
+
+        - 文件仍是上次 apply 的输出 (size/mtime 或输出哈希一致): 若输入哈希未变则跳过,
+          否则从保存的模板重新渲染 (占位符已被替换, 只能从模板恢复).
+        - 否则把当前内容视为新模板 (首次 apply, 或 git 恢复/手动修改过).
+        """
+        table = self._table_for(path, table)
+        stat = path.stat()
+        ours = bool(entry) and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+        data = None
+        if entry and not ours:
+            data = path.read_bytes()
+            ours = hashlib.sha256(data).hexdigest() == entry.get("output")
+
+        if ours:
+            inputs = self._inputs_hash(entry["template"], entry["names"], table)
+            if inputs == entry.get("inputs"):
+                return "unchanged", dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns), []
+            template_digest = entry["template"]
+            template = self._template_path(template_digest).read_bytes().decode('utf-8')
+        else:
+            if data is None:
+                data = path.read_bytes()
+            template = data.decode('utf-8')
+            template_digest = hashlib.sha256(data).hexdigest()
+            if not self.PLACEHOLDER_PATTERN.search(template):
+                return "unchanged", None, []
+            if write:
+                template_file = self._template_path(template_digest)
+                if not template_file.exists():
+                    write_atomic(template_file, data)
+
+        names = sorted(set(self.PLACEHOLDER_PATTERN.findall(template)))
+        rendered, changes = self._render(template, table)
+        output = rendered.encode('utf-8')
+        output_digest = hashlib.sha256(output).hexdigest()
+        if ours:
+            action = "unchanged" if output_digest == entry.get("output") else "updated"
+        else:
+            action = "updated" if changes else "unchanged"
+
+        if write and action == "updated":
+            write_atomic(path, output)
+            stat = path.stat()
+
+        return action, {
+            "template": template_digest,
+            "names": names,
+            "inputs": self._inputs_hash(template_digest, names, table),
+            "output": output_digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }, changes
+
+    def _source_template(self, path: Path, entry: Optional[Dict[str, Any]]) -> Tuple[str, bytes]:
+        """
+        返回 (模板文本, 文件当前内容)
+
+        文件若仍是上次原地 apply 的输出, 模板取自 .flowai/templates/, 否则文件内容即模板.
+        """
+        data = path.read_bytes()
+        if entry and hashlib.sha256(data).hexdigest() == entry.get("output"):
+            return self._template_path(entry["template"]).read_bytes().decode('utf-8'), data
+        return data.decode('utf-8'), data
+
+    def _link_or_copy(self, source: Path, dest: Path) -> str:
+        """把 source 硬链接到 dest (跨设备等无法链接时复制), 已是同一文件时跳过"""
+        if dest.exists() and os.path.samefile(source, dest):
+            return "unchanged"
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(f".{dest.name}-{uuid.uuid4().hex}.tmp")
+        try:
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, dest)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return "linked"
+
+    def _emit_rendered(self, source: Path, dest: Path, data: bytes) -> str:
+        """写入渲染结果; 输出文件内容已相同时跳过"""
+        if dest.exists() and not dest.is_symlink():
+            if dest.stat().st_size == len(data) and dest.read_bytes() == data:
+                return "unchanged"
+            if os.path.samefile(source, dest):
+                dest.unlink()  # 上次为硬链接, 不能写穿到源文件
+        write_atomic(dest, data)
+        shutil.copymode(source, dest)
+        return "rendered"
+
+    def _apply_out(self, skills_dir: Path, out_dir: Path, profiles: List[str]) -> int:
+        """
+        把 skills 目录按每个 profile 渲染到输出目录, 全部 (profile, 文件) 组合并发处理
+
+        - 无需替换的文件以硬链接输出 (不可链接时复制), 几乎不占额外空间;
+        - 只有替换后内容不同的文件才实际写入;
+        - 重复运行时, 输出已是最新的文件直接跳过;
+        - 输出目录中已不对应任何源文件的文件 (技能被删除或改名) 会被删除.
+        """
+        out_dir = out_dir.resolve()
+        if out_dir == skills_dir.resolve() or skills_dir.resolve() in out_dir.parents:
+            self.log("输出目录不能位于 Skills 目录内", "error")
+            return 1
+
+        targets: List[Tuple[Optional[str], Dict[str, str], Path]] = []
+        for name in profiles or [None]:
+            resolved = self.resolved if name is None else self._profile_resolved(name)
+            if resolved is None:
+                self.log(f"未定义的 profile: {name} (见配置 {self.PROFILES_KEY} 节)", "error")
+                return 1
+            invalid = [desc for _, desc, _, is_valid in self._validate_required(resolved) if not is_valid]
+            if invalid:
+                self.log(f"{name or '基础配置'} 配置不完整: {', '.join(invalid)}", "error")
+                return 1
+            targets.append((name, self._placeholder_table(resolved), out_dir / name if name else out_dir))
+
+        started = datetime.now()
+        rendered_files = set(self._target_files(skills_dir))
+        all_files = self._output_files(skills_dir)
+        expected = {path.relative_to(skills_dir).as_posix() for path in all_files}
+        # 先清理过期文件, 源中文件与目录互换名称时也不会冲突
+        pruned = {name: self._prune_output(dest_root, expected) for name, _, dest_root in targets}
+        rendered_files &= set(all_files)
+        files_state = self._load_state()["files"]
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            def load(path: Path):
+                rel_path = path.relative_to(self.root).as_posix()
+                try:
+                    return path, self._source_template(path, files_state.get(rel_path))
+                except UnicodeDecodeError:
+                    return path, None  # 非文本文件原样输出
+
+            templates = dict(pool.map(load, sorted(rendered_files)))
+
+            def emit(job):
+                (name, table, dest_root), source = job
+                dest = dest_root / source.relative_to(skills_dir)
+                try:
+                    loaded = templates.get(source)
+                    if loaded is not None:
+                        rendered = self._render(loaded[0], self._table_for(source, table))[0].encode('utf-8')
+                        if rendered != loaded[1]:
+                            return name, self._emit_rendered(source, dest, rendered), None
+                    return name, self._link_or_copy(source, dest), None
+                except OSError as e:
+                    return name, "failed", f"{dest}: {e}"
+
+            jobs = [(target, source) for target in targets for source in all_files]
+            outcomes = list(pool.map(emit, jobs))
+
+        counts: Dict[Optional[str], Dict[str, int]] = {name: {} for name, _, _ in targets}
+        for name, action, error in outcomes:
+            counts[name][action] = counts[name].get(action, 0) + 1
+            if error:
+                self.log(f"输出失败: {error}", "error")
+        for name, (_, errors) in pruned.items():
+            for error in errors:
+                self.log(f"删除失败: {error}", "error")
+
+        for name, _, dest_root in targets:
+            c = counts[name]
+            deleted, prune_errors = pruned[name]
+            self.log(
+                f"{dest_root}: 渲染 {c.get('rendered', 0)}, 链接 {c.get('linked', 0)}, "
+                f"未变化 {c.get('unchanged', 0)}, 删除 {deleted}",
+                "error" if c.get("failed") or prune_errors else "success",
+            )
+        self.debug(f"耗时 {(datetime.now() - started).total_seconds():.2f}s")
+
+        failed = any(error for *_, error in outcomes) or any(errors for _, errors in pruned.values())
+        return 1 if failed else 0
+
+    def _process_files(
+        self, skills_dir: Path, table: Dict[str, str], state: Dict[str, Any], write: bool
+    ) -> List[Tuple[str, str, List[Tuple[str, str]], Optional[str]]]:
+        """
+        用线程池处理全部目标文件, 返回 [(相对路径, 动作, 替换列表, 错误)]
 
-        return changes
+        write 为 True 时原子写回文件并更新 state (调用方负责保存).
+        """
+        files_state = state["files"]
+
+        def work(path: Path):
+            rel_path = path.relative_to(self.root).as_posix()
+            try:
+                action, entry, changes = self._plan_file(path, table, files_state.get(rel_path), write)
+            except (OSError, UnicodeDecodeError) as e:
+                return rel_path, "failed", [], None, str(e)
+            return rel_path, action, changes, entry, None
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            outcomes = list(pool.map(work, self._target_files(skills_dir)))
+
+        results = []
+        for rel_path, action, changes, entry, error in outcomes:
+            if write and not error:
+                if entry is None:
+                    files_state.pop(rel_path, None)
+                else:
+                    files_state[rel_path] = entry
+            results.append((rel_path, action, changes, error))
+        self.debug(f"已检查 {len(results)} 个文件")
+        return results
 
 
 def main():
@@ -465,6 +950,8 @@ def main():
   python3 scripts/migrate.py init     # 初始化配置
   python3 scripts/migrate.py check    # 检查配置
   python3 scripts/migrate.py apply    # 应用配置
+  python3 scripts/migrate.py apply --out build --profile a --profile b
+                                      # 按 profile 渲染到 build/a/, build/b/
   python3 scripts/migrate.py show     # 显示配置
   python3 scripts/migrate.py diff     # 预览更改
   python3 scripts/migrate.py reset    # 重置为占位符
@@ -488,6 +975,26 @@ def main():
         action="store_true",
         help="显示详细日志"
     )
+    parser.add_argument(
+        "--out", "-o",
+        help="apply: 渲染到该输出目录, 不修改仓库内的 Skills"
+    )
+    parser.add_argument(
+        "--profile", "-p",
+        action="append",
+        help="apply --out: 使用配置 profiles 节中的 profile, 可重复; 每个 profile 输出到 <out>/<profile>/"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=8,
+        help="apply/diff 并发处理文件的线程数 (默认: 8)"
+    )
+    parser.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="reset: 不询问直接恢复"
+    )
 
     args = parser.parse_args()
 
@@ -498,14 +1005,14 @@ def main():
     if root.name == "scripts" and (root.parent / "skills").exists():
         root = root.parent
 
-    migrator = FlowAIMigrator(root, verbose=args.verbose)
+    migrator = FlowAIMigrator(root, verbose=args.verbose, jobs=args.jobs)
 
     commands = {
         "init": migrator.init,
         "check": migrator.check,
-        "apply": migrator.apply,
+        "apply": lambda: migrator.apply(out=args.out, profiles=args.profile),
         "show": migrator.show,
-        "reset": migrator.reset,
+        "reset": lambda: migrator.reset(assume_yes=args.yes),
         "diff": migrator.diff,
     }
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+查询技能索引 (skills/skills-index.json, 由 gen-skills-manifest.py 生成)
+
+只读取索引文件, 不遍历 skills 目录.
+
+用法:
+    python3 scripts/query-skills.py                    # 列出全部技能
+    python3 scripts/query-skills.py 发布 github        # 名称/描述/触发词同时包含全部关键词的技能
+    python3 scripts/query-skills.py --name fs-update   # 按名称精确查找
+    python3 scripts/query-skills.py --namespace fs --json
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INDEX_PATH = os.path.join(ROOT_DIR, "skills", "skills-index.json")
+
+
+def load_index(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def query(index, terms=(), name=None, namespace=None):
+    """返回匹配的索引条目列表 (按名称排序); 关键词不区分大小写, 须全部命中"""
+    skills = index.get("skills", {})
+    if name is not None:
+        return [skills[name]] if name in skills else []
+
+    terms = [term.lower() for term in terms]
+    results = []
+    for key in sorted(skills):
+        skill = skills[key]
+        if namespace and skill.get("namespace") != namespace:
+            continue
+        haystack = " ".join([key, skill.get("name", ""), skill.get("description", "")] + skill.get("triggers", []))
+        haystack = haystack.lower()
+        if all(term in haystack for term in terms):
+            results.append(skill)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the skills frontmatter index.")
+    parser.add_argument("terms", nargs="*", help="keywords matched against name, description and triggers")
+    parser.add_argument("--name", help="exact skill name")
+    parser.add_argument("--namespace", help="only skills in this namespace (e.g. fs, post)")
+    parser.add_argument("--files", action="store_true", help="also print each skill's file list")
+    parser.add_argument("--json", action="store_true", help="print matching entries as JSON")
+    parser.add_argument("--index", default=INDEX_PATH, help="index path (default: skills/skills-index.json)")
+    args = parser.parse_args()
+
+    try:
+        index = load_index(args.index)
+    except (OSError, ValueError) as e:
+        print(f"cannot read index {args.index}: {e}", file=sys.stderr)
+        print("run: python3 scripts/gen-skills-manifest.py", file=sys.stderr)
+        sys.exit(1)
+
+    results = query(index, args.terms, args.name, args.namespace)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for skill in results:
+            print(f"{skill['name']}\t{skill['source_path']}\t{skill['description']}")
+            if args.files:
+                for path in skill.get("files", []):
+                    print(f"  {path}")
+
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
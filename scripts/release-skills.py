@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+构建 skills 发布产物 (可复现)
+
+产物 (默认输出到 <root>/dist):
+- skill-<name>-<tree_hash 前 16 位>.tar.gz   每个技能一个归档, 包内为 <name>/..., 供增量更新
+- flow-ai-skills-<version>.tar.gz            全量归档, 包内保留 skills 目录 (--zstd 时另出 .tar.zst)
+- manifest.json                              发布清单 (即 skills/manifest.json)
+- skills-index.json                          技能 frontmatter 索引 (存在时)
+- SHA256SUMS                                 全部产物的 sha256sum 格式校验索引
+- flow-ai-skills-<version>.tar.gz.sha256     全量归档的校验文件 (兼容旧安装脚本)
+
+归档按路径排序, mtime 固定为 $SOURCE_DATE_EPOCH (默认 0), 属主清零, gzip 头不含时间与文件名,
+相同输入总是生成逐字节相同的产物. 各技能归档并发构建; 全量归档按块并行压缩为多成员 gzip.
+文件列表取自 manifest.json, 需先运行 gen-skills-manifest.py.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import stat
+import sys
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+GZIP_CHUNK_SIZE = 1024 * 1024
+INDEX_FILE = "skills-index.json"
+
+
+def source_date_epoch():
+    try:
+        return int(os.environ.get("SOURCE_DATE_EPOCH", "0"))
+    except ValueError:
+        return 0
+
+
+def build_tar(entries, mtime):
+    """entries 为 [(包内路径, 源文件)], 返回未压缩的 tar 字节"""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        for arcname, path in sorted(entries):
+            with open(path, "rb") as f:
+                data = f.read()
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            info.mtime = mtime
+            info.mode = 0o755 if os.stat(path).st_mode & stat.S_IXUSR else 0o644
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def gzip_bytes(data):
+    """不含时间戳与文件名的 gzip, 输出只由内容决定"""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def parallel_gzip(data, pool):
+    """按块并行压缩为多成员 gzip (gzip/tar 均可直接解压)"""
+    chunks = [data[i:i + GZIP_CHUNK_SIZE] for i in range(0, len(data), GZIP_CHUNK_SIZE)] or [b""]
+    return b"".join(pool.map(gzip_bytes, chunks))
+
+
+def zstd_bytes(data, workers):
+    try:
+        import zstandard
+    except ImportError:
+        print("--zstd requires zstandard: pip install zstandard", file=sys.stderr)
+        sys.exit(1)
+    return zstandard.ZstdCompressor(level=19, threads=workers or -1).compress(data)
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_asset(out_dir, name, data):
+    path = os.path.join(out_dir, name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return name, sha256_bytes(data)
+
+
+def skill_archive_name(skill):
+    return f"skill-{skill['flattened_name']}-{skill['tree_hash'][:16]}.tar.gz"
+
+
+def build_release(root_dir, out_dir, version, workers=None, zstd=False):
+    """构建全部产物, 返回 [(文件名, sha256)]"""
+    manifest_path = os.path.join(root_dir, "skills", "manifest.json")
+    with open(manifest_path, "rb") as f:
+        manifest_bytes = f.read()
+    manifest = json.loads(manifest_bytes)
+    skills = manifest.get("skills", [])
+    if not all(skill.get("tree_hash") and "files" in skill for skill in skills):
+        raise ValueError("manifest has no file digests; run: python3 scripts/gen-skills-manifest.py")
+
+    os.makedirs(out_dir, exist_ok=True)
+    mtime = source_date_epoch()
+
+    def build_skill(skill):
+        source = os.path.join(root_dir, skill["source_path"])
+        entries = [(f"{skill['flattened_name']}/{entry['path']}", os.path.join(source, entry["path"]))
+                   for entry in skill["files"]]
+        return write_asset(out_dir, skill_archive_name(skill), gzip_bytes(build_tar(entries, mtime)))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        assets = list(pool.map(build_skill, skills))
+
+        index_path = os.path.join(root_dir, "skills", INDEX_FILE)
+        full_entries = [("skills/manifest.json", manifest_path)]
+        if os.path.isfile(index_path):
+            full_entries.append((f"skills/{INDEX_FILE}", index_path))
+        for skill in skills:
+            source = os.path.join(root_dir, skill["source_path"])
+            full_entries += [(f"{skill['source_path']}/{entry['path']}", os.path.join(source, entry["path"]))
+                             for entry in skill["files"]]
+        full_tar = build_tar(full_entries, mtime)
+
+        archive = f"flow-ai-skills-{version}.tar.gz"
+        assets.append(write_asset(out_dir, archive, parallel_gzip(full_tar, pool)))
+        if zstd:
+            assets.append(write_asset(out_dir, f"flow-ai-skills-{version}.tar.zst", zstd_bytes(full_tar, workers)))
+
+    assets.append(write_asset(out_dir, "manifest.json", manifest_bytes))
+    if os.path.isfile(index_path):
+        with open(index_path, "rb") as f:
+            assets.append(write_asset(out_dir, INDEX_FILE, f.read()))
+    assets.sort()
+
+    lines = "".join(f"{digest}  {name}\n" for name, digest in assets)
+    write_asset(out_dir, "SHA256SUMS", lines.encode("utf-8"))
+    archive_digest = dict(assets)[archive]
+    write_asset(out_dir, archive + ".sha256", f"{archive_digest}  {archive}\n".encode("utf-8"))
+    return assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build reproducible per-skill and combined release archives.")
+    parser.add_argument("root", nargs="?", default=os.getcwd(), help="repository root (default: cwd)")
+    parser.add_argument("--out", help="output directory (default: <root>/dist)")
+    parser.add_argument("--workers", type=int, default=None, help="build threads (default: CPU based)")
+    parser.add_argument("--zstd", action="store_true", help="also emit a .tar.zst combined archive")
+    args = parser.parse_args()
+
+    root_dir = os.path.abspath(args.root)
+    if not os.path.isdir(os.path.join(root_dir, "skills")):
+        print(f"skills dir not found: {os.path.join(root_dir, 'skills')}", file=sys.stderr)
+        sys.exit(1)
+    if not os.path.isfile(os.path.join(root_dir, "skills", "manifest.json")):
+        print(f"manifest not found: {os.path.join(root_dir, 'skills', 'manifest.json')}", file=sys.stderr)
+        print("run: python3 scripts/gen-skills-manifest.py", file=sys.stderr)
+        sys.exit(1)
+
+    version = os.environ.get("RELEASE_VERSION") or date.today().strftime("%Y.%m.%d")
+    out_dir = os.path.abspath(args.out or os.path.join(root_dir, "dist"))
+    try:
+        assets = build_release(root_dir, out_dir, version, args.workers, args.zstd)
+    except (OSError, ValueError) as e:
+        print(f"release build failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print("release assets generated:")
+    for name, _ in assets:
+        print(f"- {os.path.join(out_dir, name)}")
+    print(f"- {os.path.join(out_dir, 'SHA256SUMS')}")
+
+
+if __name__ == "__main__":
+    main()
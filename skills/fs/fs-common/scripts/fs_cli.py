@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+fs 系列技能的统一命令行入口, 在同一进程内完成 检测目录 → 分配 ID → 写入草稿。
+
+用法:
+    python3 fs_cli.py root
+    python3 fs_cli.py detect
+    python3 fs_cli.py next-id <目录> [--allocate]
+    python3 fs_cli.py write --dir <目录> --id <ID> --title <标题> --main-content-file <main.md>
+    python3 fs_cli.py new --title <标题> --main-content-file <main.md> [--dir <目录>]
+
+`new` 未指定 --dir 时使用 detect 的结果, 输出 JSON: {"dir", "id", "path"}。
+"""
+import os
+import json
+import argparse
+
+from fs_common import find_project_root, use_skill
+
+for _skill in ("fs-detect", "fs-next-id", "fs-write"):
+    use_skill(_skill)
+
+
+def cmd_root(args):
+    print(find_project_root())
+
+
+def cmd_detect(args):
+    from detect_draft_dir import find_or_create_draft_dir
+
+    print(find_or_create_draft_dir())
+
+
+def cmd_next_id(args):
+    from get_next_id import get_next_id
+
+    print(get_next_id(args.directory, args.allocate, args.rescan))
+
+
+def cmd_write(args):
+    from write_draft import write_draft_from_files
+
+    print(write_draft_from_files(
+        args.dir, args.id, args.title, args.main_content_file, args.companion_content_file, args.link
+    ))
+
+
+def cmd_new(args):
+    from detect_draft_dir import find_or_create_draft_dir
+    from get_next_id import get_next_id
+    from write_draft import write_draft_from_files
+
+    directory = args.dir or find_or_create_draft_dir()
+    file_id = get_next_id(directory, allocate=True)
+    path = write_draft_from_files(
+        directory, file_id, args.title, args.main_content_file, args.companion_content_file, args.link
+    )
+    print(json.dumps({"dir": os.path.dirname(path), "id": file_id, "path": path}, ensure_ascii=False))
+
+
+def add_write_arguments(parser, require_dir):
+    parser.add_argument("--dir", required=require_dir, help="存放草稿文件的目标目录。")
+    parser.add_argument("--title", required=True, help="文章的标题。")
+    parser.add_argument("--main-content-file", required=True, help="包含主内容的文件路径。")
+    parser.add_argument("--companion-content-file", default="", help="（可选）包含配套内容的文件路径。")
+    parser.add_argument("--link", choices=("copy", "hardlink", "reflink"), default="copy",
+                        help="内容文件与草稿目录在同一文件系统时，使用硬链接或 reflink 代替复制。")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fs 系列技能统一入口。")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("root", help="输出项目根目录。").set_defaults(func=cmd_root)
+    subparsers.add_parser("detect", help="检测或创建草稿目录。").set_defaults(func=cmd_detect)
+
+    next_id_parser = subparsers.add_parser("next-id", help="获取下一个文章 ID。")
+    next_id_parser.add_argument("directory", help="草稿目录路径。")
+    next_id_parser.add_argument("--allocate", action="store_true", help="占用该 ID，之后的调用不会再返回它。")
+    next_id_parser.add_argument("--rescan", action="store_true", help="强制重新扫描目录，与计数取较大值。")
+    next_id_parser.set_defaults(func=cmd_next_id)
+
+    write_parser = subparsers.add_parser("write", help="写入草稿文件。")
+    write_parser.add_argument("--id", required=True, help="文件 ID (例如 '001')。")
+    add_write_arguments(write_parser, require_dir=True)
+    write_parser.set_defaults(func=cmd_write)
+
+    new_parser = subparsers.add_parser("new", help="检测目录、分配 ID 并写入草稿。")
+    add_write_arguments(new_parser, require_dir=False)
+    new_parser.set_defaults(func=cmd_new)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+fs-* 技能共用的辅助函数, 也是各技能脚本与仓库脚本中文件锁/原子写入的唯一实现。
+
+- find_project_root: 向上查找项目根目录，结果在进程内与磁盘上缓存。
+- resolve_dir: 相对路径基于项目根解析为绝对路径。
+- file_lock / write_atomic / write_json_atomic: 文件锁与原子写入。
+- use_skill: 把其他技能的 scripts 目录加入 sys.path。
+
+导入方式: 仓库布局 (skills/fs/<name>) 与扁平化安装布局 (<skills_dir>/<name>) 下,
+fs-* 技能与 fs-common 都是同级目录, fs-* 脚本只需把 ../../fs-common/scripts 加入 sys.path;
+其他命名空间的技能按两种布局查找 (见 publish_draft.use_fs_skill)。
+
+磁盘缓存位于 $FLOWAI_CACHE_DIR (默认 ~/.cache/flowai) 下的 fs-root-cache.json，
+以起始目录为键，记录从起始目录到项目根之间每一级目录的 mtime。
+目录中增删标志文件会改变该目录的 mtime，因此命中缓存时每级只需一次 stat 校验。
+"""
+import os
+import sys
+import glob
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows 等平台没有 fcntl, 退化为无锁写入
+    fcntl = None
+
+# 项目根标志文件/目录
+ROOT_MARKERS = (".git", "package.json", "pyproject.toml", "CLAUDE.md", "claude.md")
+
+ROOT_CACHE_FILE = "fs-root-cache.json"
+ROOT_CACHE_LIMIT = 256
+
+_root_cache = {}
+
+
+@contextmanager
+def file_lock(path):
+    """对 `path.lock` 加排他锁"""
+    if fcntl is None:
+        yield
+        return
+
+    with open(f"{path}.lock", "a", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def write_atomic(path, data):
+    """写入同目录临时文件, fsync 后 rename 覆盖目标文件 (data 为 str 或 bytes), 保留原文件权限"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}-", suffix=".tmp", dir=directory)
+    try:
+        if isinstance(data, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data):
+    """以紧凑 JSON 原子写入"""
+    write_atomic(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def use_skill(name):
+    """
+    把技能 name 的 scripts 目录加入 sys.path 并返回该目录。
+
+    依次查找同级目录 (扁平化安装或同一命名空间) 与仓库布局下其他命名空间中的同名技能。
+    """
+    skills_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+    candidates = [os.path.join(skills_dir, name, "scripts")]
+    candidates += sorted(glob.glob(os.path.join(skills_dir, "..", "*", name, "scripts")))
+    for candidate in candidates:
+        if os.path.isdir(candidate):
+            path = os.path.abspath(candidate)
+            if path not in sys.path:
+                sys.path.insert(0, path)
+            return path
+    raise ImportError(f"未找到依赖技能 '{name}'，请一并安装。")
+
+
+def cache_dir():
+    return os.environ.get("FLOWAI_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "flowai"
+    )
+
+
+def _load_root_cache():
+    try:
+        with open(os.path.join(cache_dir(), ROOT_CACHE_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_root_cache(entries):
+    # 只保留最近写入的条目, 避免缓存无限增长
+    if len(entries) > ROOT_CACHE_LIMIT:
+        entries = dict(list(entries.items())[-ROOT_CACHE_LIMIT:])
+    try:
+        write_json_atomic(os.path.join(cache_dir(), ROOT_CACHE_FILE), entries)
+    except OSError:
+        pass  # 缓存不可写时直接忽略
+
+
+def _cache_entry_valid(entry):
+    dirs = entry.get("dirs") if isinstance(entry, dict) else None
+    if not isinstance(dirs, dict) or not dirs:
+        return False
+    for directory, mtime_ns in dirs.items():
+        try:
+            if os.stat(directory).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _walk_project_root(start):
+    """逐级向上查找, 返回 (项目根或 None, {途经目录: mtime_ns})"""
+    dirs = {}
+    current = start
+    while True:
+        try:
+            dirs[current] = os.stat(current).st_mtime_ns
+        except OSError:
+            pass
+        for marker in ROOT_MARKERS:
+            if os.path.exists(os.path.join(current, marker)):
+                return current, dirs
+
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None, dirs
+        current = parent
+
+
+def find_project_root(start_path=None):
+    """
+    向上查找项目根目录（包含 .git, package.json, pyproject.toml 或 CLAUDE.md 的目录）
+
+    Args:
+        start_path: 开始查找的路径，默认为当前工作目录
+
+    Returns:
+        项目根目录的绝对路径，如果找不到则返回当前工作目录
+    """
+    start = os.path.abspath(start_path or os.getcwd())
+
+    if start not in _root_cache:
+        entries = _load_root_cache()
+        entry = entries.get(start)
+        if _cache_entry_valid(entry):
+            _root_cache[start] = entry.get("root")
+        else:
+            root, dirs = _walk_project_root(start)
+            _root_cache[start] = root
+            entries.pop(start, None)
+            entries[start] = {"root": root, "dirs": dirs}
+            _save_root_cache(entries)
+
+    # 找不到项目根时返回当前工作目录
+    return _root_cache[start] or os.getcwd()
+
+
+def clear_root_cache():
+    """清空进程内缓存 (磁盘缓存靠 mtime 校验自动失效)"""
+    _root_cache.clear()
+
+
+def resolve_dir(directory):
+    """相对路径基于项目根解析，返回绝对路径"""
+    if not os.path.isabs(directory):
+        directory = os.path.join(find_project_root(), directory)
+    return os.path.abspath(directory)
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import fs_common  # noqa: E402
+
+
+class ProjectRootCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = os.path.realpath(self._tmp.name)
+        self.project = os.path.join(self.tmp_dir, "proj")
+        self.nested = os.path.join(self.project, "a", "b")
+        os.makedirs(self.nested)
+        open(os.path.join(self.project, "pyproject.toml"), "w").close()
+
+        env = mock.patch.dict(os.environ, {"FLOWAI_CACHE_DIR": os.path.join(self.tmp_dir, "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        fs_common.clear_root_cache()
+
+    def tearDown(self):
+        fs_common.clear_root_cache()
+        self._tmp.cleanup()
+
+    def test_disk_cache_skips_walk_until_a_directory_changes(self):
+        self.assertEqual(fs_common.find_project_root(self.nested), self.project)
+
+        fs_common.clear_root_cache()
+        with mock.patch.object(fs_common, "_walk_project_root", side_effect=AssertionError("walked")):
+            self.assertEqual(fs_common.find_project_root(self.nested), self.project)
+
+        # 中间目录新增标志文件会改变其 mtime, 缓存随之失效
+        marker = os.path.join(self.project, "a", "package.json")
+        open(marker, "w").close()
+        os.utime(os.path.dirname(marker), ns=(0, 1))
+        fs_common.clear_root_cache()
+        self.assertEqual(fs_common.find_project_root(self.nested), os.path.dirname(marker))
+
+    def test_cli_new_detects_allocates_and_writes_in_one_process(self):
+        content = os.path.join(self.tmp_dir, "main.md")
+        with open(content, "w", encoding="utf-8") as f:
+            f.write("# Hello\n")
+
+        cli = os.path.join(os.path.abspath(SCRIPT_DIR), "fs_cli.py")
+        results = []
+        for title in ("Hello World", "Second"):
+            output = subprocess.run(
+                [sys.executable, cli, "new", "--title", title, "--main-content-file", content],
+                cwd=self.nested,
+                env=os.environ.copy(),
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            results.append(json.loads(output))
+
+        draft_dir = os.path.join(self.project, "docs", "post_local")
+        self.assertEqual([r["id"] for r in results], ["001", "002"])
+        self.assertEqual(results[0]["path"], os.path.join(draft_dir, "001_hello-world.md"))
+        with open(results[1]["path"], "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "# Hello\n")
+
+    def test_write_atomic_accepts_text_and_bytes(self):
+        path = os.path.join(self.tmp_dir, "out", "data.bin")
+        fs_common.write_atomic(path, "文本")
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "文本")
+
+        fs_common.write_atomic(path, b"\x00\x01")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"\x00\x01")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["data.bin"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,38 +1,10 @@
 #!/usr/bin/env python3
 import os
+import sys
 
-def find_project_root(start_path=None):
-    """
-    向上查找项目根目录（包含 .git, package.json, pyproject.toml 或 CLAUDE.md 的目录）
-
-    Args:
-        start_path: 开始查找的路径，默认为当前工作目录
-
-    Returns:
-        项目根目录的绝对路径，如果找不到则返回当前工作目录
-    """
-    if start_path is None:
-        start_path = os.getcwd()
-
-    current = os.path.abspath(start_path)
-
-    # 项目根标志文件/目录
-    root_markers = ['.git', 'package.json', 'pyproject.toml', 'CLAUDE.md', 'claude.md']
-
-    # 向上查找，最多到文件系统根目录
-    while True:
-        # 检查是否存在任何项目根标志
-        for marker in root_markers:
-            if os.path.exists(os.path.join(current, marker)):
-                return current
-
-        # 到达文件系统根目录
-        parent = os.path.dirname(current)
-        if parent == current:
-            # 找不到项目根，返回当前工作目录
-            return os.getcwd()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fs-common", "scripts"))
+from fs_common import find_project_root  # noqa: E402
 
-        current = parent
 
 def find_or_create_draft_dir():
     """
@@ -71,7 +43,7 @@ def find_or_create_draft_dir():
         os.makedirs(draft_dir, exist_ok=True)
 
     # 返回绝对路径
-    print(draft_dir)
+    return draft_dir
 
 if __name__ == "__main__":
-    find_or_create_draft_dir()
+    print(find_or_create_draft_dir())
@@ -1,83 +1,37 @@
 #!/usr/bin/env python3
 import os
-import re
 import sys
+import argparse
 
-def find_project_root(start_path=None):
-    """
-    向上查找项目根目录（包含 .git, package.json, pyproject.toml 或 CLAUDE.md 的目录）
-
-    Args:
-        start_path: 开始查找的路径，默认为当前工作目录
-
-    Returns:
-        项目根目录的绝对路径，如果找不到则返回当前工作目录
-    """
-    if start_path is None:
-        start_path = os.getcwd()
-
-    current = os.path.abspath(start_path)
-
-    # 项目根标志文件/目录
-    root_markers = ['.git', 'package.json', 'pyproject.toml', 'CLAUDE.md', 'claude.md']
+from id_allocator import IdAllocator
 
-    # 向上查找，最多到文件系统根目录
-    while True:
-        # 检查是否存在任何项目根标志
-        for marker in root_markers:
-            if os.path.exists(os.path.join(current, marker)):
-                return current
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fs-common", "scripts"))
+from fs_common import resolve_dir  # noqa: E402
 
-        # 到达文件系统根目录
-        parent = os.path.dirname(current)
-        if parent == current:
-            # 找不到项目根，返回当前工作目录
-            return os.getcwd()
 
-        current = parent
-
-def get_next_id(directory):
+def get_next_id(directory, allocate=False, rescan=False):
     """
-    在给定目录中为新文章计算下一个可用的序列 ID。
+    返回给定目录中新文章的下一个可用序列 ID。
 
     Args:
-        directory (str): 需要扫描 .md 文件的目录路径（支持相对路径和绝对路径）。
+        directory (str): 草稿目录路径（支持相对路径和绝对路径）。
+        allocate (bool): 在计数器中占用该 ID；默认只查询，重复调用返回相同结果。
+        rescan (bool): 强制重新扫描目录中的 'XXX_*.md' 文件，与计数取较大值。
 
-    脚本会扫描匹配 'XXX_*.md' 模式的文件名,
-    找到当前最大的序列号, 并打印下一个序列号 (格式化为三位补零的字符串)。
+    计数器 (见 id_allocator) 记录目录 mtime，目录中有新增文件时自动重新扫描。
+    占用在文件锁内完成，并发占用不会重复。返回的 ID 至少三位补零，超过 999 后自动加宽。
     """
     # 处理路径：如果是相对路径，基于项目根来解析
-    if not os.path.isabs(directory):
-        project_root = find_project_root()
-        directory = os.path.join(project_root, directory)
-
-    # 转换为绝对路径
-    directory = os.path.abspath(directory)
-
-    if not os.path.isdir(directory):
-        # 如果目录不存在 (例如草稿目录刚被创建), 则从 1 开始。
-        print("001")
-        return
-
-    max_id = 0
-    # 用于匹配 "001_title.md" 这类文件名的正则表达式 (Regex)
-    pattern = re.compile(r"^(\d{3})_.*\.md$")
-
-    for filename in os.listdir(directory):
-        match = pattern.match(filename)
-        if match:
-            current_id = int(match.group(1))
-            if current_id > max_id:
-                max_id = current_id
-
-    next_id = max_id + 1
-    # 打印下一个 ID, 补零至三位数
-    print(f"{next_id:03d}")
+    allocator = IdAllocator(resolve_dir(directory))
+    if allocate:
+        return allocator.allocate(rescan=rescan)[0]
+    return allocator.peek(rescan)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("使用方法: ./get_next_id.py <目录路径>", file=sys.stderr)
-        sys.exit(1)
-    
-    target_directory = sys.argv[1]
-    get_next_id(target_directory)
+    parser = argparse.ArgumentParser(description="获取新文章的下一个序列 ID。")
+    parser.add_argument("directory", help="草稿目录路径。")
+    parser.add_argument("--allocate", action="store_true", help="占用该 ID，之后的调用不会再返回它 (并发写入时使用)。")
+    parser.add_argument("--rescan", action="store_true", help="强制重新扫描目录，与计数取较大值。")
+    args = parser.parse_args()
+
+    print(get_next_id(args.directory, args.allocate, args.rescan))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+按目录分配文章序号 ID 的持久化计数器。
+
+每个目录对应一个计数文件，保存在 $FLOWAI_CACHE_DIR/next-id/ 下 (见 fs_common.cache_dir)，
+不在草稿/发布目录中留下任何文件:
+
+    {"version": 2, "directory": "/abs/dir", "last": 12, "dir_mtime_ns": 0}
+
+- 分配在计数文件的文件锁内完成，多个进程/代理并发分配不会拿到相同 ID。
+- 计数文件缺失、无法解析，或目录 mtime 与记录不一致 (目录中增删了文件，例如手动添加或
+  git pull) 时，扫描一次目录中的 `NNN_*.md`，与计数取较大值。
+- 目录不存在时只按空目录计算，不创建目录，也不写计数文件。
+- ID 至少三位补零；超过 999 后自动加宽 (1000, 1001, ...)。
+
+用法:
+    python3 id_allocator.py <目录> [--count N] [--peek] [--rescan]
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fs-common", "scripts"))
+from fs_common import cache_dir, file_lock, write_json_atomic  # noqa: E402
+
+COUNTER_DIR = "next-id"
+COUNTER_VERSION = 2
+# 旧版本写在目录内的计数文件, 仅读取其中的序号作为下限
+LEGACY_COUNTER_FILE = ".next-id.json"
+MIN_WIDTH = 3
+
+# 匹配 "001_title.md"、"1000_title.md" 这类文件名
+ID_PATTERN = re.compile(r"^(\d{3,})_.*\.md$")
+
+
+def format_id(value):
+    """至少三位补零，超过 999 时自然加宽"""
+    return f"{value:0{MIN_WIDTH}d}"
+
+
+def scan_max_id(directory):
+    """扫描目录，返回现有文件的最大序号 (没有时为 0)"""
+    if not os.path.isdir(directory):
+        return 0
+
+    max_id = 0
+    for filename in os.listdir(directory):
+        match = ID_PATTERN.match(filename)
+        if match:
+            max_id = max(max_id, int(match.group(1)))
+    return max_id
+
+
+def _valid_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _dir_mtime_ns(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def counter_path(directory):
+    """目录对应的计数文件路径 (以规范化绝对路径的哈希命名)"""
+    key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir(), COUNTER_DIR, f"{key}.json")
+
+
+class IdAllocator:
+    """某个目录的序号分配器"""
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.counter_path = counter_path(self.directory)
+
+    def _current(self, rescan=False):
+        """
+        返回 (已占用的最大序号, 计算时的目录 mtime)。
+
+        计数文件记录的目录 mtime 与当前一致时直接使用计数 (不扫描目录)；
+        否则扫描目录，已分配但尚未写入文件的 ID 不能回收，与计数取较大值。
+        mtime 在扫描之前读取：扫描期间新增的文件会使其与下次读取的值不同，从而触发重新扫描。
+        """
+        dir_mtime_ns = _dir_mtime_ns(self.directory)
+        data = _read_json(self.counter_path)
+        last = data.get("last")
+        if (
+            not rescan
+            and _valid_count(last)
+            and data.get("directory") == self.directory
+            and data.get("dir_mtime_ns") == dir_mtime_ns
+        ):
+            return last, dir_mtime_ns
+
+        candidates = [scan_max_id(self.directory)]
+        if _valid_count(last) and data.get("directory") == self.directory:
+            candidates.append(last)
+        legacy = _read_json(os.path.join(self.directory, LEGACY_COUNTER_FILE)).get("last")
+        if _valid_count(legacy):
+            candidates.append(legacy)
+        return max(candidates), dir_mtime_ns
+
+    def _save(self, last, dir_mtime_ns):
+        write_json_atomic(self.counter_path, {
+            "version": COUNTER_VERSION,
+            "directory": self.directory,
+            "last": last,
+            "dir_mtime_ns": dir_mtime_ns,
+        })
+
+    def peek(self, rescan=False):
+        """返回下一个 ID，但不占用"""
+        return format_id(self._current(rescan)[0] + 1)
+
+    def allocate(self, count=1, rescan=False):
+        """
+        在文件锁内连续占用 count 个 ID 并返回。
+
+        目录不存在时按空目录计算且不记录 (没有文件可以冲突)，不会创建目录。
+        """
+        if not os.path.isdir(self.directory):
+            return [format_id(offset) for offset in range(1, count + 1)]
+
+        os.makedirs(os.path.dirname(self.counter_path), exist_ok=True)
+        with file_lock(self.counter_path):
+            last, dir_mtime_ns = self._current(rescan)
+            ids = [format_id(last + offset) for offset in range(1, count + 1)]
+            self._save(last + count, dir_mtime_ns)
+        return ids
+
+    def reserve(self, id_value):
+        """登记一个手动指定的 ID，保证之后分配的 ID 不会小于它 (目录不存在时不记录)"""
+        if not os.path.isdir(self.directory):
+            return
+
+        os.makedirs(os.path.dirname(self.counter_path), exist_ok=True)
+        with file_lock(self.counter_path):
+            last, dir_mtime_ns = self._current()
+            self._save(max(last, int(id_value)), dir_mtime_ns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="为目录分配下一个文章序号 ID。")
+    parser.add_argument("directory", help="草稿或发布目录。")
+    parser.add_argument("--count", type=int, default=1, help="一次分配的 ID 数量。")
+    parser.add_argument("--peek", action="store_true", help="只查看下一个 ID，不占用。")
+    parser.add_argument("--rescan", action="store_true", help="强制重新扫描目录，与计数文件取较大值。")
+    args = parser.parse_args()
+
+    allocator = IdAllocator(args.directory)
+    if args.peek:
+        print(allocator.peek(args.rescan))
+        return
+    if args.count < 1:
+        print("错误: --count 必须大于 0。", file=sys.stderr)
+        sys.exit(1)
+    for id_value in allocator.allocate(args.count, args.rescan):
+        print(id_value)
+
+
+if __name__ == "__main__":
+    main()
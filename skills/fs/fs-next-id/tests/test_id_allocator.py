@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import get_next_id  # noqa: E402
+import id_allocator  # noqa: E402
+
+
+class IdAllocatorTests(unittest.TestCase):
+    def setUp(self):
+        self._cache = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {"FLOWAI_CACHE_DIR": self._cache.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._cache.cleanup)
+
+    def test_first_allocation_rebuilds_from_scan_then_uses_counter(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            open(os.path.join(tmp_dir, "007_a.md"), "w").close()
+            allocator = id_allocator.IdAllocator(tmp_dir)
+
+            self.assertEqual(allocator.peek(), "008")
+            self.assertEqual(allocator.allocate(), ["008"])
+            self.assertEqual(allocator.allocate(2), ["009", "010"])
+
+            with mock.patch.object(id_allocator, "scan_max_id") as scan:
+                self.assertEqual(allocator.peek(), "011")
+            scan.assert_not_called()
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ["007_a.md"])
+
+    def test_file_added_outside_allocator_triggers_rescan(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            allocator = id_allocator.IdAllocator(tmp_dir)
+            self.assertEqual(allocator.allocate(2), ["001", "002"])
+
+            # 手动添加或 git pull 带来的文件
+            open(os.path.join(tmp_dir, "007_x.md"), "w").close()
+
+            self.assertEqual(get_next_id.get_next_id(tmp_dir), "008")
+            self.assertEqual(allocator.allocate(), ["008"])
+
+    def test_file_added_during_scan_is_seen_by_next_allocation(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            open(os.path.join(tmp_dir, "003_a.md"), "w").close()
+            os.utime(tmp_dir, ns=(10**18, 10**18))
+            real_scan = id_allocator.scan_max_id
+
+            def scan_then_write(directory):
+                result = real_scan(directory)
+                # 扫描结束后、保存计数之前, 在分配器之外写入的文件
+                open(os.path.join(directory, "009_manual.md"), "w").close()
+                os.utime(directory, ns=(10**18 + 1, 10**18 + 1))
+                return result
+
+            allocator = id_allocator.IdAllocator(tmp_dir)
+            with mock.patch.object(id_allocator, "scan_max_id", side_effect=scan_then_write):
+                self.assertEqual(allocator.allocate(), ["004"])
+
+            self.assertEqual(allocator.allocate(), ["010"])
+
+    def test_corrupt_counter_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            open(os.path.join(tmp_dir, "003_a.md"), "w").close()
+            path = id_allocator.counter_path(tmp_dir)
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{not json")
+
+            self.assertEqual(id_allocator.IdAllocator(tmp_dir).allocate(), ["004"])
+
+    def test_missing_directory_is_not_created(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            missing = os.path.join(tmp_dir, "typo", "nested")
+
+            self.assertEqual(get_next_id.get_next_id(missing, allocate=True), "001")
+            id_allocator.IdAllocator(missing).reserve("005")
+
+            self.assertEqual(os.listdir(tmp_dir), [])
+            self.assertFalse(os.path.exists(id_allocator.counter_path(missing)))
+
+    def test_get_next_id_is_read_only_unless_allocating(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            open(os.path.join(tmp_dir, "002_a.md"), "w").close()
+
+            self.assertEqual(get_next_id.get_next_id(tmp_dir), "003")
+            self.assertEqual(get_next_id.get_next_id(tmp_dir), "003")
+            self.assertEqual(os.listdir(self._cache.name), [])
+
+            self.assertEqual(get_next_id.get_next_id(tmp_dir, allocate=True), "003")
+            self.assertEqual(get_next_id.get_next_id(tmp_dir), "004")
+
+    def test_width_grows_past_999_and_reserve_bumps_counter(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            open(os.path.join(tmp_dir, "998_a.md"), "w").close()
+            allocator = id_allocator.IdAllocator(tmp_dir)
+
+            self.assertEqual(allocator.allocate(2), ["999", "1000"])
+            open(os.path.join(tmp_dir, "1000_b.md"), "w").close()
+            self.assertEqual(id_allocator.scan_max_id(tmp_dir), 1000)
+
+            allocator.reserve("1500")
+            allocator.reserve("1200")
+            self.assertEqual(allocator.peek(), "1501")
+
+    def test_concurrent_allocations_never_collide(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = []
+            lock = threading.Lock()
+
+            def worker():
+                ids = id_allocator.IdAllocator(tmp_dir).allocate(3)
+                with lock:
+                    results.extend(ids)
+
+            threads = [threading.Thread(target=worker) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(results), 60)
+        self.assertEqual(sorted(results), [id_allocator.format_id(i) for i in range(1, 61)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+草稿元数据缓存: 以 规范化路径 + size + mtime 为键，缓存内容哈希、一级标题与 slug。
+
+发布 (publish_draft.py) 与更新 (update_published.py / watch_drafts.py) 共用同一份缓存，
+同一草稿未修改时不再重复读取文件。缓存位于 $FLOWAI_CACHE_DIR/draft-meta.json
+(见 fs_common.cache_dir)，保存时在文件锁内与磁盘上的内容合并后原子写入。
+
+    {"/abs/draft.md": {"size": 123, "mtime_ns": 0, "content_hash": "...", "heading": "...", "slug": "..."}}
+"""
+import os
+import sys
+import json
+import threading
+from contextlib import contextmanager
+
+from publish_map import file_digest, normalize_path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fs-common", "scripts"))
+from fs_common import cache_dir, file_lock, write_json_atomic  # noqa: E402
+
+META_CACHE_FILE = "draft-meta.json"
+META_CACHE_LIMIT = 4096
+
+
+def default_cache_path():
+    return os.path.join(cache_dir(), META_CACHE_FILE)
+
+
+def _read_entries(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class DraftMetaCache:
+    """草稿元数据缓存；文件 size/mtime 变化后对应条目自动失效"""
+
+    def __init__(self, path=None, entries=None):
+        self.path = path
+        self.entries = entries or {}
+        self.updated = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or default_cache_path()
+        return cls(path, _read_entries(path))
+
+    @property
+    def dirty(self):
+        return bool(self.updated)
+
+    def lookup(self, draft_file, stat=None):
+        """返回与当前文件状态匹配的缓存条目 (可能为空字典)"""
+        stat = stat or os.stat(draft_file)
+        entry = self.entries.get(normalize_path(draft_file))
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return dict(entry)
+        return {}
+
+    def remember(self, draft_file, stat=None, **values):
+        """记录草稿的元数据；文件状态变化时丢弃旧条目中的其余字段"""
+        stat = stat or os.stat(draft_file)
+        key = normalize_path(draft_file)
+        with self._lock:
+            entry = self.lookup(draft_file, stat)
+            entry.update(values, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            self.entries[key] = entry
+            self.updated[key] = entry
+        return entry
+
+    def content_fields(self, draft_file):
+        """与 publish_map.content_fields 相同，内容哈希优先取自缓存"""
+        stat = os.stat(draft_file)
+        digest = self.lookup(draft_file, stat).get("content_hash")
+        if digest is None:
+            digest = file_digest(draft_file)
+            self.remember(draft_file, stat, content_hash=digest)
+        return {"content_hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def save(self):
+        if not self.updated or not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with file_lock(self.path):
+                entries = _read_entries(self.path)
+                for key in self.updated:
+                    entries.pop(key, None)
+                entries.update(self.updated)
+                # 只保留最近写入的条目, 避免缓存无限增长
+                if len(entries) > META_CACHE_LIMIT:
+                    entries = dict(list(entries.items())[-META_CACHE_LIMIT:])
+                write_json_atomic(self.path, entries)
+        except OSError:
+            return  # 缓存不可写时直接忽略
+        self.updated = {}
+
+
+@contextmanager
+def open_meta_cache(path=None):
+    """加载缓存，退出时写回新增条目"""
+    cache = DraftMetaCache.load(path)
+    try:
+        yield cache
+    finally:
+        cache.save()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+发布映射 (.publish-map.json) 的索引化存储。
+
+v2 格式以规范化后的草稿绝对路径为键:
+
+    {
+      "version": 2,
+      "mappings": {
+        "/abs/draft.md": {
+          "draft": "...", "published": "...", "published_at": "...", "updated_at": "...",
+          "content_hash": "sha256 of the draft at last publish/update", "size": 123, "mtime_ns": 0
+        }
+      }
+    }
+
+加载时在内存中同时建立 草稿 → 映射 与 发布文件 → 草稿 两个索引, 查找均为 O(1)。
+旧版 {"mappings": [...]} 列表格式在加载时自动迁移, 下次保存即写为 v2。
+写入在文件锁内通过临时文件 + rename 原子完成。
+
+用法:
+    python3 publish_map.py migrate --map-file <map.json>
+    python3 publish_map.py get --map-file <map.json> --draft-file <draft.md>
+"""
+import os
+import sys
+import json
+import argparse
+import hashlib
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fs-common", "scripts"))
+from fs_common import file_lock, write_json_atomic  # noqa: E402
+
+MAP_VERSION = 2
+
+
+def normalize_path(path):
+    """映射键: 展开 ~ 后的规范化绝对路径"""
+    return os.path.normcase(os.path.abspath(os.path.expanduser(path)))
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """分块计算文件 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_fields(path, digest=None):
+    """映射中用于变更检测的字段: 内容哈希 + size/mtime (廉价预筛选)"""
+    stat = os.stat(path)
+    return {
+        "content_hash": digest or file_digest(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+class PublishMap:
+    """草稿与已发布文章的映射, 以规范化路径索引"""
+
+    def __init__(self, path, mappings=None):
+        self.path = path
+        self.mappings = {}
+        self.published_index = {}
+        self.migrated = False
+        self.dirty = False
+        for mapping in (mappings or {}).values():
+            self._index(mapping)
+
+    @classmethod
+    def load(cls, path):
+        """读取映射文件; 不存在或无法解析时返回空映射"""
+        data = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    data = {}
+
+        raw = data.get("mappings", {}) if isinstance(data, dict) else {}
+        if isinstance(raw, list):
+            # v1: 列表格式, 键按当前工作目录规范化
+            store = cls(path)
+            for mapping in raw:
+                if mapping.get("draft"):
+                    mapping = dict(mapping)
+                    mapping["draft"] = normalize_path(mapping["draft"])
+                    if mapping.get("published"):
+                        mapping["published"] = normalize_path(mapping["published"])
+                    store._index(mapping)
+            store.migrated = store.dirty = True
+            return store
+
+        return cls(path, raw)
+
+    def _index(self, mapping):
+        key = normalize_path(mapping["draft"])
+        self.mappings[key] = mapping
+        if mapping.get("published"):
+            self.published_index[normalize_path(mapping["published"])] = key
+
+    def __len__(self):
+        return len(self.mappings)
+
+    def __iter__(self):
+        return iter(self.mappings.values())
+
+    def get(self, draft_file):
+        return self.mappings.get(normalize_path(draft_file))
+
+    def get_by_published(self, published_file):
+        key = self.published_index.get(normalize_path(published_file))
+        return self.mappings.get(key) if key else None
+
+    def add(self, draft_file, published_file, timestamp, **fields):
+        mapping = {
+            "draft": normalize_path(draft_file),
+            "published": normalize_path(published_file),
+            "published_at": timestamp,
+            "updated_at": timestamp,
+            **fields,
+        }
+        self._index(mapping)
+        self.dirty = True
+        return mapping
+
+    def update(self, draft_file, **fields):
+        mapping = self.get(draft_file)
+        if mapping is None:
+            raise KeyError(draft_file)
+        mapping.update(fields)
+        self.dirty = True
+        return mapping
+
+    def to_dict(self):
+        return {"version": MAP_VERSION, "mappings": self.mappings}
+
+    def save(self):
+        write_json_atomic(self.path, self.to_dict())
+        self.dirty = False
+
+
+@contextmanager
+def open_map(path):
+    """
+    在文件锁内加载映射, 退出时若有修改则原子写回。
+
+    用法:
+        with open_map(map_file) as store:
+            store.add(...)
+    """
+    with file_lock(path):
+        store = PublishMap.load(path)
+        yield store
+        if store.dirty:
+            store.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="发布映射文件工具。")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="把旧版列表格式迁移为 v2 索引格式。")
+    migrate_parser.add_argument("--map-file", required=True, help="'.publish-map.json' 文件的路径。")
+
+    get_parser = subparsers.add_parser("get", help="查询草稿对应的映射。")
+    get_parser.add_argument("--map-file", required=True, help="'.publish-map.json' 文件的路径。")
+    get_parser.add_argument("--draft-file", required=True, help="草稿文件路径。")
+
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        with open_map(args.map_file) as store:
+            if store.migrated:
+                print(f"已迁移 {len(store)} 条映射到 v{MAP_VERSION} 格式: {args.map_file}")
+            else:
+                print(f"映射文件已是 v{MAP_VERSION} 格式: {args.map_file}")
+    elif args.command == "get":
+        mapping = PublishMap.load(args.map_file).get(args.draft_file)
+        if mapping is None:
+            print(f"错误: 未找到草稿 '{args.draft_file}' 的映射。", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(mapping, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
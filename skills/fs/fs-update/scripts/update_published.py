@@ -1,19 +1,75 @@
 #!/usr/bin/env python3
 import os
 import sys
-import json
 import shutil
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from publish_map import file_digest, open_map
+from draft_meta import open_meta_cache
+
+
+def check_draft(mapping, meta=None):
+    """
+    判断草稿相对上次发布的版本是否有变化。
+
+    - size 与 mtime 都未变且已有内容哈希时，直接视为未变化 (不读取文件)。
+    - 否则计算内容哈希 (meta 为 DraftMetaCache 时优先复用缓存)，与映射中记录的哈希比对；
+      旧映射没有哈希时与已发布文件比对一次。
+
+    返回 (状态, 需要写回映射的内容字段)，状态为 'unchanged' / 'changed' / 'missing'。
+    """
+    draft_file = mapping.get("draft")
+    try:
+        stat = os.stat(draft_file)
+    except (FileNotFoundError, TypeError):
+        return "missing", None
+
+    published_exists = os.path.exists(mapping.get("published") or "")
+    if (
+        published_exists
+        and mapping.get("content_hash")
+        and mapping.get("size") == stat.st_size
+        and mapping.get("mtime_ns") == stat.st_mtime_ns
+    ):
+        return "unchanged", None
+
+    if meta is not None:
+        fields = meta.content_fields(draft_file)
+    else:
+        fields = {
+            "content_hash": file_digest(draft_file),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    known_hash = mapping.get("content_hash")
+    if known_hash is None and published_exists:
+        known_hash = file_digest(mapping["published"])
+
+    if published_exists and fields["content_hash"] == known_hash:
+        # 内容未变 (例如 touch / git checkout)，只刷新 size/mtime
+        return "unchanged", fields
+    return "changed", fields
+
+
+def copy_draft(mapping):
+    try:
+        shutil.copyfile(mapping["draft"], mapping["published"])
+        return None
+    except (IOError, shutil.SameFileError) as e:
+        return str(e)
+
+
 def update_published(draft_file, map_file):
     """
     根据草稿内容，更新一篇已发布的文章。
 
-    - 读取发布映射 (.publish-map.json) 来查找已发布文章的路径。
-    - 检查草稿的修改时间是否晚于上次更新时间。
+    - 读取发布映射 (.publish-map.json) 来查找已发布文章的路径 (按规范化绝对路径索引)。
+    - 比对草稿内容哈希判断是否有变化 (size/mtime 作为预筛选)。
     - 复制草稿内容覆盖已发布的文章。
-    - 更新映射中的 'updated_at' 时间戳。
+    - 更新映射中的 'updated_at' 时间戳与内容哈希。
     """
     if not os.path.exists(draft_file):
         print(f"错误: 未找到草稿文件 '{draft_file}'", file=sys.stderr)
@@ -23,61 +79,118 @@ def update_published(draft_file, map_file):
         print(f"错误: 未找到映射文件 '{map_file}'，无法更新。", file=sys.stderr)
         sys.exit(1)
 
-    # 1. 读取映射文件
-    with open(map_file, "r", encoding="utf-8") as f:
-        try:
-            map_data = json.load(f)
-        except json.JSONDecodeError:
-            print(f"错误: 无法解析映射文件 '{map_file}'。", file=sys.stderr)
+    # 1. 在文件锁内读取映射, 按规范化路径查找映射关系
+    with open_map(map_file) as store, open_meta_cache() as meta:
+        target_mapping = store.get(draft_file)
+
+        if target_mapping is None:
+            print(f"错误: 未找到草稿 '{draft_file}' 对应的已发布文章，请先发布。", file=sys.stderr)
             sys.exit(1)
 
-    # 2. 查找映射关系
-    mapping_index = -1
-    for i, mapping in enumerate(map_data.get("mappings", [])):
-        if os.path.normpath(mapping.get("draft")) == os.path.normpath(draft_file):
-            mapping_index = i
-            break
-            
-    if mapping_index == -1:
-        print(f"错误: 未找到草稿 '{draft_file}' 对应的已发布文章，请先发布。", file=sys.stderr)
-        sys.exit(1)
-        
-    target_mapping = map_data["mappings"][mapping_index]
-    published_filepath = target_mapping.get("published")
-    
-    # 3. 验证修改时间
-    draft_mtime_utc = datetime.fromtimestamp(os.path.getmtime(draft_file), tz=timezone.utc)
-    last_update_utc = datetime.fromisoformat(target_mapping.get("updated_at"))
-    
-    if draft_mtime_utc <= last_update_utc:
-        print(f"信息: 草稿 '{os.path.basename(draft_file)}' 不比上次发布版本新，无需操作。", file=sys.stdout)
-        sys.exit(0)
+        published_filepath = target_mapping.get("published")
 
-    # 4. 复制内容
-    try:
-        shutil.copyfile(draft_file, published_filepath)
-    except (IOError, shutil.SameFileError) as e:
-        print(f"更新已发布文件时出错: {e}", file=sys.stderr)
-        sys.exit(1)
+        # 2. 比对内容
+        status, fields = check_draft(target_mapping, meta)
+
+        if status == "unchanged":
+            if fields:
+                store.update(draft_file, **fields)
+            print(f"信息: 草稿 '{os.path.basename(draft_file)}' 与已发布版本内容一致，无需操作。", file=sys.stdout)
+            return
+
+        # 3. 复制内容
+        error = copy_draft(target_mapping)
+        if error:
+            print(f"更新已发布文件时出错: {error}", file=sys.stderr)
+            sys.exit(1)
+
+        # 4. 在映射中更新时间戳与内容哈希, 退出 with 时原子写回
+        store.update(draft_file, updated_at=datetime.now(timezone.utc).isoformat(), **fields)
 
-    # 5. 在映射中更新时间戳并写回
-    now_utc_iso = datetime.now(timezone.utc).isoformat()
-    map_data["mappings"][mapping_index]["updated_at"] = now_utc_iso
-    
-    try:
-        with open(map_file, "w", encoding="utf-8") as f:
-            json.dump(map_data, f, indent=2, ensure_ascii=False)
-    except IOError as e:
-        print(f"写入已更新的映射文件时出错: {e}", file=sys.stderr)
-        sys.exit(1)
-        
     print(f"成功更新 '{published_filepath}'")
 
 
+def _sync_one(mapping, dry_run, meta=None):
+    status, fields = check_draft(mapping, meta)
+    if status == "changed" and not dry_run:
+        error = copy_draft(mapping)
+        if error:
+            return "failed", None, error
+    return status, fields, None
+
+
+def sync_published(map_file, workers=8, dry_run=False, drafts=None):
+    """
+    遍历映射中的草稿，只复制内容真正变化的草稿 (并发执行)。
+
+    drafts 为草稿路径集合时只检查其中已发布的草稿，未发布的路径直接忽略。
+
+    返回 {'updated': [...], 'unchanged': [...], 'missing': [...], 'failed': [(路径, 原因)]}。
+    """
+    report = {"updated": [], "unchanged": [], "missing": [], "failed": []}
+
+    with open_map(map_file) as store, open_meta_cache() as meta:
+        if drafts is None:
+            mappings = list(store)
+        else:
+            found = (store.get(draft_file) for draft_file in drafts)
+            mappings = list({m["draft"]: m for m in found if m is not None}.values())
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(lambda m: _sync_one(m, dry_run, meta), mappings))
+
+        now_utc = datetime.now(timezone.utc).isoformat()
+        for mapping, (status, fields, error) in zip(mappings, results):
+            draft_file = mapping["draft"]
+            if status == "failed":
+                report["failed"].append((draft_file, error))
+                continue
+            if status == "missing":
+                report["missing"].append(draft_file)
+                continue
+
+            if status == "changed":
+                report["updated"].append(mapping["published"])
+                if not dry_run:
+                    store.update(draft_file, updated_at=now_utc, **fields)
+            else:
+                report["unchanged"].append(draft_file)
+                if fields and not dry_run:
+                    store.update(draft_file, **fields)
+
+    return report
+
+
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="根据草稿内容更新一篇已发布的文章。")
-    parser.add_argument("--draft-file", required=True, help="源草稿文件的完整路径。")
+    parser = argparse.ArgumentParser(description="根据草稿内容更新已发布的文章。")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--draft-file", help="源草稿文件的完整路径。")
+    target.add_argument("--sync", action="store_true", help="同步映射中的全部草稿，只复制内容有变化的草稿。")
     parser.add_argument("--map-file", required=True, help="'.publish-map.json' 文件的路径。")
-    
+    parser.add_argument("--workers", type=int, default=8, help="同步模式下的并发线程数。")
+    parser.add_argument("--dry-run", action="store_true", help="同步模式下只报告变化，不复制文件。")
+
     args = parser.parse_args()
-    update_published(args.draft_file, args.map_file)
+
+    if args.draft_file:
+        update_published(args.draft_file, args.map_file)
+        sys.exit(0)
+
+    if not os.path.exists(args.map_file):
+        print(f"错误: 未找到映射文件 '{args.map_file}'，无法同步。", file=sys.stderr)
+        sys.exit(1)
+
+    report = sync_published(args.map_file, args.workers, args.dry_run)
+
+    prefix = "将更新" if args.dry_run else "已更新"
+    for published_filepath in report["updated"]:
+        print(f"{prefix} '{published_filepath}'")
+    for draft_file in report["missing"]:
+        print(f"警告: 草稿不存在 '{draft_file}'", file=sys.stderr)
+    for draft_file, reason in report["failed"]:
+        print(f"错误: {draft_file}: {reason}", file=sys.stderr)
+
+    print(
+        f"同步完成: 更新 {len(report['updated'])}，未变化 {len(report['unchanged'])}，"
+        f"缺失 {len(report['missing'])}，失败 {len(report['failed'])}。"
+    )
+    sys.exit(1 if report["failed"] else 0)
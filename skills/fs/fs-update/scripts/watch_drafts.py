@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+监听草稿目录，草稿保存后自动把变化同步到已发布文章。
+
+- Linux 上通过 ctypes 调用 inotify，空闲时阻塞等待事件，不占用 CPU；
+  其他平台或 inotify 不可用时退化为按间隔扫描目录 (只 stat，不读文件)。
+- 一批保存事件在 --debounce 秒内没有新事件后才统一同步，编辑器连续写入只触发一次。
+- 同步复用 update_published.sync_published：只处理映射中已发布的草稿，内容哈希未变的跳过。
+
+默认监听 fs-detect 检测到的草稿目录，以及映射中所有草稿所在的目录。
+
+用法:
+    python3 watch_drafts.py --map-file <map.json> [--dir <草稿目录> ...] [--debounce 0.5] [--polling]
+"""
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import argparse
+
+from publish_map import PublishMap, normalize_path
+from update_published import sync_published
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "fs-detect", "scripts")))
+
+# inotify 常量 (见 <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+
+def is_draft(filename):
+    return filename.endswith(".md") and not filename.startswith(".")
+
+
+def scan_drafts(directories):
+    """返回 {草稿路径: (mtime_ns, size)}"""
+    snapshot = {}
+    for directory in directories:
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if is_draft(entry.name) and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[normalize_path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class InotifyWatcher:
+    """基于 inotify 的目录监听 (仅 Linux)"""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+
+        self.directories = list(directories)
+        self.watches = {}
+        for directory in self.directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+            if wd < 0:
+                err = ctypes.get_errno()
+                self.close()
+                raise OSError(err, f"无法监听目录 '{directory}'")
+            self.watches[wd] = directory
+
+    def wait(self, timeout=None):
+        """等待事件，返回变化的草稿路径集合 (超时返回空集合)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # 事件队列溢出：退化为检查全部草稿
+                    changed.update(scan_drafts(self.directories))
+                elif wd in self.watches and is_draft(name):
+                    changed.add(normalize_path(os.path.join(self.watches[wd], name)))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """按间隔扫描目录的监听 (inotify 不可用时使用)"""
+
+    def __init__(self, directories, interval=2.0):
+        self.directories = list(directories)
+        self.interval = interval
+        self.snapshot = scan_drafts(self.directories)
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = scan_drafts(self.directories)
+        changed = {path for path, state in current.items() if self.snapshot.get(path) != state}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(directories, polling=False, poll_interval=2.0):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            print(f"警告: inotify 不可用 ({e})，改为轮询。", file=sys.stderr)
+    return PollingWatcher(directories, poll_interval)
+
+
+def watch_directories(map_file, extra_dirs=None):
+    """要监听的目录: 指定目录 (默认为检测到的草稿目录) + 映射中草稿所在目录"""
+    if extra_dirs:
+        directories = {normalize_path(d) for d in extra_dirs}
+    else:
+        from detect_draft_dir import find_or_create_draft_dir
+
+        directories = {normalize_path(find_or_create_draft_dir())}
+
+    for mapping in PublishMap.load(map_file):
+        directories.add(os.path.dirname(mapping["draft"]))
+    return sorted(d for d in directories if os.path.isdir(d))
+
+
+def watch(watcher, map_file, debounce=0.5, workers=4, dry_run=False, on_sync=None, should_stop=None):
+    """
+    事件循环: 收集变化的草稿，静默 debounce 秒后批量同步。
+
+    on_sync(report) 在每次同步后调用；should_stop() 返回 True 时退出 (测试用)。
+    """
+    pending = set()
+    deadline = None
+    while not (should_stop and should_stop()):
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if should_stop and timeout is None:
+            timeout = 0.1
+        changed = watcher.wait(timeout)
+        if changed:
+            pending |= changed
+            deadline = time.monotonic() + debounce
+            continue
+
+        if pending and time.monotonic() >= deadline:
+            report = sync_published(map_file, workers, dry_run, drafts=pending)
+            pending = set()
+            deadline = None
+            if on_sync:
+                on_sync(report)
+
+
+def print_report(report, dry_run=False):
+    prefix = "将更新" if dry_run else "已更新"
+    for published_filepath in report["updated"]:
+        print(f"{prefix} '{published_filepath}'", flush=True)
+    for draft_file in report["missing"]:
+        print(f"警告: 草稿不存在 '{draft_file}'", file=sys.stderr)
+    for draft_file, reason in report["failed"]:
+        print(f"错误: {draft_file}: {reason}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="监听草稿目录并自动更新已发布的文章。")
+    parser.add_argument("--map-file", required=True, help="'.publish-map.json' 文件的路径。")
+    parser.add_argument("--dir", action="append", help="要监听的草稿目录，可重复；默认使用检测到的草稿目录。")
+    parser.add_argument("--debounce", type=float, default=0.5, help="最后一次保存后等待多少秒再同步。")
+    parser.add_argument("--polling", action="store_true", help="不使用 inotify，按间隔扫描目录。")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="轮询模式下的扫描间隔 (秒)。")
+    parser.add_argument("--workers", type=int, default=4, help="同步时的并发线程数。")
+    parser.add_argument("--dry-run", action="store_true", help="只报告变化，不复制文件。")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.map_file):
+        print(f"错误: 未找到映射文件 '{args.map_file}'，无法监听。", file=sys.stderr)
+        sys.exit(1)
+
+    directories = watch_directories(args.map_file, args.dir)
+    if not directories:
+        print("错误: 没有可监听的草稿目录。", file=sys.stderr)
+        sys.exit(1)
+
+    watcher = create_watcher(directories, args.polling, args.poll_interval)
+    mode = "轮询" if isinstance(watcher, PollingWatcher) else "inotify"
+    print(f"正在监听 {len(directories)} 个目录 ({mode})，按 Ctrl+C 退出。", file=sys.stderr)
+    for directory in directories:
+        print(f"  {directory}", file=sys.stderr)
+
+    try:
+        watch(
+            watcher,
+            args.map_file,
+            args.debounce,
+            args.workers,
+            args.dry_run,
+            on_sync=lambda report: print_report(report, args.dry_run),
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
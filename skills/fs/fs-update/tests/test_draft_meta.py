@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import draft_meta  # noqa: E402
+import publish_map  # noqa: E402
+
+
+class DraftMetaCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+        self.cache_path = os.path.join(self.tmp_dir, "cache", "draft-meta.json")
+        self.draft = os.path.join(self.tmp_dir, "001_a.md")
+        with open(self.draft, "w", encoding="utf-8") as f:
+            f.write("# A\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_content_hash_is_reused_until_the_file_changes(self):
+        with draft_meta.open_meta_cache(self.cache_path) as meta:
+            fields = meta.content_fields(self.draft)
+            meta.remember(self.draft, heading="A", slug="a")
+        self.assertEqual(fields, publish_map.content_fields(self.draft))
+
+        cache = draft_meta.DraftMetaCache.load(self.cache_path)
+        with mock.patch.object(draft_meta, "file_digest", side_effect=AssertionError("hashed")):
+            self.assertEqual(cache.content_fields(self.draft), fields)
+        self.assertEqual(cache.lookup(self.draft)["slug"], "a")
+
+        with open(self.draft, "a", encoding="utf-8") as f:
+            f.write("more\n")
+        self.assertEqual(cache.lookup(self.draft), {})
+        self.assertNotEqual(cache.content_fields(self.draft)["content_hash"], fields["content_hash"])
+
+    def test_save_merges_with_entries_written_by_other_processes(self):
+        other = os.path.join(self.tmp_dir, "002_b.md")
+        with open(other, "w", encoding="utf-8") as f:
+            f.write("# B\n")
+
+        first = draft_meta.DraftMetaCache.load(self.cache_path)
+        second = draft_meta.DraftMetaCache.load(self.cache_path)
+        first.remember(self.draft, slug="a")
+        second.remember(other, slug="b")
+        first.save()
+        second.save()
+
+        merged = draft_meta.DraftMetaCache.load(self.cache_path)
+        self.assertEqual(merged.lookup(self.draft)["slug"], "a")
+        self.assertEqual(merged.lookup(other)["slug"], "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import publish_map  # noqa: E402
+
+
+class PublishMapTests(unittest.TestCase):
+    def test_migrate_v1_list_and_lookup_by_normalized_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            draft = os.path.join(tmp_dir, "drafts", "001_a.md")
+            published = os.path.join(tmp_dir, "pub", "001_a.md")
+            map_file = os.path.join(tmp_dir, ".publish-map.json")
+            with open(map_file, "w", encoding="utf-8") as f:
+                json.dump({"mappings": [{
+                    "draft": draft,
+                    "published": published,
+                    "published_at": "2026-01-01T00:00:00+00:00",
+                    "updated_at": "2026-01-01T00:00:00+00:00",
+                }]}, f)
+
+            with publish_map.open_map(map_file) as store:
+                self.assertTrue(store.migrated)
+                messy = os.path.join(tmp_dir, "drafts", "..", "drafts", "001_a.md")
+                self.assertEqual(store.get(messy)["published"], published)
+                self.assertEqual(store.get_by_published(published)["draft"], draft)
+
+            with open(map_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+
+        self.assertEqual(saved["version"], publish_map.MAP_VERSION)
+        self.assertIn(publish_map.normalize_path(draft), saved["mappings"])
+
+    def test_add_and_update_are_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            map_file = os.path.join(tmp_dir, ".publish-map.json")
+            draft = os.path.join(tmp_dir, "001_a.md")
+
+            with publish_map.open_map(map_file) as store:
+                store.add(draft, os.path.join(tmp_dir, "pub.md"), "2026-01-01T00:00:00+00:00")
+            with publish_map.open_map(map_file) as store:
+                store.update(draft, updated_at="2026-02-01T00:00:00+00:00")
+
+            reloaded = publish_map.PublishMap.load(map_file)
+
+        self.assertEqual(len(reloaded), 1)
+        self.assertEqual(reloaded.get(draft)["updated_at"], "2026-02-01T00:00:00+00:00")
+        self.assertFalse(reloaded.migrated)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import publish_map  # noqa: E402
+import update_published  # noqa: E402
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class UpdateSyncTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+        env = mock.patch.dict(os.environ, {"FLOWAI_CACHE_DIR": os.path.join(self.tmp_dir, "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        self.map_file = os.path.join(self.tmp_dir, ".publish-map.json")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def publish(self, name, content, with_hash=True):
+        draft = os.path.join(self.tmp_dir, "drafts", name)
+        published = os.path.join(self.tmp_dir, "pub", name)
+        write(draft, content)
+        write(published, content)
+        fields = publish_map.content_fields(draft) if with_hash else {}
+        with publish_map.open_map(self.map_file) as store:
+            store.add(draft, published, "2026-01-01T00:00:00+00:00", **fields)
+        return draft, published
+
+    def test_sync_copies_only_changed_drafts(self):
+        touched, touched_pub = self.publish("001_a.md", "# A\n")
+        edited, edited_pub = self.publish("002_b.md", "# B\n")
+        missing, _ = self.publish("003_c.md", "# C\n")
+
+        os.utime(touched, ns=(0, 10**18))
+        write(edited, "# B v2\n")
+        os.unlink(missing)
+        # 未变化的草稿不应被复制: 标记已发布文件, 若被覆盖即可发现
+        write(touched_pub, "# A (published)\n")
+
+        report = update_published.sync_published(self.map_file, workers=2)
+
+        self.assertEqual(report["updated"], [publish_map.normalize_path(edited_pub)])
+        self.assertEqual(report["unchanged"], [publish_map.normalize_path(touched)])
+        self.assertEqual(report["missing"], [publish_map.normalize_path(missing)])
+        self.assertEqual(read(edited_pub), "# B v2\n")
+        self.assertEqual(read(touched_pub), "# A (published)\n")
+
+        store = publish_map.PublishMap.load(self.map_file)
+        self.assertEqual(store.get(touched)["mtime_ns"], 10**18)
+        self.assertEqual(store.get(edited)["content_hash"], publish_map.file_digest(edited))
+        self.assertNotEqual(store.get(edited)["updated_at"], "2026-01-01T00:00:00+00:00")
+
+    def test_dry_run_does_not_copy_or_save(self):
+        draft, published = self.publish("001_a.md", "# A\n")
+        write(draft, "# A v2\n")
+        before = read(self.map_file)
+
+        report = update_published.sync_published(self.map_file, dry_run=True)
+
+        self.assertEqual(len(report["updated"]), 1)
+        self.assertEqual(read(published), "# A\n")
+        self.assertEqual(read(self.map_file), before)
+
+    def test_legacy_mapping_without_hash_compares_published_file(self):
+        same, _ = self.publish("001_a.md", "# A\n", with_hash=False)
+        changed, changed_pub = self.publish("002_b.md", "# B\n", with_hash=False)
+        write(changed, "# B v2\n")
+
+        report = update_published.sync_published(self.map_file)
+
+        self.assertEqual(report["unchanged"], [publish_map.normalize_path(same)])
+        self.assertEqual(read(changed_pub), "# B v2\n")
+        store = publish_map.PublishMap.load(self.map_file)
+        self.assertEqual(store.get(same)["content_hash"], publish_map.file_digest(same))
+
+
+if __name__ == "__main__":
+    unittest.main()
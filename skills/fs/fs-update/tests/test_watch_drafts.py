@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import publish_map  # noqa: E402
+import watch_drafts  # noqa: E402
+
+
+def write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class WatchDraftsTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+        env = mock.patch.dict(os.environ, {"FLOWAI_CACHE_DIR": os.path.join(self.tmp_dir, "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        self.draft_dir = os.path.join(self.tmp_dir, "drafts")
+        self.publish_dir = os.path.join(self.tmp_dir, "pub")
+        os.makedirs(self.draft_dir)
+        os.makedirs(self.publish_dir)
+        self.map_file = os.path.join(self.tmp_dir, ".publish-map.json")
+
+        self.draft = os.path.join(self.draft_dir, "001_a.md")
+        self.published = os.path.join(self.publish_dir, "001_a.md")
+        write(self.draft, "# A\n")
+        write(self.published, "# A\n")
+        with publish_map.open_map(self.map_file) as store:
+            store.add(self.draft, self.published, "2026-01-01T00:00:00+00:00",
+                      **publish_map.content_fields(self.draft))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def run_watcher(self, watcher, edit):
+        reports = []
+        stop = threading.Event()
+        thread = threading.Thread(target=watch_drafts.watch, kwargs={
+            "watcher": watcher,
+            "map_file": self.map_file,
+            "debounce": 0.2,
+            "on_sync": reports.append,
+            "should_stop": stop.is_set,
+        })
+        thread.start()
+        try:
+            edit()
+            deadline = time.monotonic() + 5
+            while not reports and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            stop.set()
+            thread.join()
+            watcher.close()
+        return reports
+
+    def burst_of_saves(self):
+        # 连续多次保存 (含未发布的草稿) 只触发一次同步
+        for i in range(5):
+            write(self.draft, f"# A v{i}\n")
+        write(os.path.join(self.draft_dir, "002_new.md"), "# new\n")
+
+    def assert_single_sync(self, reports):
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0]["updated"], [publish_map.normalize_path(self.published)])
+        self.assertEqual(read(self.published), "# A v4\n")
+
+    def test_polling_watcher_debounces_and_syncs(self):
+        watcher = watch_drafts.PollingWatcher([self.draft_dir], interval=0.05)
+        self.assert_single_sync(self.run_watcher(watcher, self.burst_of_saves))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify 仅支持 Linux")
+    def test_inotify_watcher_sees_atomic_renames(self):
+        watcher = watch_drafts.InotifyWatcher([self.draft_dir])
+
+        def atomic_save():
+            tmp_path = os.path.join(self.draft_dir, ".001_a.md.swp")
+            self.burst_of_saves()
+            write(tmp_path, "# A v4\n")
+            os.replace(tmp_path, self.draft)
+
+        self.assert_single_sync(self.run_watcher(watcher, atomic_save))
+
+    def test_watch_directories_include_mapped_draft_dirs(self):
+        other = os.path.join(self.tmp_dir, "other")
+        os.makedirs(other)
+        directories = watch_drafts.watch_directories(self.map_file, [other])
+        self.assertEqual(directories, sorted([
+            publish_map.normalize_path(other), publish_map.normalize_path(self.draft_dir),
+        ]))
+
+
+if __name__ == "__main__":
+    unittest.main()
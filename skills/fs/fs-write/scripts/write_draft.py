@@ -2,41 +2,23 @@
 import os
 import re
 import sys
+import uuid
+import shutil
 import argparse
-import io
+from functools import partial
 
-def find_project_root(start_path=None):
-    """
-    向上查找项目根目录（包含 .git, package.json, pyproject.toml 或 CLAUDE.md 的目录）
-
-    Args:
-        start_path: 开始查找的路径，默认为当前工作目录
-
-    Returns:
-        项目根目录的绝对路径，如果找不到则返回当前工作目录
-    """
-    if start_path is None:
-        start_path = os.getcwd()
+try:
+    import fcntl
+except ImportError:  # 非 Linux/Unix 平台不支持 reflink, 退化为复制
+    fcntl = None
 
-    current = os.path.abspath(start_path)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fs-common", "scripts"))
+from fs_common import resolve_dir  # noqa: E402
 
-    # 项目根标志文件/目录
-    root_markers = ['.git', 'package.json', 'pyproject.toml', 'CLAUDE.md', 'claude.md']
+CHUNK_SIZE = 1024 * 1024
+LINK_MODES = ("copy", "hardlink", "reflink")
+FICLONE = 0x40049409  # Linux ioctl: 共享数据块的写时复制克隆
 
-    # 向上查找，最多到文件系统根目录
-    while True:
-        # 检查是否存在任何项目根标志
-        for marker in root_markers:
-            if os.path.exists(os.path.join(current, marker)):
-                return current
-
-        # 到达文件系统根目录
-        parent = os.path.dirname(current)
-        if parent == current:
-            # 找不到项目根，返回当前工作目录
-            return os.getcwd()
-
-        current = parent
 
 def sanitize_filename(title):
     """
@@ -50,45 +32,168 @@ def sanitize_filename(title):
     s = re.sub(r"(?u)[^-\w.]", "", s)
     return s.lower()
 
-def write_draft(directory, file_id, title, content, companion_content):
+def draft_paths(directory, file_id, title):
+    """返回 (主文件路径, 配套文件路径)"""
+    base_filename = f"{file_id}_{sanitize_filename(title)}"
+    return (
+        os.path.join(directory, f"{base_filename}.md"),
+        os.path.join(directory, f"{base_filename}_扩展信息.md"),
+    )
+
+
+def _temp_path(target):
+    directory, basename = os.path.split(target)
+    return os.path.join(directory, f".{basename}-{uuid.uuid4().hex}.tmp")
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Windows 等平台无法打开目录, 跳过
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _stage_text(target, text):
+    """把字符串写入目标同目录的临时文件并 fsync"""
+    tmp_path = _temp_path(target)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError("reflink 不受支持")
+    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _stage_file(target, source, link_mode="copy"):
     """
-    写入主草稿文件和可选的配套文件。
+    把源文件放到目标同目录的临时文件。
+
+    - hardlink: 与源文件在同一文件系统时直接硬链接 (之后修改源文件会同步改动草稿)。
+    - reflink: 尝试写时复制克隆 (btrfs/xfs 等)，不支持时退化为复制。
+    - copy: 分块流式复制，不把整个文件读入内存。
     """
-    # 处理路径：如果是相对路径，基于项目根来解析
-    if not os.path.isabs(directory):
-        project_root = find_project_root()
-        directory = os.path.join(project_root, directory)
+    tmp_path = _temp_path(target)
+    if link_mode == "hardlink" and os.stat(source).st_dev == os.stat(os.path.dirname(target)).st_dev:
+        try:
+            os.link(source, tmp_path)
+            return tmp_path
+        except OSError:
+            pass  # 文件系统不支持硬链接, 退化为复制
+
+    with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+        cloned = False
+        if link_mode == "reflink":
+            try:
+                _reflink(src, dst)
+                cloned = True
+            except OSError:
+                pass
+        if not cloned:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        dst.flush()
+        os.fsync(dst.fileno())
+    return tmp_path
+
+
+def _commit(staged):
+    """
+    依次把临时文件 rename 为目标文件，主文件最后落盘。
 
-    # 转换为绝对路径
-    directory = os.path.abspath(directory)
+    任一 rename 失败时撤销已替换的文件 (恢复旧版本或删除新建文件)，不留下不配套的主文件/配套文件。
+    """
+    backups = []
+    try:
+        for tmp_path, target in staged:
+            backup = None
+            if os.path.exists(target):
+                backup = _temp_path(target)
+                try:
+                    os.link(target, backup)
+                except OSError:
+                    shutil.copy2(target, backup)
+            backups.append((target, backup))
+            os.replace(tmp_path, target)
+    except BaseException:
+        for target, backup in reversed(backups):
+            if backup:
+                os.replace(backup, target)
+            elif os.path.exists(target):
+                os.unlink(target)
+        raise
+    finally:
+        # 目标未被替换时, 备份与目标是同一 inode 的硬链接, rename 不会消耗备份, 统一清理
+        leftovers = [tmp_path for tmp_path, _ in staged] + [backup for _, backup in backups if backup]
+        for path in leftovers:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    _fsync_dir(os.path.dirname(staged[0][1]))
+
+
+def _write_staged(directory, file_id, title, stage_main, stage_companion):
+    # 处理路径：如果是相对路径，基于项目根来解析
+    directory = resolve_dir(directory)
 
     # 确保目录存在
     os.makedirs(directory, exist_ok=True)
 
-    sanitized_title = sanitize_filename(title)
-    base_filename = f"{file_id}_{sanitized_title}"
-    
-    # --- 主文章 ---
-    main_filepath = os.path.join(directory, f"{base_filename}.md")
+    main_filepath, companion_filepath = draft_paths(directory, file_id, title)
+
+    staged = []
     try:
-        with open(main_filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        # 配套文件先落盘，主文件最后出现
+        if stage_companion:
+            staged.append((stage_companion(companion_filepath), companion_filepath))
+        staged.append((stage_main(main_filepath), main_filepath))
+        _commit(staged)
     except IOError as e:
-        print(f"写入主文件时出错: {e}", file=sys.stderr)
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        print(f"写入草稿文件时出错: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # --- 配套文章 (如果提供了内容) ---
-    if companion_content:
-        companion_filepath = os.path.join(directory, f"{base_filename}_扩展信息.md")
-        try:
-            with open(companion_filepath, "w", encoding="utf-8") as f:
-                f.write(companion_content)
-        except IOError as e:
-            print(f"写入配套文件时出错: {e}", file=sys.stderr)
+    # 返回已创建的主文件路径
+    return main_filepath
+
+
+def write_draft(directory, file_id, title, content, companion_content):
+    """
+    写入主草稿文件和可选的配套文件。
+
+    两个文件先写入同目录临时文件并 fsync，再作为一组原子 rename。
+    """
+    stage_companion = partial(_stage_text, text=companion_content) if companion_content else None
+    return _write_staged(directory, file_id, title, partial(_stage_text, text=content), stage_companion)
+
+
+def write_draft_from_files(directory, file_id, title, main_content_file, companion_content_file="", link_mode="copy"):
+    """
+    从内容文件流式写入主草稿文件和可选的配套文件 (不把内容整体读入内存)。
+
+    link_mode 见 _stage_file；配套内容文件为空文件时不生成配套文件。
+    """
+    for label, path in (("主内容", main_content_file), ("配套内容", companion_content_file)):
+        if path and not os.path.isfile(path):
+            print(f"读取{label}文件时出错: 未找到文件 '{path}'", file=sys.stderr)
             sys.exit(1)
-            
-    # 打印已创建的主文件路径
-    print(main_filepath)
+
+    stage_companion = None
+    if companion_content_file and os.path.getsize(companion_content_file) > 0:
+        stage_companion = partial(_stage_file, source=companion_content_file, link_mode=link_mode)
+    stage_main = partial(_stage_file, source=main_content_file, link_mode=link_mode)
+    return _write_staged(directory, file_id, title, stage_main, stage_companion)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="写入一篇草稿文章及其配套文件。")
@@ -97,25 +202,20 @@ if __name__ == "__main__":
     parser.add_argument("--title", required=True, help="文章的标题。")
     parser.add_argument("--main-content-file", required=True, help="包含主内容的文件路径。")
     parser.add_argument("--companion-content-file", default="", help="（可选）包含配套内容的文件路径。")
-    
-    args = parser.parse_args()
-    
-    main_content = ""
-    companion_content = ""
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="copy",
+        help="内容文件与草稿目录在同一文件系统时，使用硬链接或 reflink 代替复制。",
+    )
 
-    try:
-        with open(args.main_content_file, "r", encoding="utf-8") as f:
-            main_content = f.read()
-    except IOError as e:
-        print(f"读取主内容文件时出错: {e}", file=sys.stderr)
-        sys.exit(1)
+    args = parser.parse_args()
 
-    if args.companion_content_file:
-        try:
-            with open(args.companion_content_file, "r", encoding="utf-8") as f:
-                companion_content = f.read()
-        except IOError as e:
-            print(f"读取配套内容文件时出错: {e}", file=sys.stderr)
-            sys.exit(1)
-        
-    write_draft(args.dir, args.id, args.title, main_content, companion_content)
+    print(write_draft_from_files(
+        args.dir,
+        args.id,
+        args.title,
+        args.main_content_file,
+        args.companion_content_file,
+        args.link,
+    ))
@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import write_draft  # noqa: E402
+
+
+def write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class WriteDraftTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+        self.out_dir = os.path.join(self.tmp_dir, "drafts")
+        self.main_src = os.path.join(self.tmp_dir, "main.md")
+        self.companion_src = os.path.join(self.tmp_dir, "companion.md")
+        write(self.main_src, "# 标题\n\n" + "正文\n" * 10000)
+        write(self.companion_src, "扩展信息\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_streams_main_and_companion_without_leftover_temp_files(self):
+        path = write_draft.write_draft_from_files(
+            self.out_dir, "001", "Hello World", self.main_src, self.companion_src
+        )
+
+        self.assertEqual(path, os.path.join(self.out_dir, "001_hello-world.md"))
+        self.assertEqual(read(path), read(self.main_src))
+        self.assertEqual(
+            sorted(os.listdir(self.out_dir)),
+            ["001_hello-world.md", "001_hello-world_扩展信息.md"],
+        )
+
+    def test_hardlink_mode_shares_the_source_inode(self):
+        path = write_draft.write_draft_from_files(
+            self.out_dir, "001", "linked", self.main_src, link_mode="hardlink"
+        )
+        self.assertTrue(os.path.samefile(path, self.main_src))
+
+    def test_failed_main_rename_restores_previous_pair(self):
+        write_draft.write_draft(self.out_dir, "001", "post", "old main", "old companion")
+        main_path, companion_path = write_draft.draft_paths(self.out_dir, "001", "post")
+        real_replace = os.replace
+        failed = []
+
+        def failing_replace(src, dst):
+            # 只让主文件的第一次 rename 失败, 回滚时的 rename 正常执行
+            if dst == main_path and not failed:
+                failed.append(src)
+                raise OSError("disk full")
+            return real_replace(src, dst)
+
+        with mock.patch.object(write_draft.os, "replace", side_effect=failing_replace):
+            with self.assertRaises(SystemExit):
+                write_draft.write_draft(self.out_dir, "001", "post", "new main", "new companion")
+
+        self.assertEqual(read(main_path), "old main")
+        self.assertEqual(read(companion_path), "old companion")
+        self.assertEqual(sorted(os.listdir(self.out_dir)), sorted([
+            os.path.basename(main_path), os.path.basename(companion_path),
+        ]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,17 +10,24 @@ GitHub Trending 数据获取脚本
     --window: past_24_hours | past_week | past_month | past_3_months
     --domain: ai | web3 | frontend | tools | infra | all
     --output: 输出文件路径 (默认输出到 stdout)
-    --limit: 返回数量 (默认 30)
+    --limit: 返回数量 (默认 50)
+    --fixture: 从本地 JSON (search/repositories 响应) 读取数据, 用于离线测试
+    --summary-dir: 按月分区的 summary 目录 (优先于 --summary)
+    --recent-months: 分区模式下只排除最近 N 个月出现过的仓库 (默认 0 表示全部)
+    --timing-report: 输出各阶段耗时 JSON
+    --profile: 在 cProfile 下运行并保存 .pstats 文件
 """
 
 import argparse
 import json
-import re
 import subprocess
 import sys
 from datetime import datetime, timedelta
 from typing import Optional
 
+from radar_timing import StageTimings, add_instrument_arguments, profiled
+from summary_store import SUMMARY_REPO_PATTERN, extract_summary_repos, load_recent_repo_set
+
 
 # 时间窗口配置
 WINDOW_DAYS = {
@@ -65,10 +72,6 @@ DOMAIN_LANGUAGES = {
 }
 
 SUMMARY_PATH_DEFAULT = "/Users/sggmico/course/101/post/github-trend/summary.md"
-SUMMARY_REPO_PATTERN = re.compile(
-    r"https?://github\.com/([^/\s]+)/([^\)\s]+)",
-    re.IGNORECASE,
-)
 
 
 def get_date_threshold(window: str) -> str:
@@ -108,16 +111,25 @@ def load_summary_repo_set(summary_path: str) -> set[str]:
         print(f"summary.md read error: {e}", file=sys.stderr)
         return set()
 
-    repos = set()
-    for match in SUMMARY_REPO_PATTERN.finditer(content):
-        owner = match.group(1).strip().lower()
-        repo = match.group(2).strip().lower().rstrip("/")
-        if repo.endswith(".git"):
-            repo = repo[:-4]
-        if owner and repo:
-            repos.add(f"{owner}/{repo}")
+    return extract_summary_repos(content)
 
-    return repos
+
+def is_repo_in_summary(repo: dict, excluded: set[str]) -> bool:
+    """判断仓库是否已出现在 summary.md"""
+    full_name = (repo.get("full_name") or "").lower()
+    if full_name in excluded:
+        return True
+
+    url_match = SUMMARY_REPO_PATTERN.search(repo.get("html_url") or "")
+    if url_match:
+        owner = url_match.group(1).strip().lower()
+        name = url_match.group(2).strip().lower().rstrip("/")
+        if name.endswith(".git"):
+            name = name[:-4]
+        if f"{owner}/{name}" in excluded:
+            return True
+
+    return False
 
 
 def filter_repos_by_summary(repos: list, excluded: set[str]) -> list:
@@ -125,26 +137,7 @@ def filter_repos_by_summary(repos: list, excluded: set[str]) -> list:
     if not excluded:
         return repos
 
-    filtered = []
-    for repo in repos:
-        full_name = (repo.get("full_name") or "").lower()
-        html_url = repo.get("html_url") or ""
-
-        if full_name in excluded:
-            continue
-
-        url_match = SUMMARY_REPO_PATTERN.search(html_url)
-        if url_match:
-            owner = url_match.group(1).strip().lower()
-            name = url_match.group(2).strip().lower().rstrip("/")
-            if name.endswith(".git"):
-                name = name[:-4]
-            if f"{owner}/{name}" in excluded:
-                continue
-
-        filtered.append(repo)
-
-    return filtered
+    return [repo for repo in repos if not is_repo_in_summary(repo, excluded)]
 
 
 def fetch_via_gh_cli(query: str, limit: int = 30) -> Optional[list]:
@@ -179,39 +172,63 @@ def fetch_via_gh_cli(query: str, limit: int = 30) -> Optional[list]:
         return None
 
 
+def fetch_via_fixture(path: str, limit: int = 30) -> Optional[list]:
+    """从本地 JSON 读取 search/repositories 响应, 作为 GitHub API 的离线替身"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"Fixture not found: {path}", file=sys.stderr)
+        return None
+    except json.JSONDecodeError as e:
+        print(f"JSON parse error: {e}", file=sys.stderr)
+        return None
+
+    items = data.get("items", []) if isinstance(data, dict) else data
+    return items[:limit]
+
+
+def process_repo(repo: dict, domain: str, rank: int = 0) -> dict:
+    """处理和丰富单个仓库数据"""
+    # 基础信息
+    item = {
+        "rank": rank,
+        "full_name": repo.get("full_name", ""),
+        "name": repo.get("name", ""),
+        "owner": repo.get("owner", {}).get("login", ""),
+        "url": repo.get("html_url", ""),
+        "description": repo.get("description", "") or "",
+        "stars": repo.get("stargazers_count", 0),
+        "forks": repo.get("forks_count", 0),
+        "open_issues": repo.get("open_issues_count", 0),
+        "language": repo.get("language", ""),
+        "license": repo.get("license", {}).get("spdx_id", "") if repo.get("license") else "",
+        "topics": repo.get("topics", []),
+        "created_at": repo.get("created_at", ""),
+        "updated_at": repo.get("updated_at", ""),
+        "pushed_at": repo.get("pushed_at", ""),
+    }
+
+    # 推断赛道
+    item["domain"] = infer_domain(item, domain)
+
+    # 计算活跃度指标
+    item["activity_score"] = calculate_activity_score(item)
+
+    return item
+
+
 def process_repos(repos: list, domain: str) -> list:
     """处理和丰富仓库数据"""
-    processed = []
-
-    for repo in repos:
-        # 基础信息
-        item = {
-            "rank": len(processed) + 1,
-            "full_name": repo.get("full_name", ""),
-            "name": repo.get("name", ""),
-            "owner": repo.get("owner", {}).get("login", ""),
-            "url": repo.get("html_url", ""),
-            "description": repo.get("description", "") or "",
-            "stars": repo.get("stargazers_count", 0),
-            "forks": repo.get("forks_count", 0),
-            "open_issues": repo.get("open_issues_count", 0),
-            "language": repo.get("language", ""),
-            "license": repo.get("license", {}).get("spdx_id", "") if repo.get("license") else "",
-            "topics": repo.get("topics", []),
-            "created_at": repo.get("created_at", ""),
-            "updated_at": repo.get("updated_at", ""),
-            "pushed_at": repo.get("pushed_at", ""),
-        }
-
-        # 推断赛道
-        item["domain"] = infer_domain(item, domain)
-
-        # 计算活跃度指标
-        item["activity_score"] = calculate_activity_score(item)
-
-        processed.append(item)
-
-    return processed
+    return [process_repo(repo, domain, i + 1) for i, repo in enumerate(repos)]
+
+
+def rank_by_activity(repos: list) -> list:
+    """按活跃度排序并重新编号"""
+    repos.sort(key=lambda x: (x["activity_score"], x["stars"]), reverse=True)
+    for i, repo in enumerate(repos):
+        repo["rank"] = i + 1
+    return repos
 
 
 def infer_domain(repo: dict, default_domain: str) -> str:
@@ -327,9 +344,31 @@ def main():
     parser.add_argument("--table", action="store_true", help="Print as table")
     parser.add_argument("--summary", default=SUMMARY_PATH_DEFAULT,
                         help="summary.md path for duplicate filtering")
+    parser.add_argument("--fixture",
+                        help="Read search/repositories response from a local JSON file instead of gh CLI")
+    parser.add_argument("--summary-dir",
+                        help="Partitioned summary directory (overrides --summary)")
+    parser.add_argument("--recent-months", type=int, default=0,
+                        help="Only exclude repos seen in the recent N months (with --summary-dir)")
+
+    add_instrument_arguments(parser)
 
     args = parser.parse_args()
 
+    timings = StageTimings()
+    try:
+        with profiled(args.profile):
+            run(args, timings)
+    finally:
+        if args.timing_report:
+            timings.write_report(args.timing_report, {
+                "script": "fetch_trending",
+                "window": args.window,
+                "domain": args.domain,
+            })
+
+
+def run(args, timings: StageTimings) -> None:
     # 构建查询
     date_threshold = get_date_threshold(args.window)
     query = build_search_query(args.domain, date_threshold, args.min_stars)
@@ -338,41 +377,45 @@ def main():
     print(f"Query: {query}", file=sys.stderr)
 
     # 获取数据
-    repos = fetch_via_gh_cli(query, args.limit)
+    with timings.stage("fetch"):
+        if args.fixture:
+            repos = fetch_via_fixture(args.fixture, args.limit)
+        else:
+            repos = fetch_via_gh_cli(query, args.limit)
 
     if repos is None:
         print("Failed to fetch repos", file=sys.stderr)
         sys.exit(1)
 
     # 排除 summary.md 中的历史仓库
-    excluded = load_summary_repo_set(args.summary)
-    filtered = filter_repos_by_summary(repos, excluded)
+    with timings.stage("summary_load"):
+        if args.summary_dir:
+            excluded = load_recent_repo_set(args.summary_dir, args.recent_months)
+        else:
+            excluded = load_summary_repo_set(args.summary)
+    with timings.stage("filter"):
+        filtered = filter_repos_by_summary(repos, excluded)
     if excluded:
         removed = len(repos) - len(filtered)
         print(f"Filtered {removed} repos from summary.md", file=sys.stderr)
 
-    # 处理数据
-    processed = process_repos(filtered, args.domain)
-
-    # 按活跃度排序
-    processed.sort(key=lambda x: (x["activity_score"], x["stars"]), reverse=True)
-
-    # 重新编号
-    for i, repo in enumerate(processed):
-        repo["rank"] = i + 1
+    # 处理数据, 按活跃度排序并重新编号
+    with timings.stage("process"):
+        processed = rank_by_activity(process_repos(filtered, args.domain))
 
     # 输出
-    output = format_output(processed, args.window, args.domain)
-
-    if args.table:
-        print_table(processed)
-
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-        print(f"Saved to {args.output}", file=sys.stderr)
-    else:
-        print(json.dumps(output, ensure_ascii=False, indent=2))
+    with timings.stage("output"):
+        output = format_output(processed, args.window, args.domain)
+
+        if args.table:
+            print_table(processed)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
+            print(f"Saved to {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(output, ensure_ascii=False, indent=2))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+多时间窗口 × 多赛道的趋势矩阵
+
+先规划最少的查询 (每个赛道只按最宽的时间窗口查询一次, 或 --derive-domains 时只查一次全赛道),
+再基于共享的结果池, 按 pushed_at 本地推导较短窗口、按 infer_domain 推导赛道, 一次运行输出全部排名.
+
+注意: 查询按 stars 排序并受 --limit 截断, 较短窗口的结果是宽窗口 Top N 的子集, 而非独立查询的结果.
+
+用法:
+    python3 radar_matrix.py --output=matrix.json
+    python3 radar_matrix.py --windows=past_week,past_month --domains=ai,tools --output-dir=reports/
+    python3 radar_matrix.py --derive-domains --limit=100 --table
+
+参数:
+    --windows: 逗号分隔的时间窗口 (默认全部)
+    --domains: 逗号分隔的赛道, 可含 all (默认全部)
+    --derive-domains: 只查询一次全赛道, 本地推导各赛道
+    --fixture: 本地 JSON 文件, 或包含 {domain}.json 的目录, 替代 gh CLI
+    --output-dir: 每个 (window, domain) 输出一个 {window}_{domain}.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+import fetch_trending
+import score_repos
+from radar_timing import StageTimings, add_instrument_arguments, profiled
+from summary_store import load_recent_repo_set
+
+ALL_DOMAINS = list(fetch_trending.DOMAIN_KEYWORDS.keys()) + ["all"]
+
+
+def plan_matrix_queries(
+    windows: list[str],
+    domains: list[str],
+    min_stars: int = 100,
+    derive_domains: bool = False,
+) -> list[dict]:
+    """规划覆盖整个矩阵所需的最少查询: 每个查询赛道只用最宽窗口查询一次"""
+    widest = max(windows, key=lambda w: fetch_trending.WINDOW_DAYS[w])
+    threshold = fetch_trending.get_date_threshold(widest)
+    query_domains = ["all"] if derive_domains else domains
+
+    return [
+        {
+            "domain": domain,
+            "window": widest,
+            "query": fetch_trending.build_search_query(domain, threshold, min_stars),
+        }
+        for domain in query_domains
+    ]
+
+
+def fetch_planned(plan: list[dict], limit: int, fixture: Optional[str] = None) -> dict[str, list]:
+    """执行规划好的查询, 返回 {查询赛道: 原始仓库列表}"""
+    pools = {}
+    for entry in plan:
+        print(f"Query [{entry['domain']}]: {entry['query']}", file=sys.stderr)
+        if fixture and os.path.isdir(fixture):
+            items = fetch_trending.fetch_via_fixture(os.path.join(fixture, f"{entry['domain']}.json"), limit)
+        elif fixture:
+            items = fetch_trending.fetch_via_fixture(fixture, limit)
+        else:
+            items = fetch_trending.fetch_via_gh_cli(entry["query"], limit)
+        if items is None:
+            raise RuntimeError(f"Failed to fetch repos for domain: {entry['domain']}")
+        pools[entry["domain"]] = items
+    return pools
+
+
+def derive_cell(
+    pools: dict[str, list],
+    processed_cache: dict[tuple[str, str], dict],
+    window: str,
+    domain: str,
+    excluded: set[str],
+    top: int,
+) -> dict:
+    """从共享结果池推导单个 (window, domain) 的排名"""
+    threshold = fetch_trending.get_date_threshold(window)
+    derive_domain = domain not in pools
+    query_domain = "all" if derive_domain else domain
+    source = pools[query_domain]
+
+    candidates = []
+    for repo in source:
+        if (repo.get("pushed_at") or "")[:10] <= threshold:
+            continue
+        if fetch_trending.is_repo_in_summary(repo, excluded):
+            continue
+
+        key = (repo.get("full_name", ""), query_domain)
+        item = processed_cache.get(key)
+        if item is None:
+            item = fetch_trending.process_repo(repo, query_domain)
+            processed_cache[key] = item
+        if derive_domain and item["domain"] != domain:
+            continue
+
+        # 评分会改写 rank / score 字段, 每个单元格使用独立副本
+        candidates.append(dict(item))
+
+    fetch_trending.rank_by_activity(candidates)
+    scored = score_repos.score_repos(candidates)
+    return score_repos.format_output(scored[:top], {"window": window, "domain": domain})
+
+
+def run_matrix(
+    windows: list[str],
+    domains: list[str],
+    limit: int = 100,
+    min_stars: int = 100,
+    top: int = 5,
+    derive_domains: bool = False,
+    summary_path: str = fetch_trending.SUMMARY_PATH_DEFAULT,
+    summary_dir: Optional[str] = None,
+    recent_months: int = 0,
+    fixture: Optional[str] = None,
+    timings: Optional[StageTimings] = None,
+) -> dict:
+    timings = timings or StageTimings()
+
+    with timings.stage("plan"):
+        plan = plan_matrix_queries(windows, domains, min_stars, derive_domains)
+
+    with timings.stage("fetch"):
+        pools = fetch_planned(plan, limit, fixture)
+
+    with timings.stage("summary_load"):
+        if summary_dir:
+            excluded = load_recent_repo_set(summary_dir, recent_months)
+        else:
+            excluded = fetch_trending.load_summary_repo_set(summary_path)
+
+    reports = {}
+    processed_cache: dict[tuple[str, str], dict] = {}
+    with timings.stage("derive"):
+        for window in windows:
+            for domain in domains:
+                reports[f"{window}/{domain}"] = derive_cell(
+                    pools, processed_cache, window, domain, excluded, top
+                )
+
+    return {
+        "meta": {
+            "windows": windows,
+            "domains": domains,
+            "queries": plan,
+            "cells": len(reports),
+            "fetched": sum(len(items) for items in pools.values()),
+        },
+        "reports": reports,
+    }
+
+
+def parse_list(value: str, allowed: list[str], label: str) -> list[str]:
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown {label}: {', '.join(unknown)}")
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trending matrix across windows and domains")
+    parser.add_argument("--windows", default=",".join(fetch_trending.WINDOW_DAYS.keys()),
+                        help="Comma separated windows")
+    parser.add_argument("--domains", default=",".join(ALL_DOMAINS),
+                        help="Comma separated domains (may include all)")
+    parser.add_argument("--derive-domains", action="store_true",
+                        help="Fetch once for all domains and classify locally")
+    parser.add_argument("--limit", type=int, default=100, help="Repos per query")
+    parser.add_argument("--min-stars", type=int, default=100, help="Minimum stars")
+    parser.add_argument("--top", type=int, default=5, help="Top N per cell")
+    parser.add_argument("--fixture", help="Local JSON file, or directory of {domain}.json, instead of gh CLI")
+    parser.add_argument("--summary", default=fetch_trending.SUMMARY_PATH_DEFAULT, help="summary.md path")
+    parser.add_argument("--summary-dir", help="Partitioned summary directory (overrides --summary)")
+    parser.add_argument("--recent-months", type=int, default=0,
+                        help="Only exclude repos seen in the recent N months (with --summary-dir)")
+    parser.add_argument("--output", help="Output file path for the whole matrix")
+    parser.add_argument("--output-dir", help="Write one {window}_{domain}.json per cell")
+    parser.add_argument("--table", action="store_true", help="Print each cell as table")
+    add_instrument_arguments(parser)
+
+    args = parser.parse_args()
+
+    try:
+        windows = parse_list(args.windows, list(fetch_trending.WINDOW_DAYS.keys()), "window")
+        domains = parse_list(args.domains, ALL_DOMAINS, "domain")
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if not windows or not domains:
+        parser.error("--windows and --domains must not be empty")
+
+    timings = StageTimings()
+    try:
+        with profiled(args.profile):
+            run(args, windows, domains, timings)
+    finally:
+        timings.print_report()
+        if args.timing_report:
+            timings.write_report(args.timing_report, {"script": "radar_matrix"})
+
+
+def run(args, windows: list[str], domains: list[str], timings: StageTimings) -> None:
+    try:
+        matrix = run_matrix(
+            windows,
+            domains,
+            limit=args.limit,
+            min_stars=args.min_stars,
+            top=args.top,
+            derive_domains=args.derive_domains,
+            summary_path=args.summary,
+            summary_dir=args.summary_dir,
+            recent_months=args.recent_months,
+            fixture=args.fixture,
+            timings=timings,
+        )
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    print(
+        f"{matrix['meta']['cells']} cells from {len(matrix['meta']['queries'])} queries",
+        file=sys.stderr,
+    )
+
+    with timings.stage("output"):
+        if args.table:
+            for cell, report in matrix["reports"].items():
+                print(f"\n[{cell}]")
+                score_repos.print_table(report["repos"])
+
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            for cell, report in matrix["reports"].items():
+                path = os.path.join(args.output_dir, cell.replace("/", "_") + ".json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"Saved {len(matrix['reports'])} reports to {args.output_dir}", file=sys.stderr)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(matrix, f, ensure_ascii=False, indent=2)
+            print(f"Saved to {args.output}", file=sys.stderr)
+        elif not args.table and not args.output_dir:
+            print(json.dumps(matrix, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+趋势雷达一体化流水线
+
+在单个进程内串联 获取 → summary 去重 → 处理 → 评分 → 更新 summary,
+各阶段以生成器衔接, 不再经由 JSON 文件在进程间传递完整数据.
+
+用法:
+    python3 radar_pipeline.py --window=past_week --domain=ai --model=gpt-5 --update-summary
+    python3 radar_pipeline.py --fixture=search.json --artifacts-dir=out/ --table
+
+参数:
+    --window / --domain / --limit / --min-stars: 同 fetch_trending.py
+    --top: 只输出 Top N (默认 5)
+    --fixture: 从本地 JSON 读取 search/repositories 响应, 离线运行
+    --artifacts-dir: 额外输出中间产物 repos.json / scored.json
+    --output: 最终结果输出路径 (默认输出到 stdout)
+    --timing-report / --profile: 见 radar_timing.py
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+import fetch_trending
+import score_repos
+from radar_timing import StageTimings, add_instrument_arguments, profiled
+from summary_store import load_recent_repo_set
+
+
+def write_artifact(artifacts_dir: str, filename: str, data: dict) -> None:
+    os.makedirs(artifacts_dir, exist_ok=True)
+    path = os.path.join(artifacts_dir, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"Saved to {path}", file=sys.stderr)
+
+
+def run_pipeline(
+    window: str = "past_week",
+    domain: str = "all",
+    limit: int = 50,
+    min_stars: int = 100,
+    top: int = 5,
+    summary_path: str = fetch_trending.SUMMARY_PATH_DEFAULT,
+    summary_dir: Optional[str] = None,
+    recent_months: int = 0,
+    fixture: Optional[str] = None,
+    artifacts_dir: Optional[str] = None,
+    model: Optional[str] = None,
+    update_summary: bool = False,
+    today: Optional[str] = None,
+    timings: Optional[StageTimings] = None,
+) -> dict:
+    """运行完整流水线, 返回 score_repos.format_output 结构的结果"""
+    timings = timings or StageTimings()
+
+    # 1. 获取
+    with timings.stage("fetch"):
+        date_threshold = fetch_trending.get_date_threshold(window)
+        query = fetch_trending.build_search_query(domain, date_threshold, min_stars)
+        print(f"Query: {query}", file=sys.stderr)
+        if fixture:
+            raw = fetch_trending.fetch_via_fixture(fixture, limit)
+        else:
+            raw = fetch_trending.fetch_via_gh_cli(query, limit)
+    if raw is None:
+        raise RuntimeError("Failed to fetch repos")
+
+    # 2. summary 去重 (评分前完成)
+    with timings.stage("summary_load"):
+        if summary_dir:
+            excluded = load_recent_repo_set(summary_dir, recent_months)
+        else:
+            excluded = fetch_trending.load_summary_repo_set(summary_path)
+
+    filtered = timings.wrap(
+        "filter",
+        (repo for repo in raw if not fetch_trending.is_repo_in_summary(repo, excluded)),
+    )
+
+    # 3. 处理
+    processed_iter = timings.wrap(
+        "process",
+        (fetch_trending.process_repo(repo, domain) for repo in filtered),
+        upstream="filter",
+    )
+    processed = list(processed_iter)
+    with timings.stage("rank"):
+        fetch_trending.rank_by_activity(processed)
+
+    print(f"Filtered {len(raw) - len(processed)} repos from summary", file=sys.stderr)
+
+    if artifacts_dir:
+        with timings.stage("artifacts"):
+            write_artifact(artifacts_dir, "repos.json", fetch_trending.format_output(processed, window, domain))
+
+    # 4. 评分
+    with timings.stage("score"):
+        scored = score_repos.score_repos(processed)
+        top_repos = scored[:top]
+        output = score_repos.format_output(top_repos, {"window": window, "domain": domain})
+
+    if artifacts_dir:
+        with timings.stage("artifacts"):
+            write_artifact(artifacts_dir, "scored.json", output)
+
+    # 5. 更新 summary
+    if update_summary:
+        if not model:
+            raise ValueError("model is required when update_summary is set")
+        with timings.stage("summary_update"):
+            if summary_dir:
+                score_repos.update_summary_partition(summary_dir, model, top_repos, today)
+            else:
+                score_repos.update_summary_table(summary_path, model, top_repos, today)
+
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the post-radar pipeline in one process")
+    parser.add_argument("--window", default="past_week",
+                        choices=list(fetch_trending.WINDOW_DAYS.keys()),
+                        help="Time window")
+    parser.add_argument("--domain", default="all",
+                        choices=list(fetch_trending.DOMAIN_KEYWORDS.keys()) + ["all"],
+                        help="Tech domain")
+    parser.add_argument("--limit", type=int, default=50, help="Number of repos")
+    parser.add_argument("--min-stars", type=int, default=100, help="Minimum stars")
+    parser.add_argument("--top", type=int, default=5, help="Top N repos")
+    parser.add_argument("--fixture", help="Local search/repositories JSON instead of gh CLI")
+    parser.add_argument("--artifacts-dir", help="Also write repos.json / scored.json here")
+    parser.add_argument("--output", help="Output file path")
+    parser.add_argument("--table", action="store_true", help="Print as table")
+    parser.add_argument("--detail", action="store_true", help="Show score details")
+    parser.add_argument("--summary", default=fetch_trending.SUMMARY_PATH_DEFAULT, help="summary.md path")
+    parser.add_argument("--summary-dir", help="Partitioned summary directory (overrides --summary)")
+    parser.add_argument("--recent-months", type=int, default=0,
+                        help="Only exclude repos seen in the recent N months (with --summary-dir)")
+    parser.add_argument("--model", help="Model name for summary.md update")
+    parser.add_argument("--update-summary", action="store_true", help="Update summary.md")
+    add_instrument_arguments(parser)
+
+    args = parser.parse_args()
+
+    if args.update_summary and not args.model:
+        print("--model is required when --update-summary is set", file=sys.stderr)
+        sys.exit(1)
+
+    timings = StageTimings()
+    try:
+        with profiled(args.profile):
+            run(args, timings)
+    finally:
+        timings.print_report()
+        if args.timing_report:
+            timings.write_report(args.timing_report, {
+                "script": "radar_pipeline",
+                "window": args.window,
+                "domain": args.domain,
+            })
+
+
+def run(args, timings: StageTimings) -> None:
+    try:
+        output = run_pipeline(
+            window=args.window,
+            domain=args.domain,
+            limit=args.limit,
+            min_stars=args.min_stars,
+            top=args.top,
+            summary_path=args.summary,
+            summary_dir=args.summary_dir,
+            recent_months=args.recent_months,
+            fixture=args.fixture,
+            artifacts_dir=args.artifacts_dir,
+            model=args.model,
+            update_summary=args.update_summary,
+            timings=timings,
+        )
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    with timings.stage("output"):
+        if args.table:
+            score_repos.print_table(output["repos"], args.detail)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
+            print(f"Saved to {args.output}", file=sys.stderr)
+        elif not args.table:
+            print(json.dumps(output, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
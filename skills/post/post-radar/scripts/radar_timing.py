@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+趋势雷达脚本的耗时统计与性能剖析
+
+- StageTimings: 以上下文管理器 / 生成器包装记录各阶段耗时, 可输出 JSON 报告
+- profiled: 在 cProfile 下运行一段代码并保存 .pstats 文件
+
+用法 (各脚本通用参数):
+    --timing-report=timings.json   输出各阶段耗时 JSON
+    --profile=run.pstats           在 cProfile 下运行并保存结果
+"""
+
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+
+class StageTimings:
+    """记录各阶段耗时; 生成器阶段按独占时间统计 (扣除上游耗时)"""
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self._inclusive: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def wrap(self, name: str, items: Iterable, upstream: Optional[str] = None) -> Iterator:
+        """包装生成器阶段, 拉取每个元素的耗时计入该阶段"""
+        self._inclusive.setdefault(name, 0.0)
+        self.stages.setdefault(name, 0.0)
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            upstream_before = self._inclusive.get(upstream, 0.0) if upstream else 0.0
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._account(name, upstream, start, upstream_before)
+                return
+            self._account(name, upstream, start, upstream_before)
+            yield item
+
+    def _account(self, name: str, upstream: Optional[str], start: float, upstream_before: float) -> None:
+        elapsed = time.perf_counter() - start
+        upstream_elapsed = (self._inclusive.get(upstream, 0.0) - upstream_before) if upstream else 0.0
+        self._inclusive[name] += elapsed
+        self.stages[name] += elapsed - upstream_elapsed
+
+    def report(self) -> dict:
+        return {name: round(seconds, 6) for name, seconds in self.stages.items()}
+
+    def print_report(self) -> None:
+        total = sum(self.stages.values())
+        print("\nStage timings:", file=sys.stderr)
+        for name, seconds in self.stages.items():
+            print(f"  {name:<16} {seconds * 1000:>10.2f} ms", file=sys.stderr)
+        print(f"  {'total':<16} {total * 1000:>10.2f} ms", file=sys.stderr)
+
+    def write_report(self, path: str, meta: Optional[dict] = None) -> None:
+        """输出 JSON 耗时报告 (单位: 秒)"""
+        report = {
+            "meta": {
+                **(meta or {}),
+                "generated_at": datetime.now().isoformat(),
+            },
+            "stages": self.report(),
+            "total": round(sum(self.stages.values()), 6),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Timing report saved to {path}", file=sys.stderr)
+
+
+@contextmanager
+def profiled(pstats_path: Optional[str]) -> Iterator[None]:
+    """pstats_path 非空时在 cProfile 下运行, 退出 (含 sys.exit) 时保存统计结果"""
+    if not pstats_path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(pstats_path)
+        print(f"Profile saved to {pstats_path}", file=sys.stderr)
+
+
+def add_instrument_arguments(parser) -> None:
+    parser.add_argument("--timing-report", help="Write per-stage timings as JSON to this path")
+    parser.add_argument("--profile", help="Run under cProfile and save stats to this .pstats path")
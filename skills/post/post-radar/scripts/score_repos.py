@@ -12,16 +12,19 @@
     --top: 只输出 Top N
     --table: 打印表格
     --detail: 显示详细评分
+    --timing-report: 输出各阶段耗时 JSON
+    --profile: 在 cProfile 下运行并保存 .pstats 文件
 """
 
 import argparse
 import json
-import os
-import re
 import sys
 from datetime import datetime
 from typing import Optional
 
+from radar_timing import StageTimings, add_instrument_arguments, profiled
+from summary_store import insert_partition_row, insert_summary_row
+
 
 # 赛道权重 (来自 criteria.md)
 DOMAIN_WEIGHTS = {
@@ -55,9 +58,6 @@ NEGATIVE_SIGNALS = {
 }
 
 SUMMARY_PATH_DEFAULT = "/Users/sggmico/course/101/post/github-trend/summary.md"
-SUMMARY_TABLE_HEADER = "| 日期  | 模型 | 1 | 2 | 3 | 4 | 5 |"
-SUMMARY_TABLE_ALIGN = "| :-- | :-- | :-- | :-- | :-- | :-- | :-- |"
-SUMMARY_ROW_PATTERN = re.compile(r"^\|\s*(\d{1,2})\s*\|")
 
 
 def calculate_heat_score(repo: dict) -> float:
@@ -335,32 +335,6 @@ def build_summary_row(day: int, model: str, repos: list) -> str:
     return f"| {day:<2}  | `{model}` | " + " | ".join(cells) + " |"
 
 
-def ensure_month_section(lines: list[str], month_title: str) -> int:
-    for i, line in enumerate(lines):
-        if line.strip() == month_title:
-            return i
-    lines.append("")
-    lines.append(month_title)
-    lines.append("")
-    return len(lines) - 2
-
-
-def find_or_create_table(lines: list[str], start_index: int) -> int:
-    for i in range(start_index, len(lines)):
-        if lines[i].strip().startswith("| 日期"):
-            return i
-        if lines[i].startswith("## ") and i != start_index:
-            break
-
-    insert_at = start_index + 1
-    if insert_at < len(lines) and lines[insert_at].strip() != "":
-        lines.insert(insert_at, "")
-        insert_at += 1
-    lines.insert(insert_at, SUMMARY_TABLE_HEADER)
-    lines.insert(insert_at + 1, SUMMARY_TABLE_ALIGN)
-    return insert_at
-
-
 def update_summary_table(summary_path: str, model: str, repos: list, today: Optional[str] = None) -> None:
     if today:
         date_obj = datetime.strptime(today, "%Y-%m-%d")
@@ -369,47 +343,20 @@ def update_summary_table(summary_path: str, model: str, repos: list, today: Opti
 
     month_title = f"## {date_obj.month}月"
     day = date_obj.day
-
-    if os.path.exists(summary_path):
-        with open(summary_path, "r", encoding="utf-8") as f:
-            lines = f.read().splitlines()
-    else:
-        lines = [
-            "> 汇总规则如下：",
-            "> 1. 以月份为二级标题维度",
-            "> 2. 每个月份包含按天（使用的模型）为纵轴，以分析结果的仓库为横轴的表格",
-            "> 3. 表格日期采用倒序：最新日期排在表格的前面",
-            "",
-        ]
-
-    month_index = ensure_month_section(lines, month_title)
-    table_index = find_or_create_table(lines, month_index)
-
-    insert_at = table_index + 2
     row_text = build_summary_row(day, model, repos)
 
-    for i in range(insert_at, len(lines)):
-        line = lines[i]
-        if line.startswith("## "):
-            lines.insert(i, row_text)
-            break
-        if not line.startswith("|"):
-            continue
-        match = SUMMARY_ROW_PATTERN.match(line)
-        if not match:
-            continue
-        existing_day = int(match.group(1))
-        if existing_day == day:
-            lines.insert(i, row_text)
-            break
-        if existing_day < day:
-            lines.insert(i, row_text)
-            break
+    insert_summary_row(summary_path, month_title, day, row_text)
+
+
+def update_summary_partition(summary_dir: str, model: str, repos: list, today: Optional[str] = None) -> str:
+    """按年月分区写入 summary, 只触及当月分区与索引"""
+    if today:
+        date_obj = datetime.strptime(today, "%Y-%m-%d")
     else:
-        lines.append(row_text)
+        date_obj = datetime.now()
 
-    with open(summary_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines).rstrip() + "\n")
+    row_text = build_summary_row(date_obj.day, model, repos)
+    return insert_partition_row(summary_dir, date_obj, row_text)
 
 
 def main():
@@ -420,15 +367,29 @@ def main():
     parser.add_argument("--table", action="store_true", help="Print as table")
     parser.add_argument("--detail", action="store_true", help="Show score details")
     parser.add_argument("--summary", default=SUMMARY_PATH_DEFAULT, help="summary.md path")
+    parser.add_argument("--summary-dir", help="Partitioned summary directory (overrides --summary)")
     parser.add_argument("--model", help="Model name for summary.md update")
     parser.add_argument("--update-summary", action="store_true", help="Update summary.md")
 
+    add_instrument_arguments(parser)
+
     args = parser.parse_args()
 
+    timings = StageTimings()
+    try:
+        with profiled(args.profile):
+            run(args, timings)
+    finally:
+        if args.timing_report:
+            timings.write_report(args.timing_report, {"script": "score_repos", "input": args.input})
+
+
+def run(args, timings: StageTimings) -> None:
     # 读取输入
     try:
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with timings.stage("load"):
+            with open(args.input, "r", encoding="utf-8") as f:
+                data = json.load(f)
     except FileNotFoundError:
         print(f"File not found: {args.input}", file=sys.stderr)
         sys.exit(1)
@@ -446,29 +407,35 @@ def main():
     print(f"Scoring {len(repos)} repos...", file=sys.stderr)
 
     # 评分
-    scored = score_repos(repos)
+    with timings.stage("score"):
+        scored = score_repos(repos)
 
     # 截取 Top N
     top_repos = scored[:args.top]
 
     # 输出
-    if args.table:
-        print_table(top_repos, args.detail)
+    with timings.stage("output"):
+        if args.table:
+            print_table(top_repos, args.detail)
 
-    output = format_output(top_repos, meta)
+        output = format_output(top_repos, meta)
 
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-        print(f"Saved to {args.output}", file=sys.stderr)
-    elif not args.table:
-        print(json.dumps(output, ensure_ascii=False, indent=2))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
+            print(f"Saved to {args.output}", file=sys.stderr)
+        elif not args.table:
+            print(json.dumps(output, ensure_ascii=False, indent=2))
 
     if args.update_summary:
         if not args.model:
             print("--model is required when --update-summary is set", file=sys.stderr)
             sys.exit(1)
-        update_summary_table(args.summary, args.model, top_repos)
+        with timings.stage("summary_update"):
+            if args.summary_dir:
+                update_summary_partition(args.summary_dir, args.model, top_repos)
+            else:
+                update_summary_table(args.summary, args.model, top_repos)
 
 
 if __name__ == "__main__":
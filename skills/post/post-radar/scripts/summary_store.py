@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+summary.md 结构化读写
+
+解析一次 summary.md, 建立月份章节与表格行的索引, 插入新行时只拼接受影响的区域:
+- 插入点位于文件末尾 (新月份 / 表格末行) 时直接追加写入
+- 其余情况通过同目录临时文件 + rename 原子替换
+
+所有写入都在文件锁内完成, 多个模型同日并发写入同一个 summary.md 时不会互相覆盖.
+
+分区存储:
+    summary 目录下每个自然月一个分区文件 ({year}-{month:02d}.md), 另有 index.json
+    记录每月出现过的仓库. 每日写入只涉及当月分区与索引, 合并视图按需渲染.
+
+用法:
+    python3 summary_store.py render --dir=summary.d --output=summary.md
+    python3 summary_store.py import --summary=summary.md --dir=summary.d --year=2026
+    python3 summary_store.py reindex --dir=summary.d
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+# 文件锁与原子写入使用 fs-common 技能的实现 (扁平化安装时为同级目录, 仓库布局下位于 skills/fs/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+for _candidate in (
+    os.path.join(SCRIPT_DIR, "..", "..", "fs-common", "scripts"),
+    os.path.join(SCRIPT_DIR, "..", "..", "..", "fs", "fs-common", "scripts"),
+):
+    if os.path.isdir(_candidate):
+        sys.path.insert(0, os.path.abspath(_candidate))
+        break
+from fs_common import file_lock, write_atomic  # noqa: E402
+
+
+SUMMARY_TABLE_HEADER = "| 日期  | 模型 | 1 | 2 | 3 | 4 | 5 |"
+SUMMARY_TABLE_ALIGN = "| :-- | :-- | :-- | :-- | :-- | :-- | :-- |"
+SUMMARY_ROW_PATTERN = re.compile(r"^\|\s*(\d{1,2})\s*\|")
+SUMMARY_REPO_PATTERN = re.compile(
+    r"https?://github\.com/([^/\s]+)/([^\)\s]+)",
+    re.IGNORECASE,
+)
+PARTITION_PATTERN = re.compile(r"^(\d{4})-(\d{2})\.md$")
+MONTH_TITLE_PATTERN = re.compile(r"^##\s+(?:(\d{4})年)?(\d{1,2})月\s*$")
+INDEX_FILE = "index.json"
+SUMMARY_PREAMBLE = [
+    "> 汇总规则如下：",
+    "> 1. 以月份为二级标题维度",
+    "> 2. 每个月份包含按天（使用的模型）为纵轴，以分析结果的仓库为横轴的表格",
+    "> 3. 表格日期采用倒序：最新日期排在表格的前面",
+    "",
+]
+
+
+class MonthSection:
+    """一个 `## {month}月` 章节在文档中的位置索引"""
+
+    def __init__(self, title: str, line: int):
+        self.title = title
+        self.line = line          # 标题所在行
+        self.end = line + 1       # 章节结束行 (不含)
+        self.table: Optional[int] = None  # 表头所在行
+        self.table_end: Optional[int] = None  # 表格最后一行之后的行号
+        self.rows: list[tuple[int, int]] = []  # (行号, 日期)
+
+
+class SummaryDocument:
+    """summary.md 的只读索引: 一次扫描得到全部章节与行偏移"""
+
+    def __init__(self, text: str):
+        if text and not text.endswith("\n"):
+            text += "\n"
+        self.text = text
+        self.lines = text.splitlines()
+        self.offsets: list[int] = []
+        self.sections: dict[str, MonthSection] = {}
+        self._index()
+
+    def _index(self) -> None:
+        offset = 0
+        current: Optional[MonthSection] = None
+        in_table = False
+
+        for i, line in enumerate(self.lines):
+            self.offsets.append(offset)
+            offset += len(line) + 1
+            stripped = line.strip()
+
+            if line.startswith("## "):
+                if current is not None:
+                    current.end = i
+                current = MonthSection(stripped, i)
+                # 同名章节只认第一个, 与旧实现保持一致
+                self.sections.setdefault(stripped, current)
+                in_table = False
+                continue
+
+            if current is None:
+                continue
+
+            if current.table is None and stripped.startswith("| 日期"):
+                current.table = i
+                current.table_end = i + 1
+                in_table = True
+                continue
+
+            if in_table:
+                if line.startswith("|"):
+                    current.table_end = i + 1
+                    match = SUMMARY_ROW_PATTERN.match(line)
+                    if match:
+                        current.rows.append((i, int(match.group(1))))
+                else:
+                    in_table = False
+
+        self.offsets.append(offset)
+        if current is not None:
+            current.end = len(self.lines)
+
+    def plan_insert(self, month_title: str, day: int, row_text: str) -> tuple[int, list[str]]:
+        """
+        计算插入位置, 返回 (插入行号, 待插入的行)
+
+        同一天不替换旧行, 新行插在第一个日期 <= day 的行之前, 保持倒序.
+        """
+        section = self.sections.get(month_title)
+        if section is None:
+            new_lines = [month_title, "", SUMMARY_TABLE_HEADER, SUMMARY_TABLE_ALIGN, row_text]
+            if self.lines:
+                new_lines.insert(0, "")
+            return len(self.lines), new_lines
+
+        if section.table is None:
+            insert_at = section.line + 1
+            new_lines = [SUMMARY_TABLE_HEADER, SUMMARY_TABLE_ALIGN, row_text]
+            if insert_at < len(self.lines) and self.lines[insert_at].strip() == "":
+                insert_at += 1
+            else:
+                new_lines.insert(0, "")
+            if insert_at < section.end and self.lines[insert_at].strip() != "":
+                new_lines.append("")
+            return insert_at, new_lines
+
+        for line_no, existing_day in section.rows:
+            if existing_day <= day:
+                return line_no, [row_text]
+
+        return section.table_end, [row_text]
+
+    def splice(self, line_no: int, new_lines: list[str]) -> str:
+        """在指定行前插入新行, 只拼接插入点前后两段文本"""
+        offset = self.offsets[min(line_no, len(self.lines))]
+        return self.text[:offset] + "".join(f"{line}\n" for line in new_lines) + self.text[offset:]
+
+
+def append_lines(path: str, new_lines: list[str], needs_newline: bool) -> None:
+    """插入点位于文件末尾时直接追加, 不重写已有内容"""
+    with open(path, "a", encoding="utf-8") as f:
+        if needs_newline:
+            f.write("\n")
+        f.write("".join(f"{line}\n" for line in new_lines))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def insert_summary_row(
+    summary_path: str,
+    month_title: str,
+    day: int,
+    row_text: str,
+    preamble: Optional[list[str]] = None,
+) -> None:
+    """在文件锁内把一行写入 summary.md 对应月份表格"""
+    directory = os.path.dirname(os.path.abspath(summary_path))
+    os.makedirs(directory, exist_ok=True)
+
+    if preamble is None:
+        preamble = SUMMARY_PREAMBLE
+
+    with file_lock(summary_path):
+        if os.path.exists(summary_path):
+            with open(summary_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            exists = True
+        else:
+            text = "".join(f"{line}\n" for line in preamble)
+            exists = False
+
+        doc = SummaryDocument(text)
+        line_no, new_lines = doc.plan_insert(month_title, day, row_text)
+
+        if exists and line_no >= len(doc.lines):
+            append_lines(summary_path, new_lines, needs_newline=bool(text) and not text.endswith("\n"))
+        else:
+            write_atomic(summary_path, doc.splice(line_no, new_lines))
+
+
+def extract_summary_repos(text: str) -> set[str]:
+    """提取文本中出现的 GitHub 仓库 (owner/repo, 小写)"""
+    repos = set()
+    for match in SUMMARY_REPO_PATTERN.finditer(text):
+        owner = match.group(1).strip().lower()
+        repo = match.group(2).strip().lower().rstrip("/")
+        if repo.endswith(".git"):
+            repo = repo[:-4]
+        if owner and repo:
+            repos.add(f"{owner}/{repo}")
+    return repos
+
+
+# ========== 分区存储 ==========
+
+def partition_key(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def partition_path(summary_dir: str, year: int, month: int) -> str:
+    return os.path.join(summary_dir, f"{partition_key(year, month)}.md")
+
+
+def list_partitions(summary_dir: str) -> list[tuple[int, int, str]]:
+    """按时间升序列出分区 (year, month, path)"""
+    if not os.path.isdir(summary_dir):
+        return []
+
+    partitions = []
+    for filename in os.listdir(summary_dir):
+        match = PARTITION_PATTERN.match(filename)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions.append((year, month, os.path.join(summary_dir, filename)))
+    partitions.sort()
+    return partitions
+
+
+def load_index(summary_dir: str) -> dict:
+    """读取分区索引, 缺失或损坏时从分区重建"""
+    index_path = os.path.join(summary_dir, INDEX_FILE)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if isinstance(index.get("months"), dict):
+            return index
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        pass
+    return rebuild_index(summary_dir)
+
+
+def rebuild_index(summary_dir: str) -> dict:
+    """全量扫描分区重建索引 (仅在索引缺失/损坏或手动 reindex 时使用)"""
+    months = {}
+    for year, month, path in list_partitions(summary_dir):
+        with open(path, "r", encoding="utf-8") as f:
+            months[partition_key(year, month)] = sorted(extract_summary_repos(f.read()))
+
+    index = {"version": 1, "months": months}
+    if os.path.isdir(summary_dir):
+        write_atomic(os.path.join(summary_dir, INDEX_FILE), json.dumps(index, ensure_ascii=False) + "\n")
+    return index
+
+
+def add_to_index(summary_dir: str, key: str, repos: Iterable[str]) -> None:
+    """把新写入的仓库合并进当月索引"""
+    index_path = os.path.join(summary_dir, INDEX_FILE)
+    with file_lock(index_path):
+        index = load_index(summary_dir)
+        merged = set(index["months"].get(key, []))
+        merged.update(repos)
+        index["months"][key] = sorted(merged)
+        write_atomic(index_path, json.dumps(index, ensure_ascii=False) + "\n")
+
+
+def insert_partition_row(summary_dir: str, date_obj: datetime, row_text: str) -> str:
+    """把一行写入当月分区并更新索引, 返回分区路径"""
+    path = partition_path(summary_dir, date_obj.year, date_obj.month)
+    insert_summary_row(path, f"## {date_obj.month}月", date_obj.day, row_text, preamble=[])
+    add_to_index(summary_dir, partition_key(date_obj.year, date_obj.month), extract_summary_repos(row_text))
+    return path
+
+
+def load_recent_repo_set(summary_dir: str, recent_months: int = 0, today: Optional[datetime] = None) -> set[str]:
+    """
+    从索引读取最近 N 个月 (含当月) 出现过的仓库
+
+    recent_months <= 0 时返回全部历史.
+    """
+    months = load_index(summary_dir)["months"]
+    if recent_months > 0:
+        today = today or datetime.now()
+        total = today.year * 12 + today.month - recent_months
+        cutoff = partition_key(total // 12, total % 12 + 1)
+        keys = [key for key in months if key >= cutoff]
+    else:
+        keys = list(months)
+
+    repos = set()
+    for key in keys:
+        repos.update(months[key])
+    return repos
+
+
+def render_summary(summary_dir: str) -> Iterator[str]:
+    """按时间顺序逐行生成合并视图, 月份标题带上年份以区分不同年份的同一月"""
+    yield from SUMMARY_PREAMBLE
+    for year, month, path in list_partitions(summary_dir):
+        yield ""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if MONTH_TITLE_PATTERN.match(line):
+                    line = f"## {year}年{month}月"
+                yield line
+
+
+def write_rendered_summary(summary_dir: str, output_path: str) -> None:
+    content = "\n".join(render_summary(summary_dir)).rstrip() + "\n"
+    with file_lock(output_path):
+        write_atomic(output_path, re.sub(r"\n{3,}", "\n\n", content))
+
+
+def import_legacy_summary(summary_path: str, summary_dir: str, year: int) -> list[str]:
+    """
+    把单文件 summary.md 拆分为分区
+
+    旧格式的 `## {month}月` 标题没有年份, 由 year 指定; 已带年份的 `## {year}年{month}月` 保持原年份.
+    已存在的分区不会被覆盖.
+    """
+    with open(summary_path, "r", encoding="utf-8") as f:
+        doc = SummaryDocument(f.read())
+
+    os.makedirs(summary_dir, exist_ok=True)
+    written = []
+    for section in sorted(doc.sections.values(), key=lambda s: s.line):
+        match = MONTH_TITLE_PATTERN.match(section.title)
+        if not match:
+            continue
+        section_year = int(match.group(1)) if match.group(1) else year
+        month = int(match.group(2))
+        path = partition_path(summary_dir, section_year, month)
+        if os.path.exists(path):
+            continue
+
+        body = doc.lines[section.line + 1:section.end]
+        lines = [f"## {month}月"] + body
+        write_atomic(path, "\n".join(lines).rstrip() + "\n")
+        written.append(path)
+
+    rebuild_index(summary_dir)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitioned summary.md storage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = subparsers.add_parser("render", help="Render merged summary.md")
+    render_parser.add_argument("--dir", required=True, help="Partition directory")
+    render_parser.add_argument("--output", help="Output path (default: stdout)")
+
+    import_parser = subparsers.add_parser("import", help="Split legacy summary.md into partitions")
+    import_parser.add_argument("--summary", required=True, help="Legacy summary.md path")
+    import_parser.add_argument("--dir", required=True, help="Partition directory")
+    import_parser.add_argument("--year", type=int, default=datetime.now().year,
+                               help="Year for month titles without year")
+
+    reindex_parser = subparsers.add_parser("reindex", help="Rebuild index.json")
+    reindex_parser.add_argument("--dir", required=True, help="Partition directory")
+
+    args = parser.parse_args()
+
+    if args.command == "render":
+        if args.output:
+            write_rendered_summary(args.dir, args.output)
+            print(f"Saved to {args.output}", file=sys.stderr)
+        else:
+            for line in render_summary(args.dir):
+                print(line)
+    elif args.command == "import":
+        written = import_legacy_summary(args.summary, args.dir, args.year)
+        print(f"Imported {len(written)} partitions into {args.dir}", file=sys.stderr)
+    elif args.command == "reindex":
+        index = rebuild_index(args.dir)
+        print(f"Indexed {len(index['months'])} partitions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
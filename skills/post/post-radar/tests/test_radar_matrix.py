@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import radar_matrix  # noqa: E402
+
+
+def make_item(name, days_ago, description, topics):
+    pushed = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "full_name": f"foo/{name}",
+        "name": name,
+        "owner": {"login": "foo"},
+        "html_url": f"https://github.com/foo/{name}",
+        "description": description,
+        "stargazers_count": 1000,
+        "forks_count": 100,
+        "open_issues_count": 10,
+        "language": "",
+        "license": {"spdx_id": "MIT"},
+        "topics": topics,
+        "pushed_at": pushed,
+    }
+
+
+class RadarMatrixTests(unittest.TestCase):
+    def test_plan_uses_widest_window_once_per_domain(self):
+        plan = radar_matrix.plan_matrix_queries(["past_week", "past_3_months"], ["ai", "tools", "all"])
+        self.assertEqual([entry["domain"] for entry in plan], ["ai", "tools", "all"])
+        self.assertTrue(all(entry["window"] == "past_3_months" for entry in plan))
+
+        derived = radar_matrix.plan_matrix_queries(["past_week"], ["ai", "tools"], derive_domains=True)
+        self.assertEqual(len(derived), 1)
+        self.assertEqual(derived[0]["domain"], "all")
+
+    def test_derive_windows_and_domains_from_shared_pool(self):
+        items = [
+            make_item("fresh-agent", 2, "llm agent toolkit", ["llm", "agent"]),
+            make_item("old-agent", 60, "llm agent runtime", ["llm", "agent"]),
+            make_item("fresh-cli", 3, "terminal cli productivity", ["cli", "terminal"]),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fixture = os.path.join(tmp_dir, "search.json")
+            with open(fixture, "w", encoding="utf-8") as f:
+                json.dump({"items": items}, f)
+
+            matrix = radar_matrix.run_matrix(
+                ["past_week", "past_3_months"],
+                ["ai", "tools"],
+                derive_domains=True,
+                summary_path=os.path.join(tmp_dir, "missing.md"),
+                fixture=fixture,
+            )
+
+        def names(cell):
+            return [repo["name"] for repo in matrix["reports"][cell]["repos"]]
+
+        self.assertEqual(len(matrix["meta"]["queries"]), 1)
+        self.assertEqual(matrix["meta"]["cells"], 4)
+        self.assertEqual(names("past_week/ai"), ["fresh-agent"])
+        self.assertEqual(sorted(names("past_3_months/ai")), ["fresh-agent", "old-agent"])
+        self.assertEqual(names("past_week/tools"), ["fresh-cli"])
+
+
+if __name__ == "__main__":
+    unittest.main()
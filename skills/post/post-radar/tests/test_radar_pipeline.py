@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import radar_pipeline  # noqa: E402
+
+
+def make_item(owner, name, stars, description="", topics=None):
+    return {
+        "full_name": f"{owner}/{name}",
+        "name": name,
+        "owner": {"login": owner},
+        "html_url": f"https://github.com/{owner}/{name}",
+        "description": description,
+        "stargazers_count": stars,
+        "forks_count": stars // 10,
+        "open_issues_count": 10,
+        "language": "Python",
+        "license": {"spdx_id": "MIT"},
+        "topics": topics or [],
+        "pushed_at": "2026-01-29T00:00:00Z",
+    }
+
+
+class RadarPipelineTests(unittest.TestCase):
+    def test_pipeline_filters_scores_and_updates_summary_offline(self):
+        items = [
+            make_item("foo", "agent-kit", 5000, "An LLM agent framework, a faster alternative", ["llm", "agent"]),
+            make_item("seen", "repo", 9000, "Already in summary"),
+            make_item("bar", "cli-tool", 800, "Terminal productivity cli", ["cli"]),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fixture = os.path.join(tmp_dir, "search.json")
+            with open(fixture, "w", encoding="utf-8") as f:
+                json.dump({"items": items}, f)
+
+            summary_path = os.path.join(tmp_dir, "summary.md")
+            with open(summary_path, "w", encoding="utf-8") as f:
+                f.write("| 1 | [repo](https://github.com/seen/repo) |\n")
+
+            artifacts_dir = os.path.join(tmp_dir, "artifacts")
+            timings = radar_pipeline.StageTimings()
+            output = radar_pipeline.run_pipeline(
+                fixture=fixture,
+                summary_path=summary_path,
+                artifacts_dir=artifacts_dir,
+                model="gpt-5",
+                update_summary=True,
+                today="2026-01-30",
+                timings=timings,
+            )
+
+            with open(summary_path, "r", encoding="utf-8") as f:
+                summary = f.read()
+            artifacts = sorted(os.listdir(artifacts_dir))
+
+        names = [repo["full_name"] for repo in output["repos"]]
+        self.assertEqual(names, ["foo/agent-kit", "bar/cli-tool"])
+        self.assertEqual(output["meta"]["count"], 2)
+        self.assertIn("| 30  | `gpt-5` | [agent-kit](https://github.com/foo/agent-kit)", summary)
+        self.assertEqual(artifacts, ["repos.json", "scored.json"])
+        for stage in ("fetch", "summary_load", "filter", "process", "rank", "score", "summary_update"):
+            self.assertIn(stage, timings.report())
+
+    def test_pipeline_raises_when_fetch_fails(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(RuntimeError):
+                radar_pipeline.run_pipeline(fixture=os.path.join(tmp_dir, "missing.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
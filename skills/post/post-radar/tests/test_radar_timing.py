@@ -0,0 +1,53 @@
+import json
+import os
+import pstats
+import sys
+import tempfile
+import time
+import unittest
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import radar_timing  # noqa: E402
+
+
+def slow_source(count, delay):
+    for i in range(count):
+        time.sleep(delay)
+        yield i
+
+
+class RadarTimingTests(unittest.TestCase):
+    def test_wrapped_stage_excludes_upstream_time(self):
+        timings = radar_timing.StageTimings()
+        source = timings.wrap("source", slow_source(5, 0.01))
+        downstream = timings.wrap("downstream", (i * 2 for i in source), upstream="source")
+
+        self.assertEqual(list(downstream), [0, 2, 4, 6, 8])
+        report = timings.report()
+        self.assertGreaterEqual(report["source"], 0.04)
+        self.assertLess(report["downstream"], 0.02)
+
+    def test_write_report_and_profile(self):
+        timings = radar_timing.StageTimings()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_path = os.path.join(tmp_dir, "timings.json")
+            pstats_path = os.path.join(tmp_dir, "run.pstats")
+
+            with radar_timing.profiled(pstats_path):
+                with timings.stage("work"):
+                    sum(range(1000))
+            timings.write_report(report_path, {"script": "test"})
+
+            with open(report_path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+            stats = pstats.Stats(pstats_path)
+
+        self.assertEqual(report["meta"]["script"], "test")
+        self.assertIn("work", report["stages"])
+        self.assertGreater(stats.total_calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
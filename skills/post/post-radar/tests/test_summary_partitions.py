@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from datetime import datetime
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import score_repos  # noqa: E402
+import summary_store  # noqa: E402
+
+
+class SummaryPartitionTests(unittest.TestCase):
+    def test_same_month_of_different_years_do_not_collide(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            score_repos.update_summary_partition(
+                tmp_dir, "m", [{"name": "old", "url": "https://github.com/foo/old"}], today="2025-01-10"
+            )
+            score_repos.update_summary_partition(
+                tmp_dir, "m", [{"name": "new", "url": "https://github.com/foo/new"}], today="2026-01-10"
+            )
+
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "2025-01.md")))
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "2026-01.md")))
+
+            rendered = "\n".join(summary_store.render_summary(tmp_dir))
+
+        self.assertIn("## 2025年1月", rendered)
+        self.assertIn("## 2026年1月", rendered)
+        self.assertLess(rendered.index("## 2025年1月"), rendered.index("## 2026年1月"))
+        self.assertLess(rendered.index("[old]"), rendered.index("## 2026年1月"))
+
+    def test_recent_months_only_reads_recent_partitions(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            score_repos.update_summary_partition(
+                tmp_dir, "m", [{"name": "old", "url": "https://github.com/foo/old"}], today="2025-06-10"
+            )
+            score_repos.update_summary_partition(
+                tmp_dir, "m", [{"name": "new", "url": "https://github.com/foo/new"}], today="2026-01-10"
+            )
+
+            recent = summary_store.load_recent_repo_set(tmp_dir, 2, today=datetime(2026, 2, 1))
+            everything = summary_store.load_recent_repo_set(tmp_dir)
+
+            os.remove(os.path.join(tmp_dir, summary_store.INDEX_FILE))
+            rebuilt = summary_store.load_recent_repo_set(tmp_dir)
+
+        self.assertEqual(recent, {"foo/new"})
+        self.assertEqual(everything, {"foo/old", "foo/new"})
+        self.assertEqual(rebuilt, everything)
+
+    def test_import_legacy_summary(self):
+        content = textwrap.dedent(
+            """
+            > 汇总规则如下：
+
+            ## 1月
+
+            | 日期  | 模型 | 1 | 2 | 3 | 4 | 5 |
+            | :-- | :-- | :-- | :-- | :-- | :-- | :-- |
+            | 29  | `gpt-5` | [ocrbase](https://github.com/majcheradam/ocrbase) |  |  |  |  |
+
+            ## 2月
+
+            | 日期  | 模型 | 1 | 2 | 3 | 4 | 5 |
+            | :-- | :-- | :-- | :-- | :-- | :-- | :-- |
+            | 1   | `gemini` | [gemini-cli](https://github.com/google-gemini/gemini-cli) |  |  |  |  |
+            """
+        ).strip()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            summary_path = os.path.join(tmp_dir, "summary.md")
+            summary_dir = os.path.join(tmp_dir, "summary.d")
+            with open(summary_path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            written = summary_store.import_legacy_summary(summary_path, summary_dir, 2026)
+            index = summary_store.load_index(summary_dir)
+
+        self.assertEqual([os.path.basename(p) for p in written], ["2026-01.md", "2026-02.md"])
+        self.assertEqual(index["months"]["2026-01"], ["majcheradam/ocrbase"])
+        self.assertEqual(index["months"]["2026-02"], ["google-gemini/gemini-cli"])
+
+
+if __name__ == "__main__":
+    unittest.main()
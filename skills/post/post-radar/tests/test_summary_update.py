@@ -2,12 +2,14 @@ import os
 import sys
 import tempfile
 import textwrap
+import threading
 import unittest
 
 SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
 sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
 
 import score_repos  # noqa: E402
+import summary_store  # noqa: E402
 
 
 class SummaryUpdateTests(unittest.TestCase):
@@ -85,6 +87,50 @@ class SummaryUpdateTests(unittest.TestCase):
         self.assertIn("| 30  | `gpt-5.2` | [repo-new](https://github.com/foo/repo-new)", updated)
         self.assertIn("| 30  | `gpt-5` | [old](https://github.com/foo/old)", updated)
 
+    def test_create_month_sections_as_well_formed_tables(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            summary_path = os.path.join(tmp_dir, "summary.md")
+
+            score_repos.update_summary_table(summary_path, "m1", [{"name": "a", "url": "u"}], today="2026-02-03")
+            score_repos.update_summary_table(summary_path, "m1", [{"name": "b", "url": "u"}], today="2026-03-03")
+            score_repos.update_summary_table(summary_path, "m1", [{"name": "c", "url": "u"}], today="2026-02-01")
+
+            with open(summary_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        feb = lines.index("## 2月")
+        self.assertEqual(lines[feb + 1], "")
+        self.assertEqual(lines[feb + 2], summary_store.SUMMARY_TABLE_HEADER)
+        self.assertTrue(lines[feb + 4].startswith("| 3   | `m1` | [a](u)"))
+        self.assertTrue(lines[feb + 5].startswith("| 1   | `m1` | [c](u)"))
+        self.assertEqual(lines[feb + 6], "")
+        self.assertEqual(lines[feb + 7], "## 3月")
+
+    def test_concurrent_updates_keep_every_row(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            summary_path = os.path.join(tmp_dir, "summary.md")
+
+            def worker(index):
+                score_repos.update_summary_table(
+                    summary_path,
+                    f"model-{index}",
+                    [{"name": f"repo-{index}", "url": "u"}],
+                    today=f"2026-01-{index % 28 + 1:02d}",
+                )
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            with open(summary_path, "r", encoding="utf-8") as f:
+                updated = f.read()
+
+        for i in range(20):
+            self.assertIn(f"`model-{i}`", updated)
+        self.assertEqual(updated.count("## 1月"), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,42 +1,70 @@
 #!/usr/bin/env python3
 import os
 import sys
-import json
 import shutil
 import argparse
+import glob
 import re
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-PUBLISHED_PATTERN = re.compile(r"^(\d{3})_.*\.md$")
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def use_fs_skill(name):
+    """
+    把 fs-* 技能的脚本目录加入 sys.path。
+
+    兼容仓库布局 (skills/fs/<name>) 与扁平化安装布局 (<skills_dir>/<name>)。
+    """
+    candidates = [
+        os.path.join(SCRIPT_DIR, "..", "..", name, "scripts"),
+        os.path.join(SCRIPT_DIR, "..", "..", "..", "fs", name, "scripts"),
+    ]
+    for candidate in candidates:
+        if os.path.isdir(candidate):
+            sys.path.insert(0, os.path.abspath(candidate))
+            return
+    print(f"错误: 未找到依赖技能 '{name}'，请一并安装 fs 系列技能。", file=sys.stderr)
+    sys.exit(1)
+
+
+use_fs_skill("fs-update")
+use_fs_skill("fs-next-id")
+from publish_map import content_fields, open_map  # noqa: E402
+from draft_meta import open_meta_cache  # noqa: E402
+from id_allocator import ID_PATTERN as PUBLISHED_PATTERN, IdAllocator  # noqa: E402
+
 HEADING_PATTERN = re.compile(r"^#\s+(.+)$")
+# slug 中保留的字符: 小写 ASCII 字母数字、下划线、中文 (基本区 + 扩展 A)；其余连续字符整体替换为一个连字符
+SLUG_INVALID_RUN = re.compile(r"[^0-9a-z_\u3400-\u4dbf\u4e00-\u9fff]+")
 
-def get_next_publish_id(publish_dir):
+
+class PublishError(Exception):
+    """单篇草稿无法发布 (批量模式下跳过该篇, 继续发布其余草稿)"""
+
+
+def scan_publish_ids(publish_dir):
     """
-    根据发布目录内已有文件的最大序号计算下一个发布 ID。
+    扫描一次发布目录，返回已占用的发布 ID 集合 (字符串形式)。仅用于校验手动指定的 ID。
     """
     if not os.path.isdir(publish_dir):
-        return "001"
+        return set()
 
-    max_id = 0
+    used = set()
     for filename in os.listdir(publish_dir):
         match = PUBLISHED_PATTERN.match(filename)
         if match:
-            current_id = int(match.group(1))
-            if current_id > max_id:
-                max_id = current_id
+            used.add(match.group(1))
+    return used
 
-    return f"{max_id + 1:03d}"
 
-def load_map(map_file):
-    map_data = {"mappings": []}
-    if os.path.exists(map_file):
-        with open(map_file, "r", encoding="utf-8") as f:
-            try:
-                map_data = json.load(f)
-            except json.JSONDecodeError:
-                pass
-    return map_data
+def get_next_publish_id(publish_dir):
+    """
+    从发布目录的持久化计数器 (fs-next-id) 分配下一个发布 ID，无需扫描目录。
+    """
+    return IdAllocator(publish_dir).allocate()[0]
 
 def extract_first_heading(draft_file, max_chars=2048):
     """
@@ -55,139 +83,225 @@ def extract_first_heading(draft_file, max_chars=2048):
 
 
 def slugify(value):
+    """
+    中文优先的 slug：保留中文与小写字母数字、下划线，空格/标点等连续片段替换为单个连字符。
+
+    以正则按片段整体替换，不逐字符判断。
+    """
     if not value:
         return None
     normalized = unicodedata.normalize("NFKC", value).strip().lower()
-
-    def is_chinese(ch):
-        return "\u4e00" <= ch <= "\u9fff" or "\u3400" <= ch <= "\u4dbf"
-
-    parts = []
-    for ch in normalized:
-        if is_chinese(ch):
-            parts.append(ch)
-        elif ch.isascii():
-            if ch.isalnum():
-                parts.append(ch)
-            elif ch in "-_":
-                parts.append(ch)
-            elif ch.isspace():
-                parts.append("-")
-            else:
-                parts.append("-")
-        else:
-            parts.append("-")
-
-    slug = re.sub(r"-+", "-", "".join(parts)).strip("-")
+    slug = SLUG_INVALID_RUN.sub("-", normalized).strip("-")
     return slug or None
 
 
-def find_existing_mapping(map_data, draft_file):
-    for mapping in map_data.get("mappings", []):
-        if mapping.get("draft") == draft_file:
-            return mapping
-    return None
+def heading_slug(draft_file, meta=None):
+    """
+    返回草稿一级标题生成的 slug (没有标题时为 None)。
 
-def publish_draft(draft_file, publish_dir, publish_id, map_file):
+    meta 为 DraftMetaCache 时，草稿 size/mtime 未变则直接复用缓存的标题与 slug。
     """
-    发布一篇草稿文章。
+    entry = meta.lookup(draft_file) if meta is not None else {}
+    if "slug" in entry:
+        return entry["slug"]
 
-    - 复制草稿文件到发布目录。
-    - 使用新的发布 ID 重命名文件。
-    - 更新 .publish-map.json 文件，记录映射关系。
+    heading = extract_first_heading(draft_file)
+    slug = slugify(heading)
+    if meta is not None:
+        meta.remember(draft_file, heading=heading, slug=slug)
+    return slug
+
+
+def prepare_publish(draft_file, store, meta=None):
+    """
+    校验草稿并生成发布文件名使用的 slug。失败时抛出 PublishError。
     """
     if not os.path.exists(draft_file):
-        print(f"错误: 未找到草稿文件 '{draft_file}'", file=sys.stderr)
-        sys.exit(1)
+        raise PublishError(f"未找到草稿文件 '{draft_file}'")
 
     # 从草稿文件名中提取标题部分 (例如 '001_the-title.md' -> 'the-title')
     draft_basename = os.path.basename(draft_file)
-    title_part_match = re.match(r"^\d{3}_(.*)\.md$", draft_basename)
+    title_part_match = re.match(r"^\d{3,}_(.*)\.md$", draft_basename)
     if not title_part_match:
-        print(f"错误: 草稿文件名 '{draft_basename}' 与预期模式 'XXX_title.md' 不匹配。", file=sys.stderr)
-        sys.exit(1)
+        raise PublishError(f"草稿文件名 '{draft_basename}' 与预期模式 'XXX_title.md' 不匹配。")
     title_part = title_part_match.group(1)
 
-    # 读取映射，防止重复发布同一草稿
-    map_data = load_map(map_file)
-    existing_mapping = find_existing_mapping(map_data, draft_file)
+    # 防止重复发布同一草稿
+    existing_mapping = store.get(draft_file)
     if existing_mapping:
-        print(
-            f"错误: 草稿已发布过，发布文件为 '{existing_mapping.get('published')}'",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-
-    # 计算发布 ID（若未提供）
-    publish_id = (publish_id or "").strip()
-    if not publish_id:
-        publish_id = get_next_publish_id(publish_dir)
-
-    # 若目标发布文件已存在，则阻止覆盖
-    if os.path.isdir(publish_dir):
-        for filename in os.listdir(publish_dir):
-            match = PUBLISHED_PATTERN.match(filename)
-            if match and match.group(1) == publish_id:
-                print(
-                    f"错误: 发布 ID '{publish_id}' 已存在，请使用其他 ID。",
-                    file=sys.stderr,
-                )
-                sys.exit(1)
+        raise PublishError(f"草稿已发布过，发布文件为 '{existing_mapping.get('published')}'")
 
     # 基于文章标题(优先)构建 slug
-    heading = extract_first_heading(draft_file)
-    slug_candidate = slugify(heading) or slugify(title_part) or title_part
+    slug_candidate = heading_slug(draft_file, meta) or slugify(title_part) or title_part
     if not slug_candidate:
-        print("错误: 无法从草稿文件名或内容中生成合法标题", file=sys.stderr)
-        sys.exit(1)
+        raise PublishError("无法从草稿文件名或内容中生成合法标题")
 
-    # 构建新的发布文件名和路径
-    published_filename = f"{publish_id}_{slug_candidate}.md"
-    published_filepath = os.path.join(publish_dir, published_filename)
+    return slug_candidate
 
-    # 1. 复制并重命名文件
-    try:
-        os.makedirs(publish_dir, exist_ok=True)
-        shutil.copyfile(draft_file, published_filepath)
-    except IOError as e:
-        print(f"复制文件时出错: {e}", file=sys.stderr)
-        sys.exit(1)
 
-    # 2. 更新映射文件
-    # 创建新的映射条目
-    now_utc = datetime.now(timezone.utc).isoformat()
-    new_mapping = {
-        "draft": draft_file,
-        "published": published_filepath,
-        "published_at": now_utc,
-        "updated_at": now_utc
-    }
-    
-    map_data["mappings"].append(new_mapping)
-    
-    try:
-        with open(map_file, "w", encoding="utf-8") as f:
-            json.dump(map_data, f, indent=2, ensure_ascii=False)
-    except IOError as e:
-        print(f"写入映射文件时出错: {e}", file=sys.stderr)
-        sys.exit(1)
+def publish_draft(draft_file, publish_dir, publish_id, map_file):
+    """
+    发布一篇草稿文章。
+
+    - 复制草稿文件到发布目录。
+    - 使用新的发布 ID 重命名文件。
+    - 更新 .publish-map.json 文件，记录映射关系 (按规范化绝对路径索引)。
+    """
+    # 在文件锁内读取映射，防止重复发布同一草稿
+    with open_map(map_file) as store, open_meta_cache() as meta:
+        try:
+            slug_candidate = prepare_publish(draft_file, store, meta)
+        except PublishError as e:
+            print(f"错误: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        publish_id = (publish_id or "").strip()
+        if publish_id:
+            # 手动指定的 ID：扫描一次发布目录阻止覆盖，并登记到计数器
+            if publish_id in scan_publish_ids(publish_dir):
+                print(f"错误: 发布 ID '{publish_id}' 已存在，请使用其他 ID。", file=sys.stderr)
+                sys.exit(1)
+            IdAllocator(publish_dir).reserve(publish_id)
+        else:
+            # 未提供时由计数器在文件锁内分配，不会与并发发布冲突
+            publish_id = get_next_publish_id(publish_dir)
+
+        # 构建新的发布文件名和路径
+        published_filename = f"{publish_id}_{slug_candidate}.md"
+        published_filepath = os.path.join(publish_dir, published_filename)
+
+        # 1. 复制并重命名文件
+        try:
+            os.makedirs(publish_dir, exist_ok=True)
+            fields = meta.content_fields(draft_file)
+            shutil.copyfile(draft_file, published_filepath)
+        except IOError as e:
+            print(f"复制文件时出错: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        # 2. 记录映射 (含内容哈希，供 fs-update 变更检测)，退出 open_map 时原子写回
+        now_utc = datetime.now(timezone.utc).isoformat()
+        store.add(draft_file, published_filepath, now_utc, **fields)
 
     # 打印新发布的文章路径
     print(published_filepath)
 
 
+def expand_drafts(patterns):
+    """展开路径与 glob 模式，去重并按文件名排序，保证 ID 按草稿顺序分配"""
+    drafts = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                drafts.append(path)
+    return sorted(drafts, key=draft_sort_key)
+
+
+def draft_sort_key(path):
+    """按序号数值排序 (1000_ 排在 999_ 之后)，其次按文件名"""
+    basename = os.path.basename(path)
+    match = re.match(r"^(\d+)_", basename)
+    return (int(match.group(1)) if match else float("inf"), basename, path)
+
+
+def _copy_one(job):
+    draft_file, published_filepath, cached_digest = job
+    try:
+        fields = content_fields(draft_file, cached_digest)
+        shutil.copyfile(draft_file, published_filepath)
+        return fields, None
+    except (IOError, shutil.SameFileError) as e:
+        return None, str(e)
+
+
+def publish_drafts(draft_files, publish_dir, map_file, workers=8):
+    """
+    批量发布多篇草稿。
+
+    - 从发布目录的计数器一次性连续分配全部 ID。
+    - 并发复制文件。
+    - 所有新映射在一次原子写入中提交。
+
+    返回 (成功列表 [(草稿, 发布路径)], 失败列表 [(草稿, 原因)])。
+    """
+    published = []
+    failed = []
+
+    with open_map(map_file) as store, open_meta_cache() as meta:
+        prepared = []
+        for draft_file in draft_files:
+            try:
+                prepared.append((draft_file, prepare_publish(draft_file, store, meta)))
+            except PublishError as e:
+                failed.append((draft_file, str(e)))
+
+        jobs = []
+        if prepared:
+            publish_ids = IdAllocator(publish_dir).allocate(len(prepared))
+            for (draft_file, slug_candidate), publish_id in zip(prepared, publish_ids):
+                published_filepath = os.path.join(publish_dir, f"{publish_id}_{slug_candidate}.md")
+                jobs.append((draft_file, published_filepath, meta.lookup(draft_file).get("content_hash")))
+
+        if jobs:
+            os.makedirs(publish_dir, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                results = list(pool.map(_copy_one, jobs))
+
+            now_utc = datetime.now(timezone.utc).isoformat()
+            for (draft_file, published_filepath, _), (fields, error) in zip(jobs, results):
+                if error:
+                    failed.append((draft_file, f"复制文件时出错: {error}"))
+                    continue
+                meta.remember(draft_file, content_hash=fields["content_hash"])
+                store.add(draft_file, published_filepath, now_utc, **fields)
+                published.append((draft_file, published_filepath))
+
+    return published, failed
+
+
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="发布一篇草稿文章并更新发布映射。")
-    parser.add_argument("--draft-file", required=True, help="源草稿文件的完整路径。")
+    parser = argparse.ArgumentParser(description="发布草稿文章并更新发布映射。")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--draft-file", help="源草稿文件的完整路径。")
+    target.add_argument(
+        "--drafts",
+        nargs="+",
+        help="批量发布: 多个草稿路径或 glob 模式 (如 'docs/post/*.md')。",
+    )
     parser.add_argument("--publish-dir", required=True, help="发布的目标目录。")
     parser.add_argument(
         "--publish-id",
         default="",
-        help="用于发布文件的新三位数 ID。留空则自动使用发布目录内的下一个序号。",
+        help="用于发布文件的新 ID (至少三位数)。留空则由发布目录的计数器自动分配。仅单篇模式有效。",
     )
     parser.add_argument("--map-file", required=True, help="'.publish-map.json' 文件的路径。")
-    
+    parser.add_argument("--workers", type=int, default=8, help="批量模式下并发复制的线程数。")
+
     args = parser.parse_args()
-    
-    
-    publish_draft(args.draft_file, args.publish_dir, args.publish_id, args.map_file)
+
+    if args.draft_file:
+        publish_draft(args.draft_file, args.publish_dir, args.publish_id, args.map_file)
+        sys.exit(0)
+
+    if args.publish_id:
+        print("错误: --publish-id 不能与 --drafts 同时使用。", file=sys.stderr)
+        sys.exit(1)
+
+    drafts = expand_drafts(args.drafts)
+    if not drafts:
+        print("错误: 没有匹配的草稿文件。", file=sys.stderr)
+        sys.exit(1)
+
+    published, failed = publish_drafts(drafts, args.publish_dir, args.map_file, args.workers)
+
+    for _, published_filepath in published:
+        print(published_filepath)
+    for draft_file, reason in failed:
+        print(f"错误: {draft_file}: {reason}", file=sys.stderr)
+
+    print(f"已发布 {len(published)} 篇，失败 {len(failed)} 篇。", file=sys.stderr)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import publish_draft  # noqa: E402
+from publish_map import PublishMap  # noqa: E402
+
+
+class PublishBatchTests(unittest.TestCase):
+    def test_batch_allocates_consecutive_ids_and_commits_once(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch.dict(os.environ, {"FLOWAI_CACHE_DIR": os.path.join(tmp_dir, "cache")}):
+            draft_dir = os.path.join(tmp_dir, "drafts")
+            publish_dir = os.path.join(tmp_dir, "published")
+            map_file = os.path.join(tmp_dir, ".publish-map.json")
+            os.makedirs(draft_dir)
+            os.makedirs(publish_dir)
+            open(os.path.join(publish_dir, "004_existing.md"), "w").close()
+
+            for i in range(1, 4):
+                with open(os.path.join(draft_dir, f"00{i}_post-{i}.md"), "w", encoding="utf-8") as f:
+                    f.write(f"# Post {i}\n\nbody\n")
+
+            drafts = publish_draft.expand_drafts([os.path.join(draft_dir, "*.md")])
+            published, failed = publish_draft.publish_drafts(drafts, publish_dir, map_file)
+
+            names = sorted(n for n in os.listdir(publish_dir) if n.endswith(".md"))
+            store = PublishMap.load(map_file)
+
+            # 已发布的草稿再次批量发布时只报告失败
+            _, failed_again = publish_draft.publish_drafts(drafts[:1], publish_dir, map_file)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(len(published), 3)
+        self.assertEqual(names, ["004_existing.md", "005_post-1.md", "006_post-2.md", "007_post-3.md"])
+        self.assertEqual(len(store), 3)
+        self.assertTrue(store.get(drafts[2])["published"].endswith("007_post-3.md"))
+        self.assertEqual(len(failed_again), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import publish_draft  # noqa: E402
+from draft_meta import DraftMetaCache  # noqa: E402
+
+
+class PublishSlugTests(unittest.TestCase):
+    def test_slugify_keeps_chinese_and_collapses_runs(self):
+        cases = {
+            "Hello, World!": "hello-world",
+            "  深入理解 Python 3.12 —— 新特性  ": "深入理解-python-3-12-新特性",
+            "snake_case--and   spaces": "snake_case-and-spaces",
+            "ＡＢＣ１２３": "abc123",
+            "Café ☕ 指南": "caf-指南",
+            "!!!": None,
+            "": None,
+        }
+        for value, expected in cases.items():
+            self.assertEqual(publish_draft.slugify(value), expected, value)
+
+    def test_heading_slug_is_cached_by_size_and_mtime(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            draft = os.path.join(tmp_dir, "001_x.md")
+            with open(draft, "w", encoding="utf-8") as f:
+                f.write("intro\n# 你好 World\n")
+
+            meta = DraftMetaCache(os.path.join(tmp_dir, "meta.json"))
+            self.assertEqual(publish_draft.heading_slug(draft, meta), "你好-world")
+            with mock.patch.object(publish_draft, "extract_first_heading", side_effect=AssertionError("read")):
+                self.assertEqual(publish_draft.heading_slug(draft, meta), "你好-world")
+
+            with open(draft, "w", encoding="utf-8") as f:
+                f.write("# Changed Title, Longer\n")
+            self.assertEqual(publish_draft.heading_slug(draft, meta), "changed-title-longer")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+把仓库 skills/<namespace>/<name>/ 扁平化同步到多个技能目录 (<target>/<name>/)。
+
+- 扁平化布局在内存中计算, 同一次遍历中检测同名冲突 (冲突清单写入 skills/sync_conflicts.txt)。
+- 每个目标目录维护 .flowai-sync.json 缓存: 记录上次同步时源文件与目标文件的 size/mtime
+  及内容哈希。源与目标均未变化的文件不读取; 源文件只是 mtime 变化 (内容哈希相同) 时也不复制。
+- 各目标目录并发同步; 默认 (auto) 以 reflink 写入, 不支持时复制, 目标文件与源文件互相独立。
+  --link hardlink 时目标与源文件共享同一 inode: 同步本身总是先写临时文件再 rename,
+  但之后在目标目录中原地修改文件会直接改到仓库中的源文件。
+- 与原 rsync 行为一致: 不同步隐藏文件, 删除目标中多余的文件, 不删除或变动目标中的隐藏文件。
+
+用法:
+    python3 sync_skills.py [仓库根目录] [--target DIR ...] [--dry-run] [--link auto|hardlink|reflink|copy]
+
+环境变量 SYNC_TARGETS (逗号或冒号分隔) 与 SYNC_DRY_RUN=1 与 sync_skills.sh 相同。
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # 非 POSIX 平台
+    fcntl = None
+
+DEFAULT_TARGETS = ["~/.claude/skills", "~/.codex/skills", "~/.gemini/skills"]
+CACHE_FILE = ".flowai-sync.json"
+CACHE_VERSION = 1
+CONFLICT_REPORT = "sync_conflicts.txt"
+LINK_MODES = ("auto", "hardlink", "reflink", "copy")
+FICLONE = 0x40049409
+CHUNK_SIZE = 1024 * 1024
+
+
+class ConflictError(Exception):
+    """扁平化后出现同名技能"""
+
+    def __init__(self, conflicts, report):
+        super().__init__(f"conflicts found; see {report}")
+        self.conflicts = conflicts
+        self.report = report
+
+
+def is_hidden(rel_path):
+    return any(part.startswith(".") for part in rel_path.split("/"))
+
+
+def _walk_files(root):
+    """{相对路径 (posix): os.stat_result}, 跳过隐藏文件与目录"""
+    files = {}
+    stack = [("", root)]
+    while stack:
+        prefix, directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                rel = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((rel + "/", entry.path))
+                elif entry.is_file():
+                    files[rel] = entry.stat()
+    return files
+
+
+def flatten_layout(skills_dir):
+    """
+    计算扁平化布局: {目标相对路径: (源文件, stat)}
+
+    skills/<ns>/<name>/... 映射为 <name>/...; 同名技能出现在多个命名空间时抛出 ConflictError。
+    """
+    seen = {}
+    conflicts = []
+    for namespace in sorted(os.listdir(skills_dir)):
+        ns_dir = os.path.join(skills_dir, namespace)
+        if namespace.startswith(".") or not os.path.isdir(ns_dir):
+            continue
+        for name in sorted(os.listdir(ns_dir)):
+            skill_dir = os.path.join(ns_dir, name)
+            if name.startswith(".") or not os.path.isdir(skill_dir):
+                continue
+            if name in seen:
+                conflicts.append(f"{name}: {seen[name]} and {skill_dir}")
+            else:
+                seen[name] = skill_dir
+
+    if conflicts:
+        report = os.path.join(skills_dir, CONFLICT_REPORT)
+        with open(report, "w", encoding="utf-8") as f:
+            f.write("skill name conflicts detected:\n")
+            f.write("".join(f"{line}\n" for line in conflicts))
+        raise ConflictError(conflicts, report)
+
+    layout = {}
+    for name, skill_dir in seen.items():
+        for rel, stat in _walk_files(skill_dir).items():
+            layout[f"{name}/{rel}"] = (os.path.join(skill_dir, rel), stat)
+    return layout
+
+
+def _signature(stat):
+    return [stat.st_size, stat.st_mtime_ns, stat.st_mode & 0o7777]
+
+
+class SourceDigests:
+    """源文件内容哈希, 多个目标并发同步时共享, 每个文件最多读取一次"""
+
+    def __init__(self):
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        with self._lock:
+            if path in self._digests:
+                return self._digests[path]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        with self._lock:
+            return self._digests.setdefault(path, digest.hexdigest())
+
+
+def _reflink(source, tmp_path):
+    if fcntl is None:
+        raise OSError("reflink 不受支持")
+    with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _place_file(source, dest, link_mode):
+    """写入 dest (临时文件 + rename), 返回实际使用的方式"""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(dest), f".{os.path.basename(dest)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    # 硬链接会让目标与源文件共享内容, 只在显式指定时使用
+    attempts = {"auto": ("reflink", "copy")}.get(link_mode, (link_mode,))
+    try:
+        for mode in attempts:
+            try:
+                if mode == "hardlink":
+                    os.link(source, tmp_path)
+                elif mode == "reflink":
+                    _reflink(source, tmp_path)
+                    shutil.copystat(source, tmp_path)
+                else:
+                    shutil.copy2(source, tmp_path)
+            except OSError:
+                if os.path.lexists(tmp_path):
+                    os.unlink(tmp_path)
+                if mode == attempts[-1]:
+                    raise
+                continue
+            os.replace(tmp_path, dest)
+            return mode
+    finally:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _load_cache(target):
+    try:
+        with open(os.path.join(target, CACHE_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _save_cache(target, files):
+    path = os.path.join(target, CACHE_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def sync_target(layout, target, digests, dry_run=False, link_mode="auto"):
+    """
+    把扁平化布局同步到一个目标目录, 返回 {"updated": [...], "deleted": [...], "unchanged": n}
+    """
+    cache = _load_cache(target)
+    existing = _walk_files(target)
+    new_cache = {}
+    report = {"target": target, "updated": [], "deleted": [], "unchanged": 0}
+
+    for rel in sorted(layout):
+        source, src_stat = layout[rel]
+        dest = os.path.join(target, rel)
+        src_sig = _signature(src_stat)
+        dst_stat = existing.get(rel)
+        cached = cache.get(rel)
+
+        up_to_date = False
+        if dst_stat is not None and cached and cached.get("dst") == _signature(dst_stat):
+            if cached.get("src") == src_sig:
+                up_to_date = True
+            elif cached.get("sha256") and src_sig[0] == cached["src"][0] and src_sig[2] == cached["src"][2]:
+                # 源文件仅 mtime 变化: 内容哈希相同则无需复制
+                up_to_date = digests.get(source) == cached["sha256"]
+
+        if up_to_date:
+            report["unchanged"] += 1
+            if not dry_run:
+                new_cache[rel] = dict(cached, src=src_sig)
+            continue
+
+        report["updated"].append(rel)
+        if dry_run:
+            continue
+        _place_file(source, dest, link_mode)
+        new_cache[rel] = {
+            "src": src_sig,
+            "dst": _signature(os.stat(dest)),
+            "sha256": digests.get(source),
+        }
+
+    for rel in sorted(set(existing) - set(layout)):
+        report["deleted"].append(rel)
+        if not dry_run:
+            os.unlink(os.path.join(target, rel))
+
+    if not dry_run:
+        _remove_empty_dirs(target, {rel.split("/", 1)[0] for rel in layout})
+        _save_cache(target, new_cache)
+    return report
+
+
+def _remove_empty_dirs(target, keep_top):
+    """删除目标中已空的非隐藏目录 (自底向上), 保留布局中的技能目录"""
+    for dirpath, dirnames, _ in os.walk(target, topdown=False):
+        rel = os.path.relpath(dirpath, target).replace(os.sep, "/")
+        if rel == "." or is_hidden(rel) or rel in keep_top:
+            continue
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass  # 非空 (含隐藏文件等)
+
+
+def sync_skills(skills_dir, targets, dry_run=False, link_mode="auto", workers=None):
+    """扁平化 skills_dir 并发同步到全部目标, 返回各目标的报告列表"""
+    layout = flatten_layout(skills_dir)
+    digests = SourceDigests()
+
+    def run(target):
+        if not dry_run:
+            os.makedirs(target, exist_ok=True)
+        return sync_target(layout, target, digests, dry_run, link_mode)
+
+    with ThreadPoolExecutor(max_workers=workers or len(targets) or 1) as pool:
+        return list(pool.map(run, targets))
+
+
+def default_targets():
+    value = os.environ.get("SYNC_TARGETS")
+    targets = [t for t in re.split(r"[,:]", value) if t] if value else DEFAULT_TARGETS
+    return [os.path.abspath(os.path.expanduser(t)) for t in targets]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flatten skills/ and sync it to multiple skill directories.")
+    parser.add_argument("root", nargs="?", default=os.getcwd(), help="repository root (default: cwd)")
+    parser.add_argument("--target", action="append", help="target directory, repeatable (default: SYNC_TARGETS or built-in list)")
+    parser.add_argument("--dry-run", action="store_true", default=os.environ.get("SYNC_DRY_RUN") == "1",
+                        help="only list changes (same as SYNC_DRY_RUN=1)")
+    parser.add_argument("--link", choices=LINK_MODES, default="auto",
+                        help="how files are written: auto tries reflink, then copy; "
+                             "hardlink shares files with the repo (edits in a target change the source)")
+    args = parser.parse_args()
+
+    skills_dir = os.path.join(os.path.abspath(args.root), "skills")
+    if not os.path.isdir(skills_dir):
+        print(f"source skills dir not found: {skills_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    targets = [os.path.abspath(os.path.expanduser(t)) for t in args.target] if args.target else default_targets()
+    try:
+        reports = sync_skills(skills_dir, targets, args.dry_run, args.link)
+    except ConflictError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    for report in reports:
+        if args.dry_run:
+            for rel in report["updated"]:
+                print(f"would update {report['target']}/{rel}")
+            for rel in report["deleted"]:
+                print(f"would delete {report['target']}/{rel}")
+        print(f"synced to {report['target']} "
+              f"(updated {len(report['updated'])}, deleted {len(report['deleted'])}, unchanged {report['unchanged']})")
+
+
+if __name__ == "__main__":
+    main()
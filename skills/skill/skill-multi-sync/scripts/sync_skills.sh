@@ -2,62 +2,8 @@
 set -euo pipefail
 
 ROOT_DIR="${1:-$(pwd)}"
-SRC_DIR="$ROOT_DIR/skills"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
-TARGET_DIRS=(
-  "$HOME/.claude/skills"
-  "$HOME/.codex/skills"
-  "$HOME/.gemini/skills"
-)
-if [[ -n "${SYNC_TARGETS:-}" ]]; then
-  IFS=',:' read -r -a TARGET_DIRS <<< "$SYNC_TARGETS"
-fi
-
-if [[ ! -d "$SRC_DIR" ]]; then
-  echo "source skills dir not found: $SRC_DIR" >&2
-  exit 1
-fi
-
-RSYNC_FLAGS=(-a --delete --exclude '.DS_Store' --exclude '.*' --filter 'P .*')
-if [[ "${SYNC_DRY_RUN:-}" == "1" ]]; then
-  RSYNC_FLAGS+=(--dry-run --itemize-changes)
-fi
-
-FLAT_DIR="$(mktemp -d)"
-SEEN_LIST="$(mktemp)"
-trap 'rm -rf "$FLAT_DIR" "$SEEN_LIST"' EXIT
-
-conflicts=()
-
-while IFS= read -r -d '' action_dir; do
-  action="$(basename "$action_dir")"
-  if grep -Fqx "$action" "$SEEN_LIST"; then
-    prev_dir="$(awk -F '\t' -v name="$action" '$1==name{print $2; exit}' "$SEEN_LIST")"
-    conflicts+=("$action: $prev_dir and $action_dir")
-  else
-    printf "%s\t%s\n" "$action" "$action_dir" >> "$SEEN_LIST"
-  fi
-done < <(find "$SRC_DIR" -mindepth 2 -maxdepth 2 -type d -print0)
-
-if (( ${#conflicts[@]} > 0 )); then
-  conflict_report="$SRC_DIR/sync_conflicts.txt"
-  {
-    echo "skill name conflicts detected:"
-    printf '%s\n' "${conflicts[@]}"
-  } > "$conflict_report"
-  echo "conflicts found; see $conflict_report" >&2
-  exit 1
-fi
-
-while IFS=$'\t' read -r action src_dir; do
-  [[ -n "$action" && -n "$src_dir" ]] || continue
-  dst_dir="$FLAT_DIR/$action"
-  mkdir -p "$dst_dir"
-  rsync "${RSYNC_FLAGS[@]}" "$src_dir/" "$dst_dir/"
-done < "$SEEN_LIST"
-
-for target in "${TARGET_DIRS[@]}"; do
-  mkdir -p "$target"
-  rsync "${RSYNC_FLAGS[@]}" "$FLAT_DIR/" "$target/"
-  echo "synced to $target"
-done
+# 同步由 sync_skills.py 完成: 内存中扁平化并检测冲突, 按缓存的 size/mtime/哈希增量同步,
+# 各目标目录并发处理; SYNC_TARGETS 与 SYNC_DRY_RUN 环境变量含义不变, 额外参数原样传入
+exec python3 "$SCRIPT_DIR/sync_skills.py" "$ROOT_DIR" "${@:2}"
@@ -0,0 +1,126 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import sync_skills  # noqa: E402
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class SyncSkillsTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+        self.skills_dir = os.path.join(self.tmp_dir, "repo", "skills")
+        self.targets = [os.path.join(self.tmp_dir, "claude"), os.path.join(self.tmp_dir, "codex")]
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), "# A\n")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "scripts", "a.py"), "print('a')\n")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", ".hidden"), "secret\n")
+        write(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), "# B\n")
+        write(os.path.join(self.skills_dir, "manifest.json"), "{}\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def sync(self, **kwargs):
+        return sync_skills.sync_skills(self.skills_dir, self.targets, **kwargs)
+
+    def test_flattens_into_every_target_and_deletes_extras(self):
+        write(os.path.join(self.targets[0], "stale", "SKILL.md"), "old\n")
+        write(os.path.join(self.targets[0], ".keep", "notes"), "mine\n")
+        write(os.path.join(self.targets[0], "fs-a", ".local"), "mine\n")
+
+        reports = self.sync(link_mode="copy")
+
+        for target, report in zip(self.targets, reports):
+            self.assertEqual(sorted(report["updated"]), ["fs-a/SKILL.md", "fs-a/scripts/a.py", "post-b/SKILL.md"])
+            self.assertEqual(read(os.path.join(target, "fs-a", "scripts", "a.py")), "print('a')\n")
+            self.assertFalse(os.path.exists(os.path.join(target, "fs-a", ".hidden")))
+            self.assertFalse(os.path.exists(os.path.join(target, "manifest.json")))
+        self.assertEqual(reports[0]["deleted"], ["stale/SKILL.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.targets[0], "stale")))
+        self.assertEqual(read(os.path.join(self.targets[0], ".keep", "notes")), "mine\n")
+        self.assertEqual(read(os.path.join(self.targets[0], "fs-a", ".local")), "mine\n")
+
+    def test_second_sync_reads_nothing_and_touch_only_does_not_copy(self):
+        self.sync(link_mode="copy")
+
+        with mock.patch.object(sync_skills, "_place_file") as place, \
+                mock.patch.object(sync_skills.SourceDigests, "get") as digest:
+            reports = self.sync(link_mode="copy")
+        place.assert_not_called()
+        digest.assert_not_called()
+        self.assertEqual([r["unchanged"] for r in reports], [3, 3])
+
+        os.utime(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), ns=(0, 10**18))
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), "# A v2\n")
+        with mock.patch.object(sync_skills, "_place_file", wraps=sync_skills._place_file) as place:
+            reports = self.sync(link_mode="copy")
+
+        self.assertEqual([r["updated"] for r in reports], [["fs-a/SKILL.md"], ["fs-a/SKILL.md"]])
+        self.assertEqual(place.call_count, 2)
+        self.assertEqual(read(os.path.join(self.targets[1], "fs-a", "SKILL.md")), "# A v2\n")
+
+    def test_edited_target_file_is_restored(self):
+        self.sync(link_mode="copy")
+        write(os.path.join(self.targets[1], "post-b", "SKILL.md"), "edited in target\n")
+
+        reports = self.sync(link_mode="copy")
+
+        self.assertEqual(reports[1]["updated"], ["post-b/SKILL.md"])
+        self.assertEqual(read(os.path.join(self.targets[1], "post-b", "SKILL.md")), "# B\n")
+
+    def test_hardlinked_targets_never_write_through_to_source(self):
+        self.sync(link_mode="hardlink")
+        source = os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md")
+        self.assertTrue(os.path.samefile(source, os.path.join(self.targets[0], "fs-a", "SKILL.md")))
+
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "scripts", "a.py"), "print('a2')\n")
+        self.sync(link_mode="copy")
+
+        self.assertEqual(read(os.path.join(self.targets[0], "fs-a", "scripts", "a.py")), "print('a2')\n")
+        self.assertEqual(read(source), "# A\n")
+
+    def test_default_mode_never_shares_files_with_source(self):
+        self.sync()
+        source = os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md")
+        installed = os.path.join(self.targets[0], "fs-a", "SKILL.md")
+        self.assertFalse(os.path.samefile(source, installed))
+
+        with open(installed, "a", encoding="utf-8") as f:
+            f.write("edited in target\n")
+
+        self.assertEqual(read(source), "# A\n")
+
+    def test_dry_run_reports_without_writing(self):
+        reports = self.sync(dry_run=True)
+
+        self.assertEqual(len(reports[0]["updated"]), 3)
+        self.assertFalse(os.path.exists(self.targets[0]))
+
+    def test_conflicting_names_abort_with_report(self):
+        write(os.path.join(self.skills_dir, "post", "fs-a", "SKILL.md"), "# dup\n")
+
+        with self.assertRaises(sync_skills.ConflictError) as ctx:
+            self.sync()
+
+        self.assertIn("fs-a:", read(ctx.exception.report))
+        self.assertFalse(os.path.exists(self.targets[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
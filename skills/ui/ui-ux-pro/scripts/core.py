@@ -145,7 +145,7 @@ class BM25:
 
             scores.append((idx, score))
 
-        return sorted(scores, key=lambda publish-x: publish-x[1], reverse=True)
+        return sorted(scores, key=lambda x: x[1], reverse=True)
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -0,0 +1,44 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "bench-skills.py")
+spec = importlib.util.spec_from_file_location("bench_skills", os.path.abspath(SCRIPT))
+bench_skills = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_skills)
+
+
+class BenchSkillsTests(unittest.TestCase):
+    def test_every_benchmark_runs_on_small_fixtures(self):
+        cache_dir = os.environ.get("FLOWAI_CACHE_DIR")
+
+        results = bench_skills.run_benchmarks(scale=0.002, repeat=2)
+
+        self.assertEqual(list(results), list(bench_skills.BENCHMARKS))
+        for result in results.values():
+            self.assertGreaterEqual(result["median"], result["best"])
+        self.assertEqual(os.environ.get("FLOWAI_CACHE_DIR"), cache_dir)
+
+    def test_regressions_use_baseline_threshold_and_absolute_limits(self):
+        results = {"fast": {"best": 1.2, "median": 1.3}, "slow": {"best": 1.3, "median": 1.4}, "new": {"best": 9.0, "median": 9.0}}
+        baseline = {"fast": 1.0, "slow": 1.0}
+
+        regressions = bench_skills.check_regressions(results, baseline, 0.25, {"fast": 1.1})
+
+        self.assertEqual([name for name, _, _ in regressions], ["fast", "slow"])
+        self.assertEqual(regressions[0][2], 1.1)
+
+    def test_baseline_round_trip_ignores_other_scales(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, ".flowai", "bench-baseline.json")
+            bench_skills.save_baseline(path, 0.5, {"score_repos": {"best": 0.1234567, "median": 0.2}})
+
+            self.assertEqual(bench_skills.load_baseline(path, 0.5), {"score_repos": 0.123457})
+            with mock.patch("sys.stderr"):
+                self.assertEqual(bench_skills.load_baseline(path, 1.0), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "flowai.py")
+spec = importlib.util.spec_from_file_location("flowai", os.path.abspath(SCRIPT))
+flowai = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(flowai)
+
+
+class FlowaiCliTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.draft_dir = os.path.join(self._tmp.name, "drafts")
+        os.makedirs(self.draft_dir)
+        self.main_file = os.path.join(self._tmp.name, "main.md")
+        with open(self.main_file, "w", encoding="utf-8") as f:
+            f.write("正文\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_every_command_points_at_an_existing_script(self):
+        for name, (_, script) in flowai.COMMANDS.items():
+            self.assertTrue(os.path.isfile(os.path.join(flowai.ROOT_DIR, script)), name)
+
+    def test_run_chains_step_outputs_in_one_process(self):
+        steps = [
+            {"id": "num", "command": "next-id", "args": [self.draft_dir]},
+            {"id": "path", "command": "write", "args": [
+                "--dir", self.draft_dir, "--id", "{num}", "--title", "标题 {year}",
+                "--main-content-file", self.main_file,
+            ]},
+        ]
+
+        results = flowai.run_steps(steps)
+
+        self.assertEqual([r["exit_code"] for r in results], [0, 0])
+        number = results[0]["stdout"].strip()
+        self.assertTrue(number.isdigit())
+        written = results[1]["stdout"].strip()
+        self.assertTrue(os.path.isfile(written))
+        self.assertIn(number, os.path.basename(written))
+        self.assertTrue(os.path.basename(written).endswith("year.md"))
+
+    def test_failed_step_stops_run_unless_keep_going(self):
+        steps = [
+            {"id": "bad", "command": "write", "args": ["--dir", self.draft_dir]},
+            {"id": "num", "command": "next-id", "args": [self.draft_dir]},
+        ]
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            stopped = flowai.run_steps(steps)
+            kept = flowai.run_steps(steps, keep_going=True)
+
+        self.assertEqual([r["exit_code"] for r in stopped], [2])
+        self.assertEqual([r["exit_code"] for r in kept], [2, 0])
+
+    def test_main_runs_steps_file_and_reports_json(self):
+        steps_path = os.path.join(self._tmp.name, "steps.json")
+        with open(steps_path, "w", encoding="utf-8") as f:
+            json.dump([{"command": "unknown"}], f)
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            code = flowai.main(["run", steps_path])
+
+        self.assertEqual(code, 2)
+        self.assertEqual(json.loads(stdout.getvalue())[0]["command"], "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
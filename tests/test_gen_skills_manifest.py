@@ -0,0 +1,125 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "gen-skills-manifest.py")
+spec = importlib.util.spec_from_file_location("gen_skills_manifest", os.path.abspath(SCRIPT))
+gen_skills_manifest = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gen_skills_manifest)
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class SkillsManifestTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.skills_dir = os.path.join(self._tmp.name, "skills")
+        self.cache_path = os.path.join(self._tmp.name, ".flowai", "manifest-cache.json")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), "# A\n")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "scripts", "a.py"), "print('a')\n")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "scripts", "__pycache__", "a.cpython-311.pyc"), "x")
+        write(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), "# B\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def build(self):
+        return gen_skills_manifest.build_manifest(self.skills_dir, "1.0", self.cache_path, workers=2)
+
+    def test_manifest_lists_file_digests_and_tree_hash(self):
+        manifest = self.build()
+
+        skill_a, skill_b = manifest["skills"]
+        self.assertEqual(skill_a["source_path"], "skills/fs/fs-a")
+        self.assertEqual([f["path"] for f in skill_a["files"]], ["SKILL.md", "scripts/a.py"])
+        self.assertEqual(skill_a["files"][0]["sha256"],
+                         gen_skills_manifest.file_sha256(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md")))
+        self.assertEqual(skill_a["size"], len("# A\n") + len("print('a')\n"))
+        self.assertEqual(skill_a["tree_hash"], gen_skills_manifest.tree_hash(skill_a["files"]))
+        self.assertNotEqual(skill_a["tree_hash"], skill_b["tree_hash"])
+
+    def test_unchanged_files_reuse_cached_digests(self):
+        first = self.build()
+        write(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), "# B v2\n")
+
+        with mock.patch.object(gen_skills_manifest, "file_sha256",
+                               wraps=gen_skills_manifest.file_sha256) as file_sha256:
+            second = self.build()
+
+        file_sha256.assert_called_once_with(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"))
+        self.assertEqual(first["skills"][0]["tree_hash"], second["skills"][0]["tree_hash"])
+        self.assertNotEqual(first["skills"][1]["tree_hash"], second["skills"][1]["tree_hash"])
+
+
+class SkillsIndexTests(unittest.TestCase):
+    FRONTMATTER = (
+        "---\n"
+        "name: fs-a\n"
+        "description: \"写入草稿: 用于保存文章\"\n"
+        "triggers:\n"
+        "  - 保存草稿\n"
+        "  - write draft\n"
+        "---\n\n# A\n"
+    )
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.skills_dir = os.path.join(self._tmp.name, "skills")
+        self.index_cache = os.path.join(self._tmp.name, ".flowai", "skills-index-cache.json")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), self.FRONTMATTER)
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "scripts", "a.py"), "print('a')\n")
+        write(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), "# B\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def build_index(self):
+        skills = gen_skills_manifest.collect_skills(self.skills_dir)
+        return gen_skills_manifest.build_index(skills, self.index_cache)
+
+    def test_index_holds_frontmatter_and_files_by_name(self):
+        index = self.build_index()
+
+        skill_a = index["skills"]["fs-a"]
+        self.assertEqual(skill_a["description"], "写入草稿: 用于保存文章")
+        self.assertEqual(skill_a["triggers"], ["保存草稿", "write draft"])
+        self.assertEqual(skill_a["files"], ["SKILL.md", "scripts/a.py"])
+        self.assertEqual(index["skills"]["post-b"]["description"], "")
+
+    def test_simple_parser_matches_yaml_for_plain_frontmatter(self):
+        with mock.patch.object(gen_skills_manifest, "yaml", None):
+            parsed = gen_skills_manifest.parse_frontmatter(self.FRONTMATTER)
+        self.assertEqual(parsed, gen_skills_manifest.parse_frontmatter(self.FRONTMATTER))
+
+    def test_unchanged_skill_md_is_not_reparsed(self):
+        self.build_index()
+        write(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), "---\ndescription: B\n---\n")
+
+        with mock.patch.object(gen_skills_manifest, "parse_frontmatter",
+                               wraps=gen_skills_manifest.parse_frontmatter) as parse:
+            index = self.build_index()
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(index["skills"]["post-b"]["description"], "B")
+        self.assertEqual(index["skills"]["fs-a"]["triggers"], ["保存草稿", "write draft"])
+
+    def test_same_name_in_two_namespaces_is_a_conflict(self):
+        write(os.path.join(self.skills_dir, "post", "fs-a", "SKILL.md"), "# dup\n")
+
+        with self.assertRaises(gen_skills_manifest.ConflictError) as ctx:
+            self.build_index()
+
+        self.assertEqual(ctx.exception.conflicts, [
+            f"fs-a: {os.path.join(self.skills_dir, 'fs', 'fs-a')} and {os.path.join(self.skills_dir, 'post', 'fs-a')}"
+        ])
+        self.assertFalse(os.path.exists(self.index_cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+INSTALL_SCRIPT = os.path.join(SCRIPTS_DIR, "install-skills.sh")
+spec = importlib.util.spec_from_file_location("gen_skills_manifest", os.path.join(SCRIPTS_DIR, "gen-skills-manifest.py"))
+gen_skills_manifest = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gen_skills_manifest)
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@unittest.skipUnless(shutil.which("bash") and shutil.which("tar"), "需要 bash 与 tar")
+class DeltaUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+        self.skills_dir = os.path.join(self.tmp_dir, "repo", "skills")
+        self.mirror = os.path.join(self.tmp_dir, "mirror")
+        self.target = os.path.join(self.tmp_dir, "installed")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), "# A\n")
+        write(os.path.join(self.skills_dir, "fs", "fs-b", "SKILL.md"), "# B\n")
+        write(os.path.join(self.skills_dir, "post", "post-c", "SKILL.md"), "# C\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def publish(self, corrupt=None):
+        """把 skills 目录发布到本地镜像: manifest.json + 每个技能一个归档"""
+        shutil.rmtree(self.mirror, ignore_errors=True)
+        os.makedirs(self.mirror)
+        manifest = gen_skills_manifest.build_manifest(self.skills_dir, "1.0")
+        with open(os.path.join(self.mirror, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        for skill in manifest["skills"]:
+            name = skill["flattened_name"]
+            archive = os.path.join(self.mirror, f"skill-{name}-{skill['tree_hash'][:16]}.tar.gz")
+            with tarfile.open(archive, "w:gz") as tar:
+                source = os.path.join(self.tmp_dir, "repo", skill["source_path"])
+                for entry in skill["files"]:
+                    with open(os.path.join(source, entry["path"]), "rb") as f:
+                        data = f.read()
+                    if name == corrupt:
+                        data += b"tampered"
+                    info = tarfile.TarInfo(f"{name}/{entry['path']}")
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+
+    def update(self):
+        return subprocess.run(
+            ["bash", INSTALL_SCRIPT, "--update", "--mirror", self.mirror, "--target", self.target],
+            capture_output=True, text=True,
+        )
+
+    def test_update_downloads_only_changed_skills(self):
+        self.publish()
+        result = self.update()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.count("downloading:"), 3)
+        self.assertEqual(read(os.path.join(self.target, "post-c", "SKILL.md")), "# C\n")
+
+        write(os.path.join(self.skills_dir, "fs", "fs-b", "SKILL.md"), "# B v2\n")
+        shutil.rmtree(os.path.join(self.skills_dir, "post"))
+        self.publish()
+        result = self.update()
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.count("downloading:"), 1)
+        self.assertIn("downloading: skill-fs-b-", result.stdout)
+        self.assertEqual(read(os.path.join(self.target, "fs-b", "SKILL.md")), "# B v2\n")
+        self.assertFalse(os.path.exists(os.path.join(self.target, "post-c")))
+
+        result = self.update()
+        self.assertIn("already up to date", result.stdout)
+
+    def test_checksum_mismatch_leaves_installation_untouched(self):
+        self.publish()
+        self.assertEqual(self.update().returncode, 0)
+
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), "# A v2\n")
+        self.publish(corrupt="fs-a")
+        result = self.update()
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("checksum mismatch: fs-a", result.stderr)
+        self.assertEqual(read(os.path.join(self.target, "fs-a", "SKILL.md")), "# A\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPT_DIR = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, os.path.abspath(SCRIPT_DIR))
+
+import migrate  # noqa: E402
+
+CONFIG = """
+paths:
+  publish_dir: "/srv/blog/{year}/"
+github:
+  org: "Acme"
+  repo: "site"
+  project_id: 7
+placeholders:
+  BLOG_URL: "https://blog.acme.dev"
+  GITHUB_REPO: "site-override"
+  LOOP: "${GITHUB_ORG}"
+profiles:
+  beta:
+    github:
+      org: "Beta"
+  gamma:
+    github:
+      org: "Gamma"
+    paths:
+      publish_dir: "/srv/gamma/"
+"""
+
+
+class MigrateTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "flowai.config.yaml").write_text(CONFIG, encoding="utf-8")
+        self.migrator = migrate.FlowAIMigrator(self.root)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_skill(self, rel_path, content):
+        path = self.root / "skills" / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return path
+
+
+class PlaceholderRenderTests(MigrateTestCase):
+    def test_apply_substitutes_builtin_and_custom_placeholders_in_one_pass(self):
+        skill = self.write_skill(
+            "post/a/SKILL.md",
+            "dir=${PUBLISH_DIR} org=${GITHUB_ORG} repo=${GITHUB_REPO}\n"
+            "url=${BLOG_URL} loop=${LOOP} keep=${UNKNOWN} ${DEFAULT_MODEL}\n",
+        )
+
+        self.assertEqual(self.migrator.apply(), 0)
+
+        self.assertEqual(
+            skill.read_text(encoding="utf-8"),
+            "dir=/srv/blog/{year}/ org=Acme repo=site-override\n"
+            "url=https://blog.acme.dev loop=${GITHUB_ORG} keep=${UNKNOWN} ${DEFAULT_MODEL}\n",
+        )
+
+    def test_diff_reports_each_placeholder_once(self):
+        self.write_skill("code/b/SKILL.md", "${GITHUB_ORG}/${GITHUB_REPO} ${GITHUB_ORG}\n")
+        self.migrator._load_config()
+
+        results = self.migrator._process_files(
+            self.root / "skills", self.migrator._placeholder_table(), self.migrator._load_state(), write=False
+        )
+
+        self.assertEqual(results, [(
+            "skills/code/b/SKILL.md", "updated",
+            [("${GITHUB_ORG}", "Acme"), ("${GITHUB_REPO}", "site-override")], None,
+        )])
+        self.assertFalse((self.root / ".flowai" / "migrate-state.json").exists())
+
+
+class IncrementalApplyTests(MigrateTestCase):
+    def test_apply_covers_scripts_and_skips_tests(self):
+        script = self.write_skill("code/b/scripts/run.sh", "#!/bin/sh\necho ${GITHUB_ORG}\r\n")
+        script.chmod(0o755)
+        test_file = self.write_skill("code/b/tests/test_run.py", "ORG = '${GITHUB_ORG}'\n")
+
+        self.assertEqual(self.migrator.apply(), 0)
+
+        self.assertEqual(script.read_bytes(), b"#!/bin/sh\necho Acme\r\n")
+        self.assertEqual(script.stat().st_mode & 0o777, 0o755)
+        self.assertEqual(test_file.read_text(encoding="utf-8"), "ORG = '${GITHUB_ORG}'\n")
+
+    def test_custom_placeholders_do_not_touch_shell_variables_in_scripts(self):
+        script = self.write_skill("code/b/scripts/wt.sh", "echo ${BLOG_URL} ${GITHUB_ORG}\n")
+        doc = self.write_skill("code/b/SKILL.md", "${BLOG_URL}\n")
+
+        self.assertEqual(self.migrator.apply(), 0)
+        out = self.root / "build"
+        self.assertEqual(self.migrator.apply(out=str(out)), 0)
+
+        self.assertEqual(script.read_text(encoding="utf-8"), "echo ${BLOG_URL} Acme\n")
+        self.assertEqual(doc.read_text(encoding="utf-8"), "https://blog.acme.dev\n")
+        self.assertEqual((out / "code/b/scripts/wt.sh").read_text(encoding="utf-8"), "echo ${BLOG_URL} Acme\n")
+
+    def test_reapply_rerenders_only_files_using_changed_values(self):
+        org = self.write_skill("a/SKILL.md", "org=${GITHUB_ORG}\n")
+        url = self.write_skill("b/SKILL.md", "url=${BLOG_URL}\n")
+        self.assertEqual(self.migrator.apply(), 0)
+        url_mtime = url.stat().st_mtime_ns
+
+        config = self.root / "flowai.config.yaml"
+        config.write_text(config.read_text(encoding="utf-8").replace('"Acme"', '"Initech"'), encoding="utf-8")
+        migrator = migrate.FlowAIMigrator(self.root)
+        migrator._load_config()
+        results = migrator._process_files(self.root / "skills", migrator._placeholder_table(),
+                                          migrator._load_state(), write=False)
+        self.assertEqual([(path, action) for path, action, *_ in results],
+                         [("skills/a/SKILL.md", "updated"), ("skills/b/SKILL.md", "unchanged")])
+
+        self.assertEqual(migrator.apply(), 0)
+
+        self.assertEqual(org.read_text(encoding="utf-8"), "org=Initech\n")
+        self.assertEqual(url.stat().st_mtime_ns, url_mtime)
+
+    def test_edited_output_becomes_new_template(self):
+        skill = self.write_skill("a/SKILL.md", "org=${GITHUB_ORG}\n")
+        self.assertEqual(self.migrator.apply(), 0)
+
+        skill.write_text("org=Acme repo=${GITHUB_REPO}\n", encoding="utf-8")
+        self.assertEqual(migrate.FlowAIMigrator(self.root).apply(), 0)
+
+        self.assertEqual(skill.read_text(encoding="utf-8"), "org=Acme repo=site-override\n")
+
+
+class ProfileOutputTests(MigrateTestCase):
+    def test_profiles_render_into_separate_trees_and_link_unchanged_files(self):
+        skill = self.write_skill("a/SKILL.md", "org=${GITHUB_ORG} dir=${PUBLISH_DIR}\n")
+        plain = self.write_skill("a/references/notes.md", "no placeholders\n")
+        out = self.root / "build"
+
+        self.assertEqual(self.migrator.apply(out=str(out), profiles=["beta", "gamma"]), 0)
+
+        self.assertEqual((out / "beta/a/SKILL.md").read_text(encoding="utf-8"), "org=Beta dir=/srv/blog/{year}/\n")
+        self.assertEqual((out / "gamma/a/SKILL.md").read_text(encoding="utf-8"), "org=Gamma dir=/srv/gamma/\n")
+        self.assertTrue(os.path.samefile(plain, out / "beta/a/references/notes.md"))
+        self.assertEqual(skill.read_text(encoding="utf-8"), "org=${GITHUB_ORG} dir=${PUBLISH_DIR}\n")
+        self.assertFalse((self.root / ".flowai" / "migrate-state.json").exists())
+
+        rendered_mtime = (out / "beta/a/SKILL.md").stat().st_mtime_ns
+        self.assertEqual(self.migrator.apply(out=str(out), profiles=["beta"]), 0)
+        self.assertEqual((out / "beta/a/SKILL.md").stat().st_mtime_ns, rendered_mtime)
+
+    def test_out_skips_build_artifacts_and_removes_deleted_sources(self):
+        self.write_skill("a/SKILL.md", "org=${GITHUB_ORG}\n")
+        removed = self.write_skill("b/scripts/run.sh", "echo b\n")
+        self.write_skill("a/scripts/__pycache__/run.cpython-312.pyc", "bytecode")
+        self.write_skill("a/.DS_Store", "finder")
+        self.write_skill("a/scripts/helper.pyc", "bytecode")
+        out = self.root / "build"
+        self.assertEqual(self.migrator.apply(out=str(out)), 0)
+        self.assertEqual(sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file()),
+                         ["a/SKILL.md", "b/scripts/run.sh"])
+
+        shutil.rmtree(removed.parent.parent)
+        (out / "a/.stale.tmp").write_text("left over\n", encoding="utf-8")
+        self.assertEqual(self.migrator.apply(out=str(out)), 0)
+
+        self.assertFalse((out / "b").exists())
+        self.assertFalse((out / "a/.stale.tmp").exists())
+        self.assertEqual((out / "a/SKILL.md").read_text(encoding="utf-8"), "org=Acme\n")
+
+    def test_out_renders_from_templates_after_in_place_apply(self):
+        self.write_skill("a/SKILL.md", "org=${GITHUB_ORG}\n")
+        self.assertEqual(self.migrator.apply(), 0)
+
+        self.assertEqual(self.migrator.apply(out=str(self.root / "build"), profiles=["gamma"]), 0)
+
+        self.assertEqual((self.root / "build/gamma/a/SKILL.md").read_text(encoding="utf-8"), "org=Gamma\n")
+
+    def test_unknown_profile_and_profile_without_out_fail(self):
+        self.write_skill("a/SKILL.md", "org=${GITHUB_ORG}\n")
+        self.assertEqual(self.migrator.apply(out=str(self.root / "build"), profiles=["missing"]), 1)
+        self.assertEqual(self.migrator.apply(profiles=["beta"]), 1)
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class ResetTests(MigrateTestCase):
+    def git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def test_reset_restores_applied_files_with_one_checkout(self):
+        rendered = [self.write_skill(f"s{i}/SKILL.md", f"org=${{GITHUB_ORG}} {i}\n") for i in range(3)]
+        edited = self.write_skill("other/SKILL.md", "plain\n")
+        self.git("init", "-q")
+        self.git("add", "-A")
+        self.git("-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "init")
+
+        self.assertEqual(self.migrator.apply(), 0)
+        edited.write_text("local edit\n", encoding="utf-8")
+
+        with mock.patch.object(migrate.subprocess, "run", wraps=subprocess.run) as run:
+            self.assertEqual(self.migrator.reset(assume_yes=True), 0)
+
+        self.assertEqual(run.call_count, 2)
+        for i, path in enumerate(rendered):
+            self.assertEqual(path.read_text(encoding="utf-8"), f"org=${{GITHUB_ORG}} {i}\n")
+        self.assertEqual(edited.read_text(encoding="utf-8"), "local edit\n")
+        self.assertEqual(self.migrator._load_state()["files"], {})
+
+
+class ResolvedConfigTests(MigrateTestCase):
+    def setUp(self):
+        super().setUp()
+        env = mock.patch.dict(os.environ, {})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("FLOWAI_GITHUB_REPO", None)
+
+    def test_flattened_lookup_and_single_pass_validation(self):
+        self.migrator._load_config()
+
+        self.assertEqual(self.migrator._get("github.org"), "Acme")
+        self.assertEqual(self.migrator._get("placeholders")["BLOG_URL"], "https://blog.acme.dev")
+        self.assertIsNone(self.migrator._get("github.missing"))
+        self.assertEqual(
+            [(key, valid) for key, _, _, valid in self.migrator._validate_required()],
+            [("paths.publish_dir", True), ("github.org", True), ("github.repo", True), ("github.project_id", True)],
+        )
+
+    def test_parsed_files_are_cached_until_they_change(self):
+        env_file = self.root / ".flowai.env"
+        env_file.write_text("FLOWAI_GITHUB_REPO=from-env\n", encoding="utf-8")
+        self.migrator._load_config()
+        self.assertEqual(self.migrator._get("github.repo"), "from-env")
+
+        os.environ.pop("FLOWAI_GITHUB_REPO")
+        with mock.patch.object(migrate.yaml, "safe_load", side_effect=AssertionError("cache miss")):
+            migrator = migrate.FlowAIMigrator(self.root)
+            migrator._load_config()
+        self.assertEqual(migrator._get("github.repo"), "from-env")
+        self.assertEqual(migrator._get("github.project_id"), 7)
+
+        config = self.root / "flowai.config.yaml"
+        config.write_text(config.read_text(encoding="utf-8").replace("project_id: 7", "project_id: 42"),
+                          encoding="utf-8")
+        migrator = migrate.FlowAIMigrator(self.root)
+        migrator._load_config()
+        self.assertEqual(migrator._get("github.project_id"), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import importlib.util
+import os
+import unittest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "query-skills.py")
+spec = importlib.util.spec_from_file_location("query_skills", os.path.abspath(SCRIPT))
+query_skills = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(query_skills)
+
+INDEX = {
+    "version": 1,
+    "skills": {
+        "fs-update": {"name": "fs-update", "namespace": "fs", "description": "根据草稿更新已发布文章",
+                      "triggers": [], "files": ["SKILL.md"]},
+        "publish-github": {"name": "publish-github", "namespace": "publish", "description": "发布文章到 GitHub",
+                           "triggers": ["Blog Sync"], "files": ["SKILL.md"]},
+    },
+}
+
+
+class QuerySkillsTests(unittest.TestCase):
+    def names(self, *terms, **kwargs):
+        return [skill["name"] for skill in query_skills.query(INDEX, terms, **kwargs)]
+
+    def test_terms_must_all_match_case_insensitively(self):
+        self.assertEqual(self.names("文章"), ["fs-update", "publish-github"])
+        self.assertEqual(self.names("文章", "github"), ["publish-github"])
+        self.assertEqual(self.names("blog sync"), ["publish-github"])
+
+    def test_exact_name_and_namespace_filters(self):
+        self.assertEqual(self.names(name="fs-update"), ["fs-update"])
+        self.assertEqual(self.names(name="missing"), [])
+        self.assertEqual(self.names(namespace="publish"), ["publish-github"])
+
+
+if __name__ == "__main__":
+    unittest.main()
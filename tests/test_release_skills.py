@@ -0,0 +1,104 @@
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gen_skills_manifest = load_script("gen_skills_manifest", "gen-skills-manifest.py")
+release_skills = load_script("release_skills", "release-skills.py")
+
+
+def write(path, content, mode=0o644):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.chmod(path, mode)
+
+
+class ReleaseBuilderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "repo")
+        self.skills_dir = os.path.join(self.root, "skills")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), "# A\n")
+        write(os.path.join(self.skills_dir, "fs", "fs-a", "scripts", "run.sh"), "echo a\n", 0o755)
+        write(os.path.join(self.skills_dir, "post", "post-b", "SKILL.md"), "# B\n")
+        manifest = gen_skills_manifest.build_manifest(self.skills_dir, "1.0")
+        with open(os.path.join(self.skills_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        self.manifest = manifest
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def build(self, out_name):
+        out_dir = os.path.join(self._tmp.name, out_name)
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1700000000"}):
+            release_skills.build_release(self.root, out_dir, "1.0", workers=2)
+        return out_dir
+
+    def test_builds_are_byte_for_byte_reproducible(self):
+        first = self.build("dist1")
+        os.utime(os.path.join(self.skills_dir, "fs", "fs-a", "SKILL.md"), (0, 0))
+        second = self.build("dist2")
+
+        self.assertEqual(sorted(os.listdir(first)), sorted(os.listdir(second)))
+        for name in os.listdir(first):
+            with open(os.path.join(first, name), "rb") as a, open(os.path.join(second, name), "rb") as b:
+                self.assertEqual(a.read(), b.read(), name)
+
+    def test_per_skill_archives_and_checksum_index(self):
+        out_dir = self.build("dist")
+        skill_a = self.manifest["skills"][0]
+        archive = os.path.join(out_dir, release_skills.skill_archive_name(skill_a))
+
+        with tarfile.open(archive, "r:gz") as tar:
+            members = {m.name: m for m in tar.getmembers()}
+        self.assertEqual(sorted(members), ["fs-a/SKILL.md", "fs-a/scripts/run.sh"])
+        self.assertEqual(members["fs-a/scripts/run.sh"].mode, 0o755)
+        self.assertEqual(members["fs-a/SKILL.md"].mtime, 1700000000)
+
+        with tarfile.open(os.path.join(out_dir, "flow-ai-skills-1.0.tar.gz"), "r:gz") as tar:
+            self.assertIn("skills/manifest.json", tar.getnames())
+            self.assertIn("skills/post/post-b/SKILL.md", tar.getnames())
+
+        with open(os.path.join(out_dir, "SHA256SUMS"), "r", encoding="utf-8") as f:
+            sums = dict(reversed(line.split("  ")) for line in f.read().splitlines())
+        self.assertEqual(len(sums), 4)
+        for name, digest in sums.items():
+            with open(os.path.join(out_dir, name), "rb") as f:
+                self.assertEqual(hashlib.sha256(f.read()).hexdigest(), digest)
+
+    @unittest.skipUnless(shutil.which("bash") and shutil.which("tar"), "需要 bash 与 tar")
+    def test_release_output_serves_delta_updates(self):
+        out_dir = self.build("dist")
+        target = os.path.join(self._tmp.name, "installed")
+
+        result = subprocess.run(
+            ["bash", os.path.join(SCRIPTS_DIR, "install-skills.sh"), "--update", "--mirror", out_dir,
+             "--target", target],
+            capture_output=True, text=True,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(os.access(os.path.join(target, "fs-a", "scripts", "run.sh"), os.X_OK))
+        self.assertTrue(os.path.isfile(os.path.join(target, "post-b", "SKILL.md")))
+
+
+if __name__ == "__main__":
+    unittest.main()